@@ -1,15 +1,58 @@
 import time
 from collections import OrderedDict
-from core.cache_abc import Cache
+from logging import DEBUG
+from core.cache_abc import Cache, CacheStats
+from core.byte_budget import ByteBudget, text_size
+from core.metrics import CacheMetrics, cache_log
+from core.registry import register_policy
 
 
+def arc_invariant_violations(capacity: int, p: int, t1, t2, b1, b2) -> list[str]:
+    """
+    Lista as condições do ARC (e do CAR) que as listas não respeitam.
+
+    Args:
+        capacity (int): Capacidade c do cache.
+        p (int): Tamanho alvo de T1.
+        t1, t2, b1, b2: As listas do cache e as listas fantasma (chaves).
+
+    Returns:
+        list[str]: Uma descrição por condição violada (vazia se está tudo certo).
+    """
+    c = capacity
+    n1, n2, g1, g2 = len(t1), len(t2), len(b1), len(b2)
+    problems = []
+    if n1 + n2 > c:
+        problems.append(f"|T1| + |T2| = {n1 + n2} > {c}")
+    if n1 + g1 > c:
+        problems.append(f"|T1| + |B1| = {n1 + g1} > {c}")
+    if n1 + n2 + g1 + g2 > 2 * c:
+        problems.append(f"|T1| + |T2| + |B1| + |B2| = {n1 + n2 + g1 + g2} > {2 * c}")
+    if not isinstance(p, int) or not 0 <= p <= c:
+        problems.append(f"p = {p!r} fora de [0, {c}]")
+    if len(t1.keys() | t2.keys() | b1.keys() | b2.keys()) != n1 + n2 + g1 + g2:
+        problems.append("uma chave aparece em mais de uma lista")
+    return problems
+
+
+@register_policy
 class ARCCache(Cache):
     """
-    Implementação do algoritmo de cache Adaptive Replacement Cache (ARC).
+    Implementação do algoritmo de cache Adaptive Replacement Cache (ARC),
+    como publicado por Megiddo e Modha (FAST 2003).
     O ARC equilibra dinamicamente entre LRU (recência) e LFU (frequência).
+
+    Com capacidade c, as listas respeitam sempre |T1| + |T2| <= c,
+    |T1| + |B1| <= c e |T1| + |T2| + |B1| + |B2| <= 2c, e o alvo 'p' é um
+    inteiro entre 0 e c; todas as operações são O(1). Com
+    'debug_invariants=True', essas condições são verificadas após cada
+    alteração (em O(c), só para testes).
     """
+    __slots__ = ('capacity', 'read_from_slow_disk', 'p', 't1', 't2', 'b1', 'b2',
+                 'budget', 'metrics', 'listeners', 'debug_invariants')
 
-    def __init__(self, capacity: int = 10, reader_func=None):
+    def __init__(self, capacity: int = 10, reader_func=None, max_bytes: int | None = None,
+                 debug_invariants: bool = False):
         if capacity <= 0:
             raise ValueError("A capacidade do cache deve ser maior que zero.")
         if reader_func is None:
@@ -31,34 +74,183 @@ class ARCCache(Cache):
         # B2: Lista "fantasma" de chaves recentemente removidas de T2
         self.b2 = OrderedDict()
 
+        # Memória ocupada pelos textos de T1 e T2 (as listas fantasma guardam só chaves).
+        self.budget = ByteBudget(max_bytes)
+        self.metrics = CacheMetrics()
+        self.listeners = []
+        self.debug_invariants = debug_invariants
+
+    def check_invariants(self):
+        """
+        Verifica as condições do ARC sobre o tamanho das listas e o alvo 'p'.
+
+        Raises:
+            AssertionError: Se alguma condição não for respeitada.
+        """
+        problems = arc_invariant_violations(self.capacity, self.p, self.t1, self.t2, self.b1, self.b2)
+        if problems:
+            raise AssertionError(f"Invariantes do ARC violados: {'; '.join(problems)}.")
+
+    def _evict_lru(self, source: OrderedDict, ghost: OrderedDict | None):
+        """
+        Remove o item LRU de T1 ou T2, guardando a chave na lista fantasma 'ghost' (se houver).
+        """
+        old_key, old_content = source.popitem(last=False)
+        self.budget.release(old_key)
+        cache_log.debug("Cache cheio. Removido (ARC) de %s: Texto %s.", "T1" if source is self.t1 else "T2", old_key)
+        if ghost is not None:
+            ghost[old_key] = None
+        self.metrics.evictions += 1
+        for listener in self.listeners:
+            listener(old_key, old_content)
+
+    def _victim_lists(self, text_id: int | None) -> tuple[OrderedDict, OrderedDict]:
+        """
+        Escolha do REPLACE: T1 (com destino B1) se T1 passou do alvo 'p', ou T2 (com destino B2).
+        """
+        # Se T2 estiver vazia (possível com o limite de bytes ou após invalidações), a remoção sai de T1.
+        if self.t1 and (not self.t2 or len(self.t1) > self.p or (text_id in self.b2 and len(self.t1) == self.p)):
+            return self.t1, self.b1
+        return self.t2, self.b2
+
     def _replace(self, text_id: int):
         """
-        Função de evicção chamada em um cache miss quando o cache está cheio.
-        Esta é a lógica central que adapta o tamanho das listas.
+        Sub-rotina REPLACE do ARC: remove o item LRU de T1 (para B1) se T1
+        passou do alvo 'p', ou de T2 (para B2) caso contrário.
+        """
+        self._evict_lru(*self._victim_lists(text_id))
+
+    def _make_room(self, text_id: int, size: int):
+        """
+        Continua removendo itens de T1/T2 enquanto o novo item não couber
+        no limite de bytes do cache. Cada remoção só move uma chave para a
+        lista fantasma correspondente, sem alterar as somas dos invariantes.
+        """
+        while (self.t1 or self.t2) and self.budget.needs_room(size):
+            self._replace(text_id)
+
+    def put(self, text_id: int, content: str):
+        """
+        Insere um texto recém-lido do disco, aplicando a lógica adaptativa do ARC
+        para um cache miss. Textos maiores que o limite de bytes são recusados.
         """
-        # Se T1 não está vazia e (T1 é maior que o alvo 'p' OU (o item a ser removido está em B2 e T1 tem o mesmo tamanho de 'p'))
-        if self.t1 and (len(self.t1) > self.p or (text_id in self.b2 and len(self.t1) == self.p)):
-            # Remove o item LRU de T1 e o move para a lista fantasma B1
-            old_key, _ = self.t1.popitem(last=False)
-            self.b1[old_key] = None
-            if len(self.b1) > self.capacity - self.p:
-                self.b1.popitem(last=False)
+        if text_id in self.t1 or text_id in self.t2:
+            return
+
+        size = text_size(content)
+        if not self.budget.admits(size):
+            self.metrics.rejections += 1
+            cache_log.warning("Texto %s (%s bytes) excede o limite de memória do cache. Não será armazenado.", text_id, size)
+            return
+
+        # O artigo chama REPLACE sempre nos casos II a IV, pois lá o cache está cheio sempre que há
+        # chaves fantasma; aqui ele pode não estar (invalidações ou limite de bytes).
+        cache_full = len(self.t1) + len(self.t2) >= self.capacity
+
+        # CASO II: O item estava na lista fantasma B1 (era recente, mas foi removido)
+        if text_id in self.b1:
+            # Adaptação: aumenta o tamanho alvo 'p' para T1 (dá mais importância à recência).
+            self.p = min(self.capacity, self.p + max(len(self.b2) // len(self.b1), 1))
+            self.metrics.increment('arc_p_increases')
+            if cache_full:
+                self._replace(text_id)
+            self._make_room(text_id, size)
+            del self.b1[text_id]
+            self.t2[text_id] = content  # Move para a lista de frequentes
+
+        # CASO III: O item estava na lista fantasma B2 (era frequente, mas foi removido)
+        elif text_id in self.b2:
+            # Adaptação: diminui o tamanho alvo 'p' para T1 (dá mais importância à frequência).
+            self.p = max(0, self.p - max(len(self.b1) // len(self.b2), 1))
+            self.metrics.increment('arc_p_decreases')
+            if cache_full:
+                self._replace(text_id)
+            self._make_room(text_id, size)
+            del self.b2[text_id]
+            self.t2[text_id] = content  # Move para a lista de frequentes
+
+        # CASO IV: Miss completo (item fora de todas as listas)
+        else:
+            if len(self.t1) + len(self.b1) >= self.capacity:
+                # IV.A: L1 = T1 + B1 está cheia.
+                if len(self.t1) < self.capacity:
+                    # Esquece a chave mais antiga de B1 e remove um item do cache.
+                    self.b1.popitem(last=False)
+                    if cache_full:
+                        self._replace(text_id)
+                else:
+                    # B1 está vazia e T1 ocupa o cache todo: o LRU de T1 sai sem deixar chave fantasma.
+                    self._evict_lru(self.t1, None)
+            elif len(self.t1) + len(self.t2) + len(self.b1) + len(self.b2) >= self.capacity:
+                # IV.B: L1 tem espaço, mas o diretório (cache e fantasmas) tem pelo menos c chaves.
+                if len(self.t1) + len(self.t2) + len(self.b1) + len(self.b2) >= 2 * self.capacity:
+                    self.b2.popitem(last=False)
+                if cache_full:
+                    self._replace(text_id)
+            self._make_room(text_id, size)
+
+            # Adiciona o novo item em T1 (visto pela primeira vez)
+            self.t1[text_id] = content
+
+        self.budget.charge(text_id, size)
+        self.metrics.inserts += 1
+        if self.debug_invariants:
+            self.check_invariants()
+
+    def __contains__(self, text_id: int) -> bool:
+        return text_id in self.t1 or text_id in self.t2
+
+    def invalidate(self, text_id: int) -> bool:
+        # As listas fantasma não mudam: a invalidação não diz nada sobre recência ou frequência.
+        if text_id in self.t1:
+            del self.t1[text_id]
+        elif text_id in self.t2:
+            del self.t2[text_id]
         else:
-            # Remove o item LRU de T2 e o move para a lista fantasma B2
-            old_key, _ = self.t2.popitem(last=False)
-            self.b2[old_key] = None
-            if len(self.b2) > self.p:
-                self.b2.popitem(last=False)
+            return False
+        self.budget.release(text_id, evicted=False)
+        self.metrics.increment('invalidations')
+        if self.debug_invariants:
+            self.check_invariants()
+        return True
+
+    def replace(self, text_id: int, content: str) -> bool:
+        # O texto continua na mesma lista e posição; as listas fantasma e 'p' não mudam.
+        ordered = self.t1 if text_id in self.t1 else self.t2 if text_id in self.t2 else None
+        if ordered is None:
+            return False
+        size = text_size(content)
+        if not self.budget.admits(size):
+            self.invalidate(text_id)
+            return False
+        ordered[text_id] = content
+        self.budget.release(text_id, evicted=False)
+        self.budget.charge(text_id, size)
+        self._make_room(text_id, 0)
+        if self.debug_invariants:
+            self.check_invariants()
+        return text_id in self
+
+    def invalidate_all(self):
+        self.metrics.increment('invalidations', len(self.t1) + len(self.t2))
+        self.t1.clear()
+        self.t2.clear()
+        self.budget.clear()
+
+    def add_eviction_listener(self, listener):
+        self.listeners.append(listener)
 
     def access(self, text_id: int) -> tuple[bool, str, float]:
         """
         Acessa um texto, aplicando a lógica adaptativa do ARC.
         """
-        start_time = time.perf_counter()
+        start_time = time.perf_counter_ns()
 
         # CASO 1: Cache Hit (o texto está em T1 ou T2)
         if text_id in self.t1 or text_id in self.t2:
             is_hit = True
+            if cache_log.isEnabledFor(DEBUG):
+                cache_log.debug("CACHE HIT! Acessando texto %s da memória.", text_id)
             # Se estava em T1, foi acessado uma segunda vez. Mova para T2 (mais frequente).
             if text_id in self.t1:
                 content = self.t1.pop(text_id)
@@ -71,45 +263,98 @@ class ARCCache(Cache):
         # CASO 2: Cache Miss
         else:
             is_hit = False
+            if cache_log.isEnabledFor(DEBUG):
+                cache_log.debug("CACHE MISS! Lendo texto %s do disco lento...", text_id)
             content = self.read_from_slow_disk(text_id)
+            self.put(text_id, content)
 
-            # SUB-CASO 2.1: O item estava na lista fantasma B1 (era recente, mas foi removido)
-            if text_id in self.b1:
-                # Adaptação: aumenta o tamanho alvo 'p' para T1 (dá mais importância à recência).
-                self.p = min(self.capacity, self.p + max(len(self.b2) / len(self.b1), 1))
-                self._replace(text_id)
-                self.b1.pop(text_id, None)
-                self.t2[text_id] = content  # Move para a lista de frequentes
-
-            # SUB-CASO 2.2: O item estava na lista fantasma B2 (era frequente, mas foi removido)
-            elif text_id in self.b2:
-                # Adaptação: diminui o tamanho alvo 'p' para T1 (dá mais importância à frequência).
-                self.p = max(0, self.p - max(len(self.b1) / len(self.b2), 1))
-                self._replace(text_id)
-                self.b2.pop(text_id, None)
-                self.t2[text_id] = content  # Move para a lista de frequentes
-
-            # SUB-CASO 2.3: Miss completo (item nunca visto antes)
-            else:
-                # Se o cache está cheio (T1 + T2)
-                if len(self.t1) + len(self.t2) >= self.capacity:
-                    # Se T1 está cheio, remova da lista fantasma B1 para dar espaço
-                    if len(self.t1) < self.capacity:
-                        self.b1.popitem(last=False) if self.b1 else None
-                    self._replace(text_id)
-
-                # Adiciona o novo item em T1 (visto pela primeira vez)
-                self.t1[text_id] = content
-
-        end_time = time.perf_counter()
-        access_time = end_time - start_time
+        access_time_ns = time.perf_counter_ns() - start_time
+        if is_hit:
+            self.metrics.record_hit(access_time_ns)
+        else:
+            self.metrics.record_miss(access_time_ns)
 
-        return is_hit, content, access_time
+        return is_hit, content, access_time_ns / 1e9
 
     def __str__(self) -> str:
         """ Representação em string do estado do cache para a interface. """
         # Une as chaves de T1 e T2 para uma visualização consolidada
         all_keys = list(self.t1.keys()) + list(self.t2.keys())
         items = ', '.join(map(str, all_keys))
-        return f"ARCCache (Size: {len(all_keys)}/{self.capacity}, p={self.p:.1f}) -> [{items}]"
-    
+        return f"ARCCache (Size: {len(all_keys)}/{self.capacity}, p={self.p}) -> [{items}]"
+
+    def snapshot_state(self) -> dict:
+        """
+        Salva T1 e T2 (com os textos), as listas fantasma B1 e B2 e o parâmetro 'p'.
+        """
+        return {
+            'entries': list(self.t1.items()) + list(self.t2.items()),
+            't2': list(self.t2),
+            'b1': list(self.b1),
+            'b2': list(self.b2),
+            'p': self.p,
+        }
+
+    def restore_state(self, state: dict, exclude=frozenset()):
+        for ordered in (self.t1, self.t2, self.b1, self.b2):
+            ordered.clear()
+        self.budget.clear()
+
+        t2_keys = set(state.get('t2', []))
+        for text_id, content in state['entries']:
+            size = text_size(content)
+            if text_id in exclude or not self.budget.admits(size):
+                continue
+            (self.t2 if text_id in t2_keys else self.t1)[text_id] = content
+            self.budget.charge(text_id, size)
+
+        # As listas fantasma guardam só chaves, então continuam válidas mesmo para textos alterados.
+        for key in state.get('b1', []):
+            if key not in self:
+                self.b1[key] = None
+        for key in state.get('b2', []):
+            if key not in self:
+                self.b2[key] = None
+        # Snapshots de versões anteriores podem ter 'p' fracionário.
+        self.p = min(int(state.get('p', 0)), self.capacity)
+
+        # Ajusta o estado aos limites atuais, que podem ser menores que os do snapshot. Os textos
+        # descartados aqui não são evicções: não contam nas métricas nem chegam aos ouvintes.
+        while len(self.t1) + len(self.t2) > self.capacity or self.budget.needs_room(0):
+            source, ghost = self._victim_lists(None)
+            old_key, _ = source.popitem(last=False)
+            self.budget.release(old_key, evicted=False)
+            ghost[old_key] = None
+        while self.b1 and len(self.t1) + len(self.b1) > self.capacity:
+            self.b1.popitem(last=False)
+        while self.b2 and len(self.t1) + len(self.t2) + len(self.b1) + len(self.b2) > 2 * self.capacity:
+            self.b2.popitem(last=False)
+        if self.debug_invariants:
+            self.check_invariants()
+
+    def _record_miss(self, text_id: int, access_time: float):
+        self.metrics.record_miss(int(access_time * 1e9))
+
+    def get_metrics(self) -> CacheMetrics:
+        """
+        Além das métricas comuns, inclui a adaptação do ARC: o alvo 'p' de T1,
+        o tamanho das listas e quantas vezes 'p' aumentou ou diminuiu.
+        """
+        gauges = self.metrics.gauges
+        gauges['entries'] = len(self.t1) + len(self.t2)
+        gauges['bytes_in_use'] = self.budget.bytes_in_use
+        gauges['arc_p'] = self.p
+        gauges['arc_t1_size'] = len(self.t1)
+        gauges['arc_t2_size'] = len(self.t2)
+        gauges['arc_b1_size'] = len(self.b1)
+        gauges['arc_b2_size'] = len(self.b2)
+        return self.metrics
+
+    def get_stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self.metrics.hits,
+            misses=self.metrics.misses,
+            total_access_time=self.metrics.total_access_time,
+            bytes_in_use=self.budget.bytes_in_use,
+            bytes_evicted=self.budget.bytes_evicted
+        )
@@ -0,0 +1,227 @@
+import time
+from collections import OrderedDict
+from logging import DEBUG
+from core.byte_budget import text_size
+from core.cache_base import BaseCache
+from core.metrics import CacheMetrics, cache_log
+from core.registry import register_policy
+from algorithms.arc_cache import arc_invariant_violations
+
+
+@register_policy
+class CARCache(BaseCache):
+    """
+    Implementação do algoritmo CAR (Clock with Adaptive Replacement), de
+    Bansal e Modha (FAST 2004).
+
+    Usa a mesma adaptação do ARC: o tamanho alvo 'p' de T1 (textos vistos uma
+    vez) cresce a cada hit na lista fantasma B1 e diminui a cada hit em B2.
+    A diferença é que T1 e T2 são relógios: um hit só liga o bit de referência
+    do texto, sem mover nada. Na evicção, um texto referenciado de T1 passa
+    para T2, e um de T2 ganha uma segunda chance, até que o ponteiro encontre
+    um texto sem referência. Os invariantes das listas são os do ARC
+    ('check_invariants', verificado a cada alteração com 'debug_invariants').
+    """
+    __slots__ = ('read_from_slow_disk', 'p', 't1', 't2', 'b1', 'b2', 'debug_invariants')
+
+    def __init__(self, capacity: int = 10, reader_func=None, max_bytes: int | None = None,
+                 debug_invariants: bool = False):
+        super().__init__(capacity, max_bytes)
+        if capacity <= 0:
+            raise ValueError("A capacidade do cache deve ser maior que zero.")
+        if reader_func is None:
+            raise ValueError("Uma função de leitura (reader_func) deve ser fornecida.")
+        self.read_from_slow_disk = reader_func
+        self.p = 0
+        # Relógios T1 e T2 (text_id -> bit de referência); o início de cada um é a posição do ponteiro.
+        self.t1 = OrderedDict()
+        self.t2 = OrderedDict()
+        # Listas fantasma (só chaves), da mais antiga para a mais nova.
+        self.b1 = OrderedDict()
+        self.b2 = OrderedDict()
+        self.debug_invariants = debug_invariants
+
+    def check_invariants(self):
+        """
+        Verifica as condições do CAR sobre o tamanho das listas e o alvo 'p'.
+
+        Raises:
+            AssertionError: Se alguma condição não for respeitada.
+        """
+        problems = arc_invariant_violations(self.capacity, self.p, self.t1, self.t2, self.b1, self.b2)
+        if len(self.t1) + len(self.t2) != len(self.data):
+            problems.append(f"|T1| + |T2| = {len(self.t1) + len(self.t2)}, mas há {len(self.data)} textos")
+        if problems:
+            raise AssertionError(f"Invariantes do CAR violados: {'; '.join(problems)}.")
+
+    def _clock_victim(self) -> int:
+        """
+        Gira os ponteiros até achar um texto sem referência (sub-rotina REPLACE do CAR)
+        e move a sua chave para B1 ou B2. O conteúdo continua em 'data'.
+        """
+        while True:
+            # Se T2 estiver vazia (possível com o limite de bytes ou após invalidações), a remoção sai de T1.
+            if self.t1 and (len(self.t1) >= max(1, self.p) or not self.t2):
+                key, referenced = self.t1.popitem(last=False)
+                if referenced:
+                    self.t2[key] = False
+                    continue
+                self.b1[key] = None
+            else:
+                key, referenced = self.t2.popitem(last=False)
+                if referenced:
+                    self.t2[key] = False
+                    continue
+                self.b2[key] = None
+            return key
+
+    def _evict(self):
+        key = self._clock_victim()
+        self._evicted(key, self.remove(key))
+        cache_log.debug("Cache cheio. Removido (CAR): Texto %s", key)
+
+    def put(self, key: int, value: str):
+        """
+        Adiciona um texto ao cache. Um texto novo entra em T1; um texto cuja
+        chave estava em B1 ou B2 entra em T2 e ajusta o alvo 'p'.
+        """
+        if key in self.data:
+            return
+
+        size = text_size(value)
+        if not self.budget.admits(size):
+            self.metrics.rejections += 1
+            cache_log.warning("Texto %s (%s bytes) excede o limite de memória do cache. Não será armazenado.", key, size)
+            return
+
+        ghost = self.b1 if key in self.b1 else self.b2 if key in self.b2 else None
+        if len(self.data) >= self.capacity:
+            self._evict()
+            self.metrics.evictions += 1
+        if ghost is None:
+            # Mantém o diretório dentro dos limites. O artigo só faz isso com o cache cheio, único caso
+            # em que os limites seriam atingidos sem invalidações.
+            if self.b1 and len(self.t1) + len(self.b1) >= self.capacity:
+                self.b1.popitem(last=False)
+            elif self.b2 and len(self.t1) + len(self.t2) + len(self.b1) + len(self.b2) >= 2 * self.capacity:
+                self.b2.popitem(last=False)
+        while self.data and self.budget.needs_room(size):
+            self._evict()
+            self.metrics.evictions += 1
+
+        if ghost is None:
+            self.t1[key] = False
+        else:
+            if ghost is self.b1:
+                self.p = min(self.capacity, self.p + max(len(self.b2) // len(self.b1), 1))
+                self.metrics.increment('car_p_increases')
+            else:
+                self.p = max(0, self.p - max(len(self.b1) // len(self.b2), 1))
+                self.metrics.increment('car_p_decreases')
+            del ghost[key]
+            self.t2[key] = False
+
+        self.data[key] = value
+        self.budget.charge(key, size)
+        self.metrics.inserts += 1
+        if self.debug_invariants:
+            self.check_invariants()
+
+    def _forget(self, key: int):
+        # As listas fantasma não mudam: a invalidação não diz nada sobre recência ou frequência.
+        if self.t1.pop(key, None) is None:
+            del self.t2[key]
+
+    def _clear(self):
+        super()._clear()
+        self.t1.clear()
+        self.t2.clear()
+
+    def snapshot_state(self) -> dict:
+        """
+        Salva os textos na ordem dos relógios, quais estão em T2, as listas fantasma e 'p'.
+        """
+        return {
+            'entries': [(key, self.data[key]) for key in self.t1] + [(key, self.data[key]) for key in self.t2],
+            't2': list(self.t2),
+            'b1': list(self.b1),
+            'b2': list(self.b2),
+            'p': self.p,
+        }
+
+    def restore_state(self, state: dict, exclude=frozenset()):
+        self._clear()
+        self.b1.clear()
+        self.b2.clear()
+
+        t2_keys = set(state.get('t2', []))
+        for key, value in state['entries']:
+            size = text_size(value)
+            if key in exclude or not self.budget.admits(size):
+                continue
+            (self.t2 if key in t2_keys else self.t1)[key] = False
+            self.data[key] = value
+            self.budget.charge(key, size)
+
+        for key in state.get('b1', []):
+            if key not in self.data:
+                self.b1[key] = None
+        for key in state.get('b2', []):
+            if key not in self.data:
+                self.b2[key] = None
+        self.p = min(int(state.get('p', 0)), self.capacity)
+
+        # Ajusta o estado aos limites atuais, que podem ser menores que os do snapshot. Os textos
+        # descartados aqui não são evicções: não contam nas métricas nem chegam aos ouvintes.
+        while len(self.data) > self.capacity or self.budget.needs_room(0):
+            key = self._clock_victim()
+            self.remove(key)
+            self.budget.release(key, evicted=False)
+        while self.b1 and len(self.t1) + len(self.b1) > self.capacity:
+            self.b1.popitem(last=False)
+        while self.b2 and len(self.t1) + len(self.t2) + len(self.b1) + len(self.b2) > 2 * self.capacity:
+            self.b2.popitem(last=False)
+        if self.debug_invariants:
+            self.check_invariants()
+
+    def get_metrics(self) -> CacheMetrics:
+        """
+        Além das métricas comuns, inclui o alvo 'p' de T1 e o tamanho das listas.
+        """
+        gauges = super().get_metrics().gauges
+        gauges['car_p'] = self.p
+        gauges['car_t1_size'] = len(self.t1)
+        gauges['car_t2_size'] = len(self.t2)
+        gauges['car_b1_size'] = len(self.b1)
+        gauges['car_b2_size'] = len(self.b2)
+        return self.metrics
+
+    def access(self, text_id: int) -> tuple[bool, str, float]:
+        """
+        Acessa um texto. Um hit apenas liga o bit de referência.
+        """
+        start_time = time.perf_counter_ns()
+
+        content = self.data.get(text_id)
+        if content is not None:
+            if cache_log.isEnabledFor(DEBUG):
+                cache_log.debug("CACHE HIT! Acessando texto %s da memória.", text_id)
+            if text_id in self.t1:
+                self.t1[text_id] = True
+            else:
+                self.t2[text_id] = True
+            is_hit = True
+        else:
+            if cache_log.isEnabledFor(DEBUG):
+                cache_log.debug("CACHE MISS! Lendo texto %s do disco lento...", text_id)
+            content = self.read_from_slow_disk(text_id)
+            self.put(text_id, content)
+            is_hit = False
+
+        access_time_ns = time.perf_counter_ns() - start_time
+        if is_hit:
+            self.metrics.record_hit(access_time_ns)
+        else:
+            self.metrics.record_miss(access_time_ns)
+
+        return (is_hit, content, access_time_ns / 1e9)
@@ -0,0 +1,241 @@
+import time
+from logging import DEBUG
+from core.cache_base import BaseCache
+from core.metrics import cache_log
+from core.registry import register_policy
+
+# Estados de uma página no relógio.
+_HOT = 0
+_COLD = 1
+# Página fria que já saiu do cache, mas cuja chave ainda está em período de teste.
+_TEST = 2
+
+
+class _Page:
+    """
+    Uma posição do relógio (lista circular duplamente encadeada).
+    """
+    __slots__ = ('key', 'state', 'ref', 'prev', 'next')
+
+    def __init__(self, key: int, state: int):
+        self.key = key
+        self.state = state
+        self.ref = False
+        self.prev = self
+        self.next = self
+
+
+@register_policy
+class ClockProCache(BaseCache):
+    """
+    Implementação do algoritmo de cache CLOCK-Pro (Jiang, Chen e Zhang).
+
+    Aproxima o LIRS com um relógio: cada texto tem um bit de referência, ligado
+    nos hits, e é classificado como quente (reutilizado com frequência) ou frio.
+    Textos frios removidos continuam no relógio por um período de teste, só com
+    a chave. Se voltarem a ser pedidos nesse período, entram como quentes e a
+    parcela do cache reservada a textos frios aumenta; se o teste expirar, ela
+    diminui. Três ponteiros percorrem o relógio:
+
+    - hand_cold: remove textos frios sem referência (ou promove os referenciados);
+    - hand_hot: rebaixa textos quentes sem referência quando há quentes demais;
+    - hand_test: encerra o período de teste das chaves mais antigas.
+
+    Um hit só liga o bit de referência (O(1), sem mover nada), e varreduras de
+    textos usados uma única vez não expulsam os textos quentes.
+    """
+    __slots__ = ('read_from_slow_disk', 'pages', 'hand_hot', 'hand_cold', 'hand_test',
+                 'count_hot', 'count_cold', 'count_test', 'cold_target')
+
+    def __init__(self, capacity: int = 10, reader_func=None, max_bytes: int | None = None):
+        super().__init__(capacity, max_bytes)
+        if reader_func is None:
+            raise ValueError("Uma função de leitura (reader_func) deve ser fornecida.")
+        self.read_from_slow_disk = reader_func
+        self._reset_clock()
+
+    def _reset_clock(self):
+        # Todas as páginas do relógio, residentes ou em teste (text_id -> _Page).
+        self.pages = {}
+        self.hand_hot = self.hand_cold = self.hand_test = None
+        self.count_hot = self.count_cold = self.count_test = 0
+        # Número alvo de textos frios residentes; o restante da capacidade é dos quentes.
+        self.cold_target = self.capacity
+
+    def _link(self, page: _Page):
+        """
+        Insere a página no relógio logo antes de hand_hot (a posição "mais recente").
+        """
+        self.pages[page.key] = page
+        if self.hand_hot is None:
+            self.hand_hot = self.hand_cold = self.hand_test = page
+            return
+        before = self.hand_hot.prev
+        page.prev = before
+        page.next = self.hand_hot
+        before.next = page
+        self.hand_hot.prev = page
+        if self.hand_cold is self.hand_hot:
+            self.hand_cold = page
+
+    def _unlink(self, page: _Page):
+        """
+        Remove a página do relógio, recuando os ponteiros que apontavam para ela.
+        """
+        del self.pages[page.key]
+        if page.next is page:
+            self.hand_hot = self.hand_cold = self.hand_test = None
+            return
+        if page is self.hand_hot:
+            self.hand_hot = page.prev
+        if page is self.hand_cold:
+            self.hand_cold = page.prev
+        if page is self.hand_test:
+            self.hand_test = page.prev
+        page.prev.next = page.next
+        page.next.prev = page.prev
+
+    def _run_hand_cold(self):
+        page = self.hand_cold
+        if page.state == _COLD:
+            if page.ref:
+                # Reutilizado durante o período de teste: passa a ser quente.
+                page.state = _HOT
+                page.ref = False
+                self.count_cold -= 1
+                self.count_hot += 1
+            else:
+                # Sai do cache, mas a chave continua em teste no relógio.
+                page.state = _TEST
+                self.count_cold -= 1
+                self.count_test += 1
+                self._evicted(page.key, self.remove(page.key))
+                cache_log.debug("Cache cheio. Removido (CLOCK-Pro): Texto %s", page.key)
+                while self.count_test > self.capacity:
+                    self._run_hand_test()
+        self.hand_cold = self.hand_cold.next
+        while self.count_hot > self.capacity - self.cold_target:
+            self._run_hand_hot()
+
+    def _run_hand_hot(self):
+        if self.hand_hot is self.hand_test:
+            self._run_hand_test()
+        page = self.hand_hot
+        if page.state == _HOT:
+            if page.ref:
+                page.ref = False
+            else:
+                page.state = _COLD
+                self.count_hot -= 1
+                self.count_cold += 1
+        self.hand_hot = self.hand_hot.next
+
+    def _run_hand_test(self):
+        page = self.hand_test
+        if page.state == _TEST:
+            # O teste expirou sem novo acesso: esquece a chave e reduz a parcela dos frios.
+            self._unlink(page)
+            self.count_test -= 1
+            if self.cold_target > 1:
+                self.cold_target -= 1
+            if self.hand_test is None:
+                return
+        self.hand_test = self.hand_test.next
+
+    def _evict(self):
+        """
+        Gira os ponteiros até que um texto saia do cache.
+        """
+        resident = len(self.data)
+        while len(self.data) == resident:
+            if self.count_cold:
+                self._run_hand_cold()
+            else:
+                # Só há textos quentes (possível com o limite de bytes): rebaixa um deles.
+                self._run_hand_hot()
+
+    def put(self, key: int, value: str):
+        """
+        Adiciona um texto ao cache. Um texto novo entra como frio; um texto cuja
+        chave estava em teste entra como quente e aumenta a parcela dos frios.
+        """
+        if key in self.data:
+            return
+
+        state = _COLD
+        page = self.pages.get(key)
+        if page is not None:
+            self._unlink(page)
+            self.count_test -= 1
+            if self.cold_target < self.capacity:
+                self.cold_target += 1
+            state = _HOT
+
+        if not self._admit(key, value):
+            return
+
+        self._link(_Page(key, state))
+        if state == _HOT:
+            self.count_hot += 1
+        else:
+            self.count_cold += 1
+
+    def _clear(self):
+        super()._clear()
+        self._reset_clock()
+
+    def _forget(self, key: int):
+        page = self.pages[key]
+        if page.state == _HOT:
+            self.count_hot -= 1
+        else:
+            self.count_cold -= 1
+        self._unlink(page)
+
+    def snapshot_state(self) -> dict:
+        """
+        Salva os textos e quais deles são quentes.
+        """
+        state = super().snapshot_state()
+        state['hot'] = [key for key, page in self.pages.items() if page.state == _HOT]
+        state['cold_target'] = self.cold_target
+        return state
+
+    def restore_state(self, state: dict, exclude=frozenset()):
+        super().restore_state(state, exclude)
+
+        # Os textos voltam como frios; os que eram quentes são promovidos, dentro do limite atual.
+        self.cold_target = min(max(1, state.get('cold_target', self.capacity)), self.capacity)
+        for key in state.get('hot', []):
+            page = self.pages.get(key)
+            if page is not None and page.state == _COLD and self.count_hot < self.capacity - self.cold_target:
+                page.state = _HOT
+                self.count_cold -= 1
+                self.count_hot += 1
+
+    def access(self, text_id: int) -> tuple[bool, str, float]:
+        """
+        Acessa um texto. Um hit apenas liga o bit de referência.
+        """
+        start_time = time.perf_counter_ns()
+
+        content = self.data.get(text_id)
+        if content is not None:
+            if cache_log.isEnabledFor(DEBUG):
+                cache_log.debug("CACHE HIT! Acessando texto %s da memória.", text_id)
+            self.pages[text_id].ref = True
+            is_hit = True
+        else:
+            if cache_log.isEnabledFor(DEBUG):
+                cache_log.debug("CACHE MISS! Lendo texto %s do disco lento...", text_id)
+            content = self.read_from_slow_disk(text_id)
+            self.put(text_id, content)
+            is_hit = False
+
+        access_time_ns = time.perf_counter_ns() - start_time
+        if is_hit:
+            self.metrics.record_hit(access_time_ns)
+        else:
+            self.metrics.record_miss(access_time_ns)
+
+        return (is_hit, content, access_time_ns / 1e9)
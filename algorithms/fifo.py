@@ -1,16 +1,30 @@
 import time
-from core.cache_base import BaseCache 
+from logging import DEBUG
+from core.cache_base import BaseCache
+from core.metrics import cache_log
+from core.registry import register_policy
 
+@register_policy
 class FIFOCache(BaseCache):
     """
     Implementação do algoritmo de cache First-In, First-Out (FIFO).
     """
-    def __init__(self, capacity: int = 10, reader_func=None):
-        super().__init__(capacity)
+    __slots__ = ('read_from_slow_disk',)
+
+    def __init__(self, capacity: int = 10, reader_func=None, max_bytes: int | None = None):
+        super().__init__(capacity, max_bytes)
         if reader_func is None:
             raise ValueError("Uma função de leitura (reader_func) deve ser fornecida.")
         self.read_from_slow_disk = reader_func
 
+    def _evict(self):
+        """
+        Remove o item mais antigo (o primeiro que foi inserido).
+        """
+        oldest_key, value = self.pop_oldest()
+        self._evicted(oldest_key, value)
+        cache_log.debug("CACHE CHEIO. Removido (FIFO): Texto %s", oldest_key)
+
     def put(self, key: int, value: str):
         """
         Adiciona um item ao cache. Se o cache estiver cheio, remove o item
@@ -19,31 +33,30 @@ class FIFOCache(BaseCache):
         if key in self.data:
             return
 
-        if self.get_size() >= self.capacity:
-            oldest_key = self.order.pop(0)
-            del self.data[oldest_key]
-            print(f"CACHE CHEIO. Removido (FIFO): Texto {oldest_key}")
-
-        self.data[key] = value
-        self.order.append(key)
+        self._admit(key, value)
 
     def access(self, text_id: int) -> tuple[bool, str, float]:
         """
         Acessa um texto, implementando a lógica de cache hit/miss.
         """
-        start_time = time.perf_counter()
+        start_time = time.perf_counter_ns()
 
         if self.is_in_cache(text_id):
             content = self.get(text_id)
-            print(f"CACHE HIT! Acessando texto {text_id} da memória.")
+            if cache_log.isEnabledFor(DEBUG):
+                cache_log.debug("CACHE HIT! Acessando texto %s da memória.", text_id)
             is_hit = True
         else:
-            print(f"CACHE MISS! Lendo texto {text_id} do disco lento...")
+            if cache_log.isEnabledFor(DEBUG):
+                cache_log.debug("CACHE MISS! Lendo texto %s do disco lento...", text_id)
             content = self.read_from_slow_disk(text_id)
             self.put(text_id, content)
             is_hit = False
-        
-        end_time = time.perf_counter()
-        access_time = end_time - start_time
 
-        return (is_hit, content, access_time)
\ No newline at end of file
+        access_time_ns = time.perf_counter_ns() - start_time
+        if is_hit:
+            self.metrics.record_hit(access_time_ns)
+        else:
+            self.metrics.record_miss(access_time_ns)
+
+        return (is_hit, content, access_time_ns / 1e9)
\ No newline at end of file
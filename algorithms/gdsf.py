@@ -0,0 +1,181 @@
+import heapq
+import time
+from logging import DEBUG
+from core.cache_base import BaseCache
+from core.metrics import CacheMetrics, cache_log
+from core.registry import register_policy
+
+# Custo usado antes da primeira leitura medida (o atraso simulado do disco lento, em segundos).
+_DEFAULT_COST = 0.1
+
+
+@register_policy
+class GDSFCache(BaseCache):
+    """
+    Implementação do algoritmo GreedyDual-Size with Frequency (GDSF),
+    de Cherkasova (1998).
+
+    Cada texto recebe a prioridade H = L + frequência * custo / tamanho, em que
+    o custo é o tempo medido da sua leitura do disco e o tamanho são os seus
+    bytes. A evicção remove o texto de menor H: textos pequenos, caros de ler
+    ou muito acessados ficam no cache. L é a prioridade do último texto
+    removido; como os textos novos e os acessados de novo entram com o L
+    atual, os que não são usados há muito tempo acabam ficando com a menor
+    prioridade (envelhecimento), mesmo que já tenham sido muito acessados.
+
+    As prioridades ficam em um heap com remoção preguiçosa: um hit só adiciona
+    a nova prioridade (O(log n)), e as entradas antigas são descartadas ao
+    chegar ao topo.
+    """
+    # A prioridade depende do tempo medido da leitura (ver AdaptiveCache).
+    uses_read_cost = True
+    __slots__ = ('read_from_slow_disk', 'clock', 'priority', 'frequency', 'cost', 'heap',
+                 'load_time_total', 'load_count')
+
+    def __init__(self, capacity: int = 10, reader_func=None, max_bytes: int | None = None):
+        super().__init__(capacity, max_bytes)
+        if reader_func is None:
+            raise ValueError("Uma função de leitura (reader_func) deve ser fornecida.")
+        self.read_from_slow_disk = reader_func
+        # Soma dos tempos de leitura medidos, para estimar o custo dos textos inseridos com 'put'.
+        self.load_time_total = 0.0
+        self.load_count = 0
+        self._reset_priorities()
+
+    def _reset_priorities(self):
+        # L: prioridade do último texto removido.
+        self.clock = 0.0
+        # text_id -> prioridade atual; entradas do heap com outra prioridade estão vencidas.
+        self.priority = {}
+        self.frequency = {}
+        # text_id -> tempo medido da última leitura do disco, em segundos.
+        self.cost = {}
+        # (prioridade, text_id)
+        self.heap = []
+
+    def _push(self, key: int):
+        """
+        Calcula a prioridade atual do texto e a coloca no heap.
+        """
+        value = self.clock + self.frequency[key] * self.cost[key] / max(1, self.budget.sizes[key])
+        self.priority[key] = value
+        heapq.heappush(self.heap, (value, key))
+        # Os hits deixam entradas vencidas para trás; o heap é refeito quando elas são maioria.
+        if len(self.heap) > 2 * len(self.priority) + 16:
+            self.heap = [(priority, text_id) for text_id, priority in self.priority.items()]
+            heapq.heapify(self.heap)
+
+    def _evict(self):
+        """
+        Remove o texto de menor prioridade e avança L até ela.
+        """
+        while True:
+            value, key = heapq.heappop(self.heap)
+            if self.priority.get(key) == value:
+                break
+        self.clock = value
+        del self.priority[key]
+        del self.frequency[key]
+        del self.cost[key]
+        self._evicted(key, self.remove(key))
+        cache_log.debug("Cache cheio. Removido (GDSF): Texto %s (prioridade %.3g)", key, value)
+
+    def _store(self, key: int, value: str, cost: float):
+        if key in self.data or not self._admit(key, value):
+            return
+        self.frequency[key] = 1
+        self.cost[key] = cost
+        self._push(key)
+
+    def put(self, key: int, value: str):
+        """
+        Adiciona um texto lido fora do cache. Sem uma leitura medida, o custo é
+        a média das leituras feitas pelo próprio cache.
+        """
+        cost = self.load_time_total / self.load_count if self.load_count else _DEFAULT_COST
+        self._store(key, value, cost)
+
+    def _resized(self, key: int, old_size: int):
+        # Mantém o L da última atualização; só o termo custo / tamanho muda.
+        weight = self.frequency[key] * self.cost[key]
+        value = self.priority[key] + weight / max(1, self.budget.sizes[key]) - weight / max(1, old_size)
+        self.priority[key] = value
+        heapq.heappush(self.heap, (value, key))
+
+    def _forget(self, key: int):
+        del self.priority[key]
+        del self.frequency[key]
+        del self.cost[key]
+
+    def _clear(self):
+        super()._clear()
+        self._reset_priorities()
+
+    def snapshot_state(self) -> dict:
+        """
+        Salva os textos, a frequência e o custo de cada um e o valor de L.
+        """
+        state = super().snapshot_state()
+        state['gdsf'] = [(key, self.frequency[key], self.cost[key]) for key in self.data]
+        state['clock'] = self.clock
+        return state
+
+    def restore_state(self, state: dict, exclude=frozenset()):
+        super().restore_state(state, exclude)
+        self.clock = state.get('clock', 0.0)
+        for key, frequency, cost in state.get('gdsf', []):
+            if key in self.data:
+                self.frequency[key] = frequency
+                self.cost[key] = cost
+                self._push(key)
+
+    def _record_miss(self, key: int, access_time: float):
+        """
+        Miss resolvido fora de 'access' (ex.: por um wrapper que lê o disco fora do
+        lock): o tempo medido passa a ser o custo do texto, como em 'access'.
+        """
+        super()._record_miss(key, access_time)
+        self.load_time_total += access_time
+        self.load_count += 1
+        if key in self.data:
+            self.cost[key] = access_time
+            self._push(key)
+
+    def get_metrics(self) -> CacheMetrics:
+        """
+        Além das métricas comuns, inclui o valor de L (envelhecimento).
+        """
+        super().get_metrics().gauges['gdsf_clock'] = self.clock
+        return self.metrics
+
+    def access(self, text_id: int) -> tuple[bool, str, float]:
+        """
+        Acessa um texto. Um hit aumenta a frequência e renova a prioridade com o L atual;
+        um miss mede o tempo da leitura, que passa a ser o custo do texto.
+        """
+        start_time = time.perf_counter_ns()
+
+        content = self.data.get(text_id)
+        if content is not None:
+            if cache_log.isEnabledFor(DEBUG):
+                cache_log.debug("CACHE HIT! Acessando texto %s da memória.", text_id)
+            self.frequency[text_id] += 1
+            self._push(text_id)
+            is_hit = True
+        else:
+            if cache_log.isEnabledFor(DEBUG):
+                cache_log.debug("CACHE MISS! Lendo texto %s do disco lento...", text_id)
+            content = self.read_from_slow_disk(text_id)
+            load_time = (time.perf_counter_ns() - start_time) / 1e9
+            self.load_time_total += load_time
+            self.load_count += 1
+            self._store(text_id, content, load_time)
+            is_hit = False
+
+        access_time_ns = time.perf_counter_ns() - start_time
+        if is_hit:
+            self.metrics.record_hit(access_time_ns)
+        else:
+            self.metrics.record_miss(access_time_ns)
+
+        return (is_hit, content, access_time_ns / 1e9)
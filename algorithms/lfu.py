@@ -1,34 +1,96 @@
 import time
+from logging import DEBUG
+from collections import OrderedDict
 from core.cache_base import BaseCache
+from core.metrics import cache_log
+from core.registry import register_policy
 
+@register_policy
 class LFUCache(BaseCache):
     """
     Implementação do algoritmo de cache Least Frequently Used (LFU).
+
+    Os itens são agrupados em "baldes" por frequência de acesso. Cada balde é um
+    OrderedDict que mantém as chaves na ordem em que entraram naquela frequência.
+    Os baldes existentes formam uma lista duplamente encadeada em ordem crescente
+    de frequência, cujo início é 'min_freq'. Assim, hit, inserção e evicção são
+    O(1) (mesmo quando várias evicções seguidas esvaziam baldes), e o desempate
+    entre frequências iguais continua FIFO.
     """
-    def __init__(self, capacity: int = 10, reader_func=None):
-        super().__init__(capacity)
+    __slots__ = ('read_from_slow_disk', 'frequency', 'buckets', 'min_freq',
+                 'prev_freq', 'next_freq')
+
+    def __init__(self, capacity: int = 10, reader_func=None, max_bytes: int | None = None):
+        super().__init__(capacity, max_bytes)
         if reader_func is None:
             raise ValueError("Uma função de leitura (reader_func) deve ser fornecida.")
         self.read_from_slow_disk = reader_func
         self.frequency = {}
+        # Baldes de frequência: freq -> OrderedDict(chave -> None), em ordem de chegada.
+        self.buckets = {}
+        # Ligações entre baldes vizinhos (None marca as pontas da lista).
+        self.prev_freq = {}
+        self.next_freq = {}
+        self.min_freq = 0
+
+    def _add_bucket(self, freq: int, prev: int | None):
+        """
+        Cria o balde 'freq' logo depois do balde 'prev' (None = início da lista).
+        """
+        if prev is None:
+            nxt = self.min_freq if self.buckets else None
+            self.min_freq = freq
+        else:
+            nxt = self.next_freq[prev]
+            self.next_freq[prev] = freq
+        if nxt is not None:
+            self.prev_freq[nxt] = freq
+
+        self.buckets[freq] = OrderedDict()
+        self.prev_freq[freq] = prev
+        self.next_freq[freq] = nxt
+
+    def _drop_bucket(self, freq: int):
+        """
+        Remove um balde vazio, religando os seus vizinhos.
+        """
+        del self.buckets[freq]
+        prev = self.prev_freq.pop(freq)
+        nxt = self.next_freq.pop(freq)
+        if prev is None:
+            self.min_freq = nxt if nxt is not None else 0
+        else:
+            self.next_freq[prev] = nxt
+        if nxt is not None:
+            self.prev_freq[nxt] = prev
+
+    def _increment(self, key: int):
+        """
+        Move a chave do balde da sua frequência atual para o balde seguinte.
+        """
+        freq = self.frequency[key]
+        if freq + 1 not in self.buckets:
+            self._add_bucket(freq + 1, freq)
+        self.buckets[freq + 1][key] = None
+        self.frequency[key] = freq + 1
+
+        bucket = self.buckets[freq]
+        del bucket[key]
+        if not bucket:
+            self._drop_bucket(freq)
 
     def _evict(self):
         """
         Encontra e remove o item menos frequentemente usado.
         """
-        min_freq = min(self.frequency.values())
-        potential_victims = [key for key, freq in self.frequency.items() if freq == min_freq]
-        
-        lfu_key = -1
-        for key in self.order:
-            if key in potential_victims:
-                lfu_key = key
-                break
-        
-        print(f"Cache cheio. Removido (LFU): Texto {lfu_key} (frequência: {self.frequency[lfu_key]})")
-        
-        self.order.remove(lfu_key)
-        del self.data[lfu_key]
+        bucket = self.buckets[self.min_freq]
+        lfu_key, _ = bucket.popitem(last=False)
+        if not bucket:
+            self._drop_bucket(self.min_freq)
+
+        cache_log.debug("Cache cheio. Removido (LFU): Texto %s (frequência: %s)", lfu_key, self.frequency[lfu_key])
+
+        self._evicted(lfu_key, self.remove(lfu_key))
         del self.frequency[lfu_key]
 
     def put(self, key: int, value: str):
@@ -36,31 +98,97 @@ class LFUCache(BaseCache):
         if key in self.data:
             return
 
-        if self.get_size() >= self.capacity:
-            self._evict()
+        if not self._admit(key, value):
+            return
 
-        self.data[key] = value
-        self.order.append(key)
+        # Frequência 1 é sempre a menor possível, então o balde fica no início da lista.
+        if 1 not in self.buckets:
+            self._add_bucket(1, None)
+        self.buckets[1][key] = None
         self.frequency[key] = 1
 
+    def _reset_buckets(self):
+        self.frequency.clear()
+        self.buckets.clear()
+        self.prev_freq.clear()
+        self.next_freq.clear()
+        self.min_freq = 0
+
+    def _clear(self):
+        super()._clear()
+        self._reset_buckets()
+
+    def _forget(self, key: int):
+        freq = self.frequency.pop(key)
+        bucket = self.buckets[freq]
+        del bucket[key]
+        if not bucket:
+            self._drop_bucket(freq)
+
+    def snapshot_state(self) -> dict:
+        """
+        Salva os textos na ordem de inserção e os baldes de frequência na ordem FIFO de cada um.
+        """
+        state = super().snapshot_state()
+        state['buckets'] = [[freq, list(bucket)] for freq, bucket in self._iter_buckets()]
+        return state
+
+    def restore_state(self, state: dict, exclude=frozenset()):
+        super().restore_state(state, exclude)
+
+        # Reconstrói os baldes com as frequências salvas, apenas para os textos restaurados.
+        self._reset_buckets()
+        prev = None
+        for freq, keys in sorted(state.get('buckets', []), key=lambda item: item[0]):
+            keys = [key for key in keys if key in self.data]
+            if not keys:
+                continue
+            self._add_bucket(freq, prev)
+            for key in keys:
+                self.buckets[freq][key] = None
+                self.frequency[key] = freq
+            prev = freq
+
+        # Textos sem frequência salva (snapshot de outra versão) começam com frequência 1.
+        for key in self.data:
+            if key not in self.frequency:
+                if 1 not in self.buckets:
+                    self._add_bucket(1, None)
+                self.buckets[1][key] = None
+                self.frequency[key] = 1
+
+    def _iter_buckets(self):
+        """
+        Percorre os baldes em ordem crescente de frequência.
+        """
+        freq = self.min_freq if self.buckets else None
+        while freq is not None:
+            yield freq, self.buckets[freq]
+            freq = self.next_freq[freq]
+
     def access(self, text_id: int) -> tuple[bool, str, float]:
         """
         Acessa um texto, atualizando a frequência e aplicando a política LFU.
         """
-        start_time = time.perf_counter()
+        start_time = time.perf_counter_ns()
 
         if self.is_in_cache(text_id):
-            print(f"CACHE HIT! Acessando texto {text_id} da memória.")
+            if cache_log.isEnabledFor(DEBUG):
+                cache_log.debug("CACHE HIT! Acessando texto %s da memória.", text_id)
             content = self.get(text_id)
-            self.frequency[text_id] += 1
+            self._increment(text_id)
             is_hit = True
         else:
-            print(f"CACHE MISS! Lendo texto {text_id} do disco lento...")
+            if cache_log.isEnabledFor(DEBUG):
+                cache_log.debug("CACHE MISS! Lendo texto %s do disco lento...", text_id)
             content = self.read_from_slow_disk(text_id)
             self.put(text_id, content)
             is_hit = False
-        
-        end_time = time.perf_counter()
-        access_time = end_time - start_time
 
-        return (is_hit, content, access_time)
\ No newline at end of file
+        access_time_ns = time.perf_counter_ns() - start_time
+        if is_hit:
+            self.metrics.record_hit(access_time_ns)
+        else:
+            self.metrics.record_miss(access_time_ns)
+
+        return (is_hit, content, access_time_ns / 1e9)
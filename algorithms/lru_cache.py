@@ -1,49 +1,119 @@
 import time
 from collections import OrderedDict
+from logging import DEBUG
 from core.cache_abc import Cache, CacheStats
+from core.byte_budget import ByteBudget, text_size
+from core.metrics import CacheMetrics, cache_log
+from core.registry import register_policy
 
+@register_policy
 class LRUCache(Cache):
     """
     Implementação de um cache usando a estratégia Least Recently Used (LRU).
     Utiliza um OrderedDict para manter a ordem de acesso eficientemente.
     """
-    def __init__(self, capacity: int = 10, reader_func=None):
+    __slots__ = ('capacity', 'cache', 'read_from_slow_disk', 'budget', 'metrics', 'listeners')
+
+    def __init__(self, capacity: int = 10, reader_func=None, max_bytes: int | None = None):
         if capacity <= 0:
             raise ValueError("Capacidade do cache deve ser maior que zero.")
         if reader_func is None:
             raise ValueError("Uma função de leitura (reader_func) deve ser fornecida.")
-        
+
         self.capacity = capacity
         self.cache = OrderedDict()
         self.read_from_slow_disk = reader_func
-        self._hits = 0
-        self._misses = 0
-        self._total_access_time = 0.0
+        self.budget = ByteBudget(max_bytes)
+        self.metrics = CacheMetrics()
+        self.listeners = []
+
+    def _evict_lru(self):
+        lru_item = self.cache.popitem(last=False)
+        self.budget.release(lru_item[0])
+        self.metrics.evictions += 1
+        cache_log.debug("Cache cheio. Removido (LRU): Texto %s.", lru_item[0])
+        for listener in self.listeners:
+            listener(*lru_item)
+
+    def put(self, text_id: int, content: str):
+        """
+        Adiciona um item ao cache, removendo os itens menos recentemente usados
+        até que haja espaço (em número de itens e em bytes) para ele.
+        Itens maiores que o limite de bytes são recusados.
+        """
+        if text_id in self.cache:
+            return
+
+        size = text_size(content)
+        if not self.budget.admits(size):
+            self.metrics.rejections += 1
+            cache_log.warning("Texto %s (%s bytes) excede o limite de memória do cache. Não será armazenado.", text_id, size)
+            return
+
+        while self.cache and (len(self.cache) >= self.capacity or self.budget.needs_room(size)):
+            self._evict_lru()
+
+        self.cache[text_id] = content
+        self.budget.charge(text_id, size)
+        self.metrics.inserts += 1
+
+    def __contains__(self, text_id: int) -> bool:
+        return text_id in self.cache
+
+    def invalidate(self, text_id: int) -> bool:
+        if text_id not in self.cache:
+            return False
+        del self.cache[text_id]
+        self.budget.release(text_id, evicted=False)
+        self.metrics.increment('invalidations')
+        return True
+
+    def replace(self, text_id: int, content: str) -> bool:
+        if text_id not in self.cache:
+            return False
+        size = text_size(content)
+        if not self.budget.admits(size):
+            self.invalidate(text_id)
+            return False
+        # Atribuir a uma chave existente não muda a sua posição (recência).
+        self.cache[text_id] = content
+        self.budget.release(text_id, evicted=False)
+        self.budget.charge(text_id, size)
+        while self.budget.needs_room(0):
+            self._evict_lru()
+        return text_id in self.cache
+
+    def invalidate_all(self):
+        self.metrics.increment('invalidations', len(self.cache))
+        self.cache.clear()
+        self.budget.clear()
+
+    def add_eviction_listener(self, listener):
+        self.listeners.append(listener)
 
     def access(self, text_id: int) -> tuple[bool, str, float]:
-        start_time = time.perf_counter()
+        start_time = time.perf_counter_ns()
 
         if text_id in self.cache:
-            self._hits += 1
+            if cache_log.isEnabledFor(DEBUG):
+                cache_log.debug("CACHE HIT! Acessando texto %s da memória.", text_id)
             self.cache.move_to_end(text_id)
             content = self.cache[text_id]
             is_hit = True
         else:
-            self._misses += 1
+            if cache_log.isEnabledFor(DEBUG):
+                cache_log.debug("CACHE MISS! Lendo texto %s do disco lento...", text_id)
             content = self.read_from_slow_disk(text_id)
-
-            if len(self.cache) >= self.capacity:
-                lru_item = self.cache.popitem(last=False)
-                print(f"Cache cheio. Removido (LRU): Texto {lru_item[0]}.")
-
-            self.cache[text_id] = content
+            self.put(text_id, content)
             is_hit = False
 
-        end_time = time.perf_counter()
-        access_time = end_time - start_time
-        self._total_access_time += access_time
-        return is_hit, content, access_time
-    
+        access_time_ns = time.perf_counter_ns() - start_time
+        if is_hit:
+            self.metrics.record_hit(access_time_ns)
+        else:
+            self.metrics.record_miss(access_time_ns)
+        return is_hit, content, access_time_ns / 1e9
+
     # Em algorithms/lru_cache.py
 
     def __str__(self) -> str:
@@ -51,9 +121,32 @@ class LRUCache(Cache):
         items = ', '.join(map(str, self.cache.keys()))
         return f"LRUCache (Size: {len(self.cache)}/{self.capacity}) -> [{items}]"
 
+    def snapshot_state(self) -> dict:
+        # Do menos para o mais recentemente usado.
+        return {'entries': list(self.cache.items())}
+
+    def restore_state(self, state: dict, exclude=frozenset()):
+        # Só os textos mais novos que cabem nos limites atuais, sem passar por 'put':
+        # a restauração não conta inserções nem evicções e não chama os ouvintes.
+        self.cache.clear()
+        self.budget.clear()
+        for text_id, content, size in self.budget.newest_that_fit(state['entries'], self.capacity, exclude):
+            self.cache[text_id] = content
+            self.budget.charge(text_id, size)
+
+    def _record_miss(self, text_id: int, access_time: float):
+        self.metrics.record_miss(int(access_time * 1e9))
+
+    def get_metrics(self) -> CacheMetrics:
+        self.metrics.gauges['entries'] = len(self.cache)
+        self.metrics.gauges['bytes_in_use'] = self.budget.bytes_in_use
+        return self.metrics
+
     def get_stats(self) -> CacheStats:
         return CacheStats(
-            hits=self._hits,
-            misses=self._misses,
-            total_access_time=self._total_access_time
-        )
\ No newline at end of file
+            hits=self.metrics.hits,
+            misses=self.metrics.misses,
+            total_access_time=self.metrics.total_access_time,
+            bytes_in_use=self.budget.bytes_in_use,
+            bytes_evicted=self.budget.bytes_evicted
+        )
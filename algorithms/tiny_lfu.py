@@ -0,0 +1,229 @@
+import time
+from collections import OrderedDict
+from logging import DEBUG
+from core.cache_base import BaseCache
+from core.metrics import cache_log
+from core.registry import register_policy
+
+# Número de linhas do sketch.
+_ROWS = 4
+_MASK64 = (1 << 64) - 1
+_MAX_COUNT = 15
+# Tabela para dividir todos os contadores por 2 de uma vez (bytearray.translate).
+_HALVE = bytes(count >> 1 for count in range(256))
+
+
+class _FrequencySketch:
+    """
+    Count-min sketch com contadores de 4 bits (limitados a 15), guardado em um bytearray.
+
+    Estima quantas vezes cada chave foi acessada recentemente usando memória
+    fixa, sem guardar as chaves. Depois de 10 x 'width' incrementos, todos os
+    contadores são divididos por 2, para que frequências antigas percam peso.
+    """
+    __slots__ = ('width', 'mask', 'table', 'additions', 'sample_size')
+
+    def __init__(self, capacity: int):
+        # Largura: a menor potência de 2 maior ou igual à capacidade (mínimo 16).
+        bits = max(4, (max(1, capacity) - 1).bit_length())
+        self.width = 1 << bits
+        self.mask = self.width - 1
+        self.table = bytearray(_ROWS * self.width)
+        self.additions = 0
+        self.sample_size = 10 * self.width
+
+    def _indexes(self, key: int) -> tuple[int, int, int, int]:
+        # Um único hash de 64 bits dividido em duas metades gera os índices das
+        # quatro linhas (h1 + i * h2); as linhas ficam lado a lado no bytearray.
+        mixed = (hash(key) * 0x9E3779B97F4A7C15) & _MASK64
+        h1 = mixed >> 32
+        h2 = (mixed & 0xFFFFFFFF) | 1
+        mask, width = self.mask, self.width
+        return ((h1 & mask),
+                width + ((h1 + h2) & mask),
+                2 * width + ((h1 + 2 * h2) & mask),
+                3 * width + ((h1 + 3 * h2) & mask))
+
+    def increment(self, key: int):
+        table = self.table
+        for index in self._indexes(key):
+            if table[index] < _MAX_COUNT:
+                table[index] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.table = table.translate(_HALVE)
+            self.additions //= 2
+
+    def frequency(self, key: int) -> int:
+        table = self.table
+        a, b, c, d = self._indexes(key)
+        return min(table[a], table[b], table[c], table[d])
+
+
+@register_policy
+class WTinyLFUCache(BaseCache):
+    """
+    Implementação do algoritmo de cache W-TinyLFU (Einziger, Friedman e Manes).
+
+    - Janela: uma LRU pequena (~1% da capacidade) onde todo texto novo entra.
+    - Principal: uma LRU segmentada (SLRU), com uma parte de "experiência"
+      (probation, ~20%) e uma parte "protegida" (protected, ~80%). Um hit em
+      probation promove o texto para protected.
+    - Filtro de admissão: um count-min sketch estima a frequência de cada texto.
+      Quando a janela transborda e o cache está cheio, o texto mais antigo da
+      janela só entra na parte principal se for mais frequente que a vítima de
+      probation; caso contrário, é ele que sai.
+
+    Textos de uma varredura passam apenas pela janela e perdem a disputa com os
+    textos populares, que continuam no cache.
+    """
+    __slots__ = ('read_from_slow_disk', 'sketch', 'window', 'probation', 'protected',
+                 'window_size', 'protected_size')
+
+    def __init__(self, capacity: int = 10, reader_func=None, max_bytes: int | None = None,
+                 window_ratio: float = 0.01, protected_ratio: float = 0.8):
+        """
+        Args:
+            capacity (int): Capacidade máxima do cache.
+            reader_func: Função usada para ler os textos do disco.
+            max_bytes (int | None): Limite opcional de memória (em bytes) para os textos.
+            window_ratio (float): Fração da capacidade reservada para a janela.
+            protected_ratio (float): Fração da parte principal reservada para protected.
+        """
+        super().__init__(capacity, max_bytes)
+        if reader_func is None:
+            raise ValueError("Uma função de leitura (reader_func) deve ser fornecida.")
+        self.read_from_slow_disk = reader_func
+        self.window_size = max(1, int(capacity * window_ratio))
+        self.protected_size = int((capacity - self.window_size) * protected_ratio)
+        self.sketch = _FrequencySketch(capacity)
+        # As três listas guardam só chaves; os textos ficam em 'data'.
+        self.window = OrderedDict()
+        self.probation = OrderedDict()
+        self.protected = OrderedDict()
+
+    def _main_victim(self):
+        """
+        Lista da parte principal de onde sai a próxima vítima (probation, ou protected se vazia).
+        """
+        return self.probation if self.probation else self.protected
+
+    def _evict(self):
+        """
+        Remove um texto: o mais antigo da janela ou a vítima da parte principal,
+        o que tiver a menor frequência estimada.
+        """
+        main = self._main_victim()
+        if len(self.window) >= self.window_size or not main:
+            candidate = next(iter(self.window))
+            if main:
+                victim = next(iter(main))
+                if self.sketch.frequency(candidate) > self.sketch.frequency(victim):
+                    # O candidato vence a disputa: entra em probation e a vítima sai.
+                    del self.window[candidate]
+                    self.probation[candidate] = None
+                    del main[victim]
+                    self._discard(victim)
+                    return
+            del self.window[candidate]
+            self._discard(candidate)
+        else:
+            victim, _ = main.popitem(last=False)
+            self._discard(victim)
+
+    def _discard(self, key: int):
+        self._evicted(key, self.remove(key))
+        cache_log.debug("Cache cheio. Removido (W-TinyLFU): Texto %s", key)
+
+    def put(self, key: int, value: str):
+        """
+        Adiciona um texto novo à janela. Enquanto a parte principal tiver espaço,
+        os textos que transbordam da janela passam para probation sem disputa.
+        """
+        if key in self.data:
+            return
+
+        if not self._admit(key, value):
+            return
+
+        self.window[key] = None
+        main_room = self.capacity - self.window_size - len(self.probation) - len(self.protected)
+        while len(self.window) > self.window_size and main_room > 0:
+            old_key, _ = self.window.popitem(last=False)
+            self.probation[old_key] = None
+            main_room -= 1
+
+    def _clear(self):
+        super()._clear()
+        self.window.clear()
+        self.probation.clear()
+        self.protected.clear()
+
+    def _forget(self, key: int):
+        for segment in (self.window, self.probation, self.protected):
+            if key in segment:
+                del segment[key]
+                return
+
+    def snapshot_state(self) -> dict:
+        """
+        Salva os textos e quais deles estão em protected.
+        """
+        state = super().snapshot_state()
+        state['protected'] = list(self.protected)
+        return state
+
+    def restore_state(self, state: dict, exclude=frozenset()):
+        super().restore_state(state, exclude)
+
+        # Os textos voltam pela janela; os que estavam protegidos são promovidos de novo.
+        for key in state.get('protected', []):
+            if key in self.probation and len(self.protected) < self.protected_size:
+                del self.probation[key]
+                self.protected[key] = None
+
+    def _on_hit(self, text_id: int):
+        if text_id in self.window:
+            self.window.move_to_end(text_id)
+        elif text_id in self.probation:
+            # Segundo acesso na parte principal: promove para protected.
+            del self.probation[text_id]
+            self.protected[text_id] = None
+            if len(self.protected) > self.protected_size:
+                demoted, _ = self.protected.popitem(last=False)
+                self.probation[demoted] = None
+        else:
+            self.protected.move_to_end(text_id)
+
+    def _record_miss(self, text_id: int, access_time: float):
+        # Miss resolvido fora de 'access' (ex.: por um wrapper que lê o disco fora do lock).
+        self.sketch.increment(text_id)
+        super()._record_miss(text_id, access_time)
+
+    def access(self, text_id: int) -> tuple[bool, str, float]:
+        """
+        Acessa um texto. Todo acesso (hit ou miss) conta no sketch de frequência.
+        """
+        start_time = time.perf_counter_ns()
+
+        self.sketch.increment(text_id)
+        content = self.data.get(text_id)
+        if content is not None:
+            if cache_log.isEnabledFor(DEBUG):
+                cache_log.debug("CACHE HIT! Acessando texto %s da memória.", text_id)
+            self._on_hit(text_id)
+            is_hit = True
+        else:
+            if cache_log.isEnabledFor(DEBUG):
+                cache_log.debug("CACHE MISS! Lendo texto %s do disco lento...", text_id)
+            content = self.read_from_slow_disk(text_id)
+            self.put(text_id, content)
+            is_hit = False
+
+        access_time_ns = time.perf_counter_ns() - start_time
+        if is_hit:
+            self.metrics.record_hit(access_time_ns)
+        else:
+            self.metrics.record_miss(access_time_ns)
+
+        return (is_hit, content, access_time_ns / 1e9)
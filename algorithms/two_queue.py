@@ -0,0 +1,139 @@
+import time
+from collections import OrderedDict
+from logging import DEBUG
+from core.cache_base import BaseCache
+from core.metrics import cache_log
+from core.registry import register_policy
+
+@register_policy
+class TwoQueueCache(BaseCache):
+    """
+    Implementação do algoritmo de cache 2Q (versão completa, de Johnson e Shasha).
+
+    - A1in: fila FIFO com os textos vistos pela primeira vez (~25% da capacidade).
+    - A1out: lista "fantasma" (só chaves) dos textos que saíram de A1in (~50% da capacidade).
+    - Am: lista LRU com os textos acessados de novo depois de saírem de A1in.
+
+    Um texto só entra em Am se voltar a ser pedido enquanto a sua chave ainda
+    está em A1out. Assim, uma varredura de textos acessados uma única vez passa
+    apenas por A1in e não expulsa os textos populares de Am.
+    """
+    __slots__ = ('read_from_slow_disk', 'a1in', 'a1out', 'am', 'kin', 'kout')
+
+    def __init__(self, capacity: int = 10, reader_func=None, max_bytes: int | None = None,
+                 in_ratio: float = 0.25, out_ratio: float = 0.5):
+        """
+        Args:
+            capacity (int): Capacidade máxima do cache.
+            reader_func: Função usada para ler os textos do disco.
+            max_bytes (int | None): Limite opcional de memória (em bytes) para os textos.
+            in_ratio (float): Fração da capacidade reservada para A1in.
+            out_ratio (float): Tamanho de A1out, como fração da capacidade.
+        """
+        super().__init__(capacity, max_bytes)
+        if reader_func is None:
+            raise ValueError("Uma função de leitura (reader_func) deve ser fornecida.")
+        self.read_from_slow_disk = reader_func
+        self.kin = max(1, int(capacity * in_ratio))
+        self.kout = max(1, int(capacity * out_ratio))
+        # As três listas guardam só chaves; os textos ficam em 'data'.
+        self.a1in = OrderedDict()
+        self.a1out = OrderedDict()
+        self.am = OrderedDict()
+
+    def _evict(self):
+        """
+        Remove o texto mais antigo de A1in (lembrando a chave em A1out) se A1in
+        passou do seu tamanho alvo; caso contrário, remove o texto LRU de Am.
+        """
+        if self.a1in and (len(self.a1in) > self.kin or not self.am):
+            key, _ = self.a1in.popitem(last=False)
+            self.a1out[key] = None
+            if len(self.a1out) > self.kout:
+                self.a1out.popitem(last=False)
+            cache_log.debug("Cache cheio. Removido (2Q) de A1in: Texto %s", key)
+        else:
+            key, _ = self.am.popitem(last=False)
+            cache_log.debug("Cache cheio. Removido (2Q) de Am: Texto %s", key)
+        self._evicted(key, self.remove(key))
+
+    def put(self, key: int, value: str):
+        """
+        Adiciona um texto ao cache: em Am se a chave estava em A1out, ou em A1in se é novo.
+        """
+        if key in self.data:
+            return
+
+        if not self._admit(key, value):
+            return
+
+        if key in self.a1out:
+            del self.a1out[key]
+            self.am[key] = None
+        else:
+            self.a1in[key] = None
+
+    def _clear(self):
+        super()._clear()
+        self.a1in.clear()
+        self.a1out.clear()
+        self.am.clear()
+
+    def _forget(self, key: int):
+        if key in self.am:
+            del self.am[key]
+        else:
+            del self.a1in[key]
+
+    def snapshot_state(self) -> dict:
+        """
+        Salva os textos e a ordem das listas A1in, Am e A1out.
+        """
+        state = super().snapshot_state()
+        state['a1in'] = list(self.a1in)
+        state['am'] = list(self.am)
+        state['a1out'] = list(self.a1out)
+        return state
+
+    def restore_state(self, state: dict, exclude=frozenset()):
+        super().restore_state(state, exclude)
+
+        # Reconstrói as listas com a ordem salva, apenas para os textos restaurados.
+        am_keys = [key for key in state.get('am', []) if key in self.data]
+        self.am = OrderedDict.fromkeys(am_keys)
+        self.a1in = OrderedDict.fromkeys(key for key in state.get('a1in', []) if key in self.data)
+        # Textos sem lista salva (snapshot de outra versão) ficam em A1in.
+        for key in self.data:
+            if key not in self.am and key not in self.a1in:
+                self.a1in[key] = None
+        self.a1out = OrderedDict.fromkeys(
+            key for key in state.get('a1out', [])[-self.kout:] if key not in self.data
+        )
+
+    def access(self, text_id: int) -> tuple[bool, str, float]:
+        """
+        Acessa um texto. Hits em Am atualizam a ordem LRU; hits em A1in não alteram a fila.
+        """
+        start_time = time.perf_counter_ns()
+
+        if text_id in self.data:
+            if cache_log.isEnabledFor(DEBUG):
+                cache_log.debug("CACHE HIT! Acessando texto %s da memória.", text_id)
+            content = self.data[text_id]
+            if text_id in self.am:
+                self.am.move_to_end(text_id)
+            is_hit = True
+        else:
+            if cache_log.isEnabledFor(DEBUG):
+                cache_log.debug("CACHE MISS! Lendo texto %s do disco lento...", text_id)
+            content = self.read_from_slow_disk(text_id)
+            self.put(text_id, content)
+            is_hit = False
+
+        access_time_ns = time.perf_counter_ns() - start_time
+        if is_hit:
+            self.metrics.record_hit(access_time_ns)
+        else:
+            self.metrics.record_miss(access_time_ns)
+
+        return (is_hit, content, access_time_ns / 1e9)
@@ -0,0 +1,244 @@
+"""
+Teste diferencial do ARCCache e do CARCache contra implementações de referência.
+
+As referências abaixo são transcrições diretas do pseudocódigo dos artigos
+(ARC: Megiddo e Modha, FAST 2003, figura 4; CAR: Bansal e Modha, FAST 2004,
+figura 2), sem limite de bytes, invalidações nem métricas. As duas versões
+recebem a mesma sequência de acessos e, a cada acesso, precisam concordar
+sobre hit ou miss; a cada '--check-every' acessos (e no final), também sobre
+o conteúdo e a ordem de T1, T2, B1 e B2 e o valor de 'p'. As políticas rodam
+com 'debug_invariants=True', então os invariantes das listas também são
+verificados a cada miss.
+
+Os acessos vêm de cargas sintéticas (Zipf, varredura com laço quente e
+aleatória) ou de um log real ('--trace', no formato do simulation.trace_replay).
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.arc_differential --capacities 10 100 1000 --requests 50000
+    python -m benchmarks.arc_differential --trace acessos.csv.gz --column text_id --capacities 5000
+"""
+import argparse
+import random
+import sys
+from collections import OrderedDict
+from itertools import islice
+
+from algorithms.arc_cache import ARCCache
+from algorithms.car import CARCache
+
+
+class ReferenceARC:
+    """
+    ARC(c) como na figura 4 do artigo, com 'p' inteiro.
+    """
+
+    def __init__(self, c: int):
+        self.c = c
+        self.p = 0
+        self.t1, self.t2, self.b1, self.b2 = OrderedDict(), OrderedDict(), OrderedDict(), OrderedDict()
+
+    def _replace(self, x):
+        if self.t1 and (len(self.t1) > self.p or (x in self.b2 and len(self.t1) == self.p)):
+            self.b1[self.t1.popitem(last=False)[0]] = None
+        else:
+            self.b2[self.t2.popitem(last=False)[0]] = None
+
+    def request(self, x) -> bool:
+        # Caso I: hit em T1 ou T2.
+        if x in self.t1 or x in self.t2:
+            self.t1.pop(x, None)
+            self.t2.pop(x, None)
+            self.t2[x] = None
+            return True
+        # Caso II: x em B1.
+        if x in self.b1:
+            delta = 1 if len(self.b1) >= len(self.b2) else len(self.b2) // len(self.b1)
+            self.p = min(self.p + delta, self.c)
+            self._replace(x)
+            del self.b1[x]
+            self.t2[x] = None
+            return False
+        # Caso III: x em B2.
+        if x in self.b2:
+            delta = 1 if len(self.b2) >= len(self.b1) else len(self.b1) // len(self.b2)
+            self.p = max(self.p - delta, 0)
+            self._replace(x)
+            del self.b2[x]
+            self.t2[x] = None
+            return False
+        # Caso IV: x fora de todas as listas.
+        l1 = len(self.t1) + len(self.b1)
+        total = l1 + len(self.t2) + len(self.b2)
+        if l1 == self.c:
+            if len(self.t1) < self.c:
+                self.b1.popitem(last=False)
+                self._replace(x)
+            else:
+                self.t1.popitem(last=False)
+        elif l1 < self.c and total >= self.c:
+            if total == 2 * self.c:
+                self.b2.popitem(last=False)
+            self._replace(x)
+        self.t1[x] = None
+        return False
+
+
+class ReferenceCAR:
+    """
+    CAR(c) como na figura 2 do artigo, com 'p' inteiro. T1 e T2 guardam o bit de referência.
+    """
+
+    def __init__(self, c: int):
+        self.c = c
+        self.p = 0
+        self.t1, self.t2, self.b1, self.b2 = OrderedDict(), OrderedDict(), OrderedDict(), OrderedDict()
+
+    def _replace(self):
+        while True:
+            if len(self.t1) >= max(1, self.p):
+                key, referenced = self.t1.popitem(last=False)
+                if not referenced:
+                    self.b1[key] = None
+                    return
+                self.t2[key] = False
+            else:
+                key, referenced = self.t2.popitem(last=False)
+                if not referenced:
+                    self.b2[key] = None
+                    return
+                self.t2[key] = False
+
+    def request(self, x) -> bool:
+        if x in self.t1:
+            self.t1[x] = True
+            return True
+        if x in self.t2:
+            self.t2[x] = True
+            return True
+        in_b1, in_b2 = x in self.b1, x in self.b2
+        if len(self.t1) + len(self.t2) == self.c:
+            self._replace()
+            if not (in_b1 or in_b2) and len(self.t1) + len(self.b1) == self.c:
+                self.b1.popitem(last=False)
+            elif not (in_b1 or in_b2) and len(self.t1) + len(self.t2) + len(self.b1) + len(self.b2) == 2 * self.c:
+                self.b2.popitem(last=False)
+        if in_b1:
+            self.p = min(self.p + max(1, len(self.b2) // len(self.b1)), self.c)
+            del self.b1[x]
+            self.t2[x] = False
+        elif in_b2:
+            self.p = max(self.p - max(1, len(self.b1) // len(self.b2)), 0)
+            del self.b2[x]
+            self.t2[x] = False
+        else:
+            self.t1[x] = False
+        return False
+
+
+def _key_reader(text_id: int) -> str:
+    return str(text_id)
+
+
+def _zipf(length: int, universe: int, rng: random.Random) -> list[int]:
+    weights = [1 / rank for rank in range(1, universe + 1)]
+    return rng.choices(range(universe), weights=weights, k=length)
+
+
+def _scan_loop(length: int, universe: int, rng: random.Random) -> list[int]:
+    """
+    Alterna um laço sobre um conjunto quente com varreduras de chaves nunca vistas,
+    o caso em que o ajuste de 'p' mais importa.
+    """
+    hot = max(1, universe // 10)
+    trace, next_cold = [], universe
+    while len(trace) < length:
+        trace.extend(rng.randrange(hot) for _ in range(rng.randint(hot, 4 * hot)))
+        trace.extend(range(next_cold, next_cold + rng.randint(1, 2 * hot)))
+        next_cold = len(trace) + universe
+    return trace[:length]
+
+
+def _uniform(length: int, universe: int, rng: random.Random) -> list[int]:
+    return [rng.randrange(universe) for _ in range(length)]
+
+
+WORKLOADS = {"zipf": _zipf, "scan+loop": _scan_loop, "uniform": _uniform}
+
+
+def _same_state(policy, reference) -> str | None:
+    """
+    Compara as listas e 'p'; retorna a primeira diferença encontrada (ou None).
+    """
+    if policy.p != reference.p:
+        return f"p = {policy.p} (esperado {reference.p})"
+    for name in ("t1", "t2", "b1", "b2"):
+        ours, theirs = list(getattr(policy, name)), list(getattr(reference, name))
+        if ours != theirs:
+            return f"{name.upper()} = {ours[:10]}... (esperado {theirs[:10]}...)"
+    return None
+
+
+def compare(policy_class, reference_class, capacity: int, trace, check_every: int) -> tuple[int, int, str | None]:
+    """
+    Roda a política e a referência sobre o mesmo trace.
+
+    Returns:
+        tuple[int, int, str | None]: (acessos, hits, primeira divergência ou None).
+    """
+    policy = policy_class(capacity=capacity, reader_func=_key_reader, debug_invariants=True)
+    reference = reference_class(capacity)
+    requests = hits = 0
+    for requests, text_id in enumerate(trace, start=1):
+        try:
+            is_hit = policy.access(text_id)[0]
+        except AssertionError as e:
+            return requests, hits, f"acesso {requests} (texto {text_id}): {e}"
+        if is_hit != reference.request(text_id):
+            return requests, hits, f"acesso {requests} (texto {text_id}): hit = {is_hit}, esperado {not is_hit}"
+        hits += is_hit
+        if requests % check_every == 0:
+            problem = _same_state(policy, reference)
+            if problem:
+                return requests, hits, f"acesso {requests}: {problem}"
+    return requests, hits, _same_state(policy, reference)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--capacities", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--requests", type=int, default=20_000, help="acessos por carga sintética")
+    parser.add_argument("--universe", type=float, default=4.0, help="textos distintos, em múltiplos da capacidade")
+    parser.add_argument("--check-every", type=int, default=500, help="intervalo da comparação completa das listas")
+    parser.add_argument("--trace", help="log de acessos real (substitui as cargas sintéticas)")
+    parser.add_argument("--column", default="0", help="coluna do text_id no log (posição ou nome)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.trace:
+        # Importado só aqui: o replay carrega o pandas.
+        from simulation.trace_replay import iter_trace
+        column = int(args.column) if args.column.isdigit() else args.column
+        trace = list(islice(iter_trace(args.trace, column), args.requests))
+        workloads = {args.trace: lambda capacity: trace}
+    else:
+        workloads = {
+            name: (lambda capacity, make=make: make(args.requests, int(capacity * args.universe),
+                                                   random.Random(args.seed)))
+            for name, make in WORKLOADS.items()
+        }
+
+    failures = 0
+    print(f"{'Política':<10} {'Carga':<12} {'Capacidade':>10} {'Acessos':>9} {'Taxa de acerto':>15}  Resultado")
+    for policy_class, reference_class in ((ARCCache, ReferenceARC), (CARCache, ReferenceCAR)):
+        for name, make_trace in workloads.items():
+            for capacity in args.capacities:
+                requests, hits, problem = compare(policy_class, reference_class, capacity, make_trace(capacity),
+                                                  args.check_every)
+                failures += problem is not None
+                print(f"{policy_class.__name__:<10} {name:<12} {capacity:>10,} {requests:>9,} "
+                      f"{hits / max(requests, 1):>15.2%}  {problem or 'idêntico'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Compara a vazão do caminho assíncrono ('aaccess') com o caminho síncrono ('access').
+
+No modo assíncrono, N clientes concorrentes fazem requisições ao mesmo cache
+dentro de um único event loop, e misses simultâneos do mesmo texto aguardam uma
+única leitura. No modo síncrono, as mesmas requisições são feitas uma a uma,
+como no laço interativo do ra2_main.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.async_throughput --clients 1000 --requests 2
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from algorithms.arc_cache import ARCCache
+from algorithms.fifo import FIFOCache
+from algorithms.lfu import LFUCache
+from algorithms.lru_cache import LRUCache
+
+POLICIES = [FIFOCache, LRUCache, LFUCache, ARCCache]
+NUM_TEXTS = 100
+
+
+def _zipf_requests(clients: int, requests: int, skew: float) -> list[list[int]]:
+    rng = random.Random(42)
+    weights = [1 / (rank ** skew) for rank in range(1, NUM_TEXTS + 1)]
+    return [rng.choices(range(1, NUM_TEXTS + 1), weights=weights, k=requests) for _ in range(clients)]
+
+
+def _run_sync(policy, workload: list[list[int]], delay: float) -> tuple[float, int]:
+    reads = 0
+
+    def reader(text_id: int) -> str:
+        nonlocal reads
+        reads += 1
+        time.sleep(delay)
+        return f"Texto {text_id}"
+
+    cache = policy(capacity=10, reader_func=reader)
+    start = time.perf_counter()
+    for client in workload:
+        for text_id in client:
+            cache.access(text_id)
+    return time.perf_counter() - start, reads
+
+
+async def _run_async(policy, workload: list[list[int]], delay: float) -> tuple[float, int]:
+    reads = 0
+
+    async def reader(text_id: int) -> str:
+        nonlocal reads
+        reads += 1
+        await asyncio.sleep(delay)
+        return f"Texto {text_id}"
+
+    cache = policy(capacity=10, reader_func=lambda text_id: f"Texto {text_id}")
+
+    async def client(requests: list[int]):
+        for text_id in requests:
+            await cache.aaccess(text_id, reader=reader)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(requests) for requests in workload))
+    return time.perf_counter() - start, reads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=2, help="requisições por cliente")
+    parser.add_argument("--skew", type=float, default=1.1, help="expoente da distribuição Zipf")
+    parser.add_argument("--delay", type=float, default=0.005, help="atraso do disco lento (s)")
+    args = parser.parse_args()
+
+    workload = _zipf_requests(args.clients, args.requests, args.skew)
+    total_requests = args.clients * args.requests
+
+    rows = []
+    for policy in POLICIES:
+        rows.append((policy.__name__, "síncrono", *_run_sync(policy, workload, args.delay)))
+        rows.append((policy.__name__, "assíncrono", *asyncio.run(_run_async(policy, workload, args.delay))))
+
+    print(f"{args.clients} clientes x {args.requests} requisições (Zipf s={args.skew}), "
+          f"disco {args.delay * 1000:.0f} ms")
+    print(f"{'Algoritmo':<10} | {'Modo':<10} | {'Tempo (s)':>9} | {'Req/s':>10} | {'Leituras':>8}")
+    print("-" * 60)
+    for name, mode, elapsed, reads in rows:
+        print(f"{name:<10} | {mode:<10} | {elapsed:>9.2f} | {total_requests / elapsed:>10,.0f} | {reads:>8}")
+
+
+if __name__ == "__main__":
+    main()
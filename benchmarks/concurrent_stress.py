@@ -0,0 +1,112 @@
+"""
+Teste de carga do ConcurrentCache com várias threads e uma carga Zipf.
+
+Compara uma política protegida por um único lock global (que segura o lock
+durante a leitura do disco) com o ConcurrentCache (locks por fatia e leituras
+coalescidas), contando quantas leituras de disco cada um realmente fez.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.concurrent_stress --threads 32 --requests 200
+"""
+import argparse
+import random
+import threading
+import time
+
+from algorithms.arc_cache import ARCCache
+from algorithms.fifo import FIFOCache
+from algorithms.lfu import LFUCache
+from algorithms.lru_cache import LRUCache
+from core.concurrent_cache import ConcurrentCache
+
+POLICIES = [FIFOCache, LRUCache, LFUCache, ARCCache]
+NUM_TEXTS = 100
+
+
+class _CountingReader:
+    """Leitor que simula o disco lento e conta quantas leituras foram feitas."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, text_id: int) -> str:
+        with self._lock:
+            self.total += 1
+        time.sleep(self.delay)
+        return f"Texto {text_id}"
+
+
+class _GlobalLockCache:
+    """Referência ingênua: a política inteira atrás de um único lock."""
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.lock = threading.Lock()
+
+    def access(self, text_id: int):
+        with self.lock:
+            return self.cache.access(text_id)
+
+
+def _zipf_trace(length: int, skew: float, seed: int) -> list[int]:
+    rng = random.Random(seed)
+    weights = [1 / (rank ** skew) for rank in range(1, NUM_TEXTS + 1)]
+    return rng.choices(range(1, NUM_TEXTS + 1), weights=weights, k=length)
+
+
+def _run(cache, traces: list[list[int]]) -> float:
+    """Executa uma thread por trace e retorna o tempo total de parede."""
+    barrier = threading.Barrier(len(traces))
+
+    def worker(trace):
+        barrier.wait()
+        for text_id in trace:
+            cache.access(text_id)
+
+    threads = [threading.Thread(target=worker, args=(trace,)) for trace in traces]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=200, help="requisições por thread")
+    parser.add_argument("--capacity", type=int, default=10)
+    parser.add_argument("--shards", type=int, default=8)
+    parser.add_argument("--skew", type=float, default=1.1, help="expoente da distribuição Zipf")
+    parser.add_argument("--delay", type=float, default=0.01, help="atraso do disco lento (s)")
+    args = parser.parse_args()
+
+    traces = [_zipf_trace(args.requests, args.skew, seed) for seed in range(args.threads)]
+    total_requests = args.threads * args.requests
+
+    rows = []
+    for policy in POLICIES:
+        reader = _CountingReader(args.delay)
+        baseline = _GlobalLockCache(policy(capacity=args.capacity, reader_func=reader))
+        elapsed = _run(baseline, traces)
+        rows.append((policy.__name__, "lock global", elapsed, reader.total, 0))
+
+        reader = _CountingReader(args.delay)
+        concurrent = ConcurrentCache(policy, capacity=args.capacity, reader_func=reader, shards=args.shards)
+        elapsed = _run(concurrent, traces)
+        rows.append((policy.__name__, "concorrente", elapsed, reader.total, concurrent.coalesced_loads))
+
+    print(f"{args.threads} threads x {args.requests} requisições (Zipf s={args.skew}), "
+          f"capacidade {args.capacity}, disco {args.delay * 1000:.0f} ms")
+    print(f"{'Algoritmo':<10} | {'Modo':<11} | {'Tempo (s)':>9} | {'Req/s':>9} | {'Leituras':>8} | {'Coalescidas':>11}")
+    print("-" * 74)
+    for name, mode, elapsed, reads, coalesced in rows:
+        print(f"{name:<10} | {mode:<11} | {elapsed:>9.2f} | {total_requests / elapsed:>9,.0f} | "
+              f"{reads:>8} | {coalesced:>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Micro-benchmark do caminho de acesso de cada política.
+
+Para cada política e capacidade, mede o custo médio (ns por operação) de três
+cargas, com um leitor sem atraso (o tempo do disco simulado não entra na conta):
+
+- hit: todos os acessos encontram o texto no cache;
+- miss: todos os acessos são misses com evicção (cache cheio);
+- zipf: acessos com distribuição Zipf sobre 4x mais textos que a capacidade.
+
+Também mede a memória por entrada (atual e de pico) com tracemalloc. Os
+resultados podem ser gravados em JSON e comparados com um baseline gravado
+antes: operações que ficaram mais lentas que o limite são marcadas como
+regressão (e o processo termina com código 1).
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.hot_path --output docs/bench_baseline.json
+    python -m benchmarks.hot_path --baseline docs/bench_baseline.json
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from simulation.trace_engine import DEFAULT_POLICIES, fast_reader, generate_trace
+
+POLICIES = DEFAULT_POLICIES
+CAPACITIES = [10, 1_000, 100_000, 1_000_000]
+WORKLOADS = ("hit", "miss", "zipf")
+# A memória por entrada é constante; capacidades maiores são medidas com este número de entradas.
+MEMORY_MAX_ENTRIES = 100_000
+
+
+def _time_ops(cache, keys: list, repeat: int) -> float:
+    """
+    Retorna o menor tempo médio (ns por operação) entre 'repeat' execuções de 'keys'.
+    """
+    access = cache.access
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter_ns()
+        for key in keys:
+            access(key)
+        best = min(best, (time.perf_counter_ns() - start) / len(keys))
+    return best
+
+
+def _filled(cache_class, capacity: int):
+    cache = cache_class(capacity=capacity, reader_func=fast_reader)
+    for key in range(capacity):
+        cache.access(key)
+    return cache
+
+
+def _measure_memory(cache_class, capacity: int) -> tuple[float, float]:
+    """
+    Retorna (bytes por entrada ao final, bytes por entrada no pico) ao encher o cache.
+    A memória do cache vazio não entra na conta, e o conteúdo é o mesmo objeto para
+    todas as entradas, então só o custo da estrutura por entrada é medido.
+    """
+    entries = min(capacity, MEMORY_MAX_ENTRIES)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        cache = cache_class(capacity=entries, reader_func=fast_reader)
+        empty, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for key in range(entries):
+            cache.access(key)
+        # Alguns misses extras exercitam as estruturas de evicção (ex.: listas fantasma do ARC).
+        for key in range(entries, entries + entries // 2):
+            cache.access(key)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del cache
+    return (current - empty) / entries, (peak - empty) / entries
+
+
+def run_benchmarks(policies=None, capacities=CAPACITIES, ops: int = 100_000, repeat: int = 3,
+                   seed: int = 42, memory: bool = True) -> list[dict]:
+    """
+    Executa o benchmark de todas as combinações (política, capacidade).
+
+    Args:
+        policies: Classes de cache a medir (padrão: todas as políticas registradas).
+        capacities: Capacidades a medir.
+        ops (int): Operações por carga.
+        repeat (int): Repetições de cada carga (vale a mais rápida).
+        seed (int): Semente da carga Zipf.
+        memory (bool): Se False, pula a medição de memória.
+
+    Returns:
+        list[dict]: Um registro por (política, capacidade), com 'hit_ns', 'miss_ns',
+        'zipf_ns', 'zipf_hit_ratio', 'bytes_per_entry' e 'peak_bytes_per_entry'.
+    """
+    results = []
+    for capacity in capacities:
+        hit_keys = [key % capacity for key in range(ops)]
+        miss_keys = list(range(capacity, capacity + ops * repeat))
+        zipf_keys = generate_trace("zipf", ops, num_texts=4 * capacity, seed=seed).tolist()
+
+        for cache_class in policies or POLICIES:
+            record = {'policy': cache_class.__name__, 'capacity': capacity}
+
+            cache = _filled(cache_class, capacity)
+            record['hit_ns'] = _time_ops(cache, hit_keys, repeat)
+            # Cada repetição usa textos novos, para que todos os acessos sejam misses.
+            record['miss_ns'] = min(
+                _time_ops(cache, miss_keys[i * ops:(i + 1) * ops], 1) for i in range(repeat)
+            )
+            del cache
+
+            cache = _filled(cache_class, capacity)
+            hits_before = cache.get_stats().hits
+            record['zipf_ns'] = _time_ops(cache, zipf_keys, repeat)
+            record['zipf_hit_ratio'] = (cache.get_stats().hits - hits_before) / (len(zipf_keys) * repeat)
+            del cache
+
+            if memory:
+                record['bytes_per_entry'], record['peak_bytes_per_entry'] = _measure_memory(cache_class, capacity)
+            results.append(record)
+    return results
+
+
+def compare_with_baseline(results: list[dict], baseline: list[dict], threshold: float = 1.25) -> list[tuple]:
+    """
+    Compara os resultados com um baseline.
+
+    Returns:
+        list[tuple]: (política, capacidade, carga, ns no baseline, ns atual, razão)
+        de cada operação que ficou mais lenta que 'threshold' vezes o baseline.
+    """
+    previous = {(record['policy'], record['capacity']): record for record in baseline}
+    regressions = []
+    for record in results:
+        old = previous.get((record['policy'], record['capacity']))
+        if old is None:
+            continue
+        for workload in WORKLOADS:
+            key = f"{workload}_ns"
+            if key in old and old[key] > 0:
+                ratio = record[key] / old[key]
+                if ratio > threshold:
+                    regressions.append((record['policy'], record['capacity'], workload, old[key], record[key], ratio))
+    return regressions
+
+
+def _print_table(results: list[dict]):
+    print(f"{'Algoritmo':<13} | {'Capacidade':>10} | {'ns/hit':>8} | {'ns/miss':>8} | {'ns/zipf':>8} | "
+          f"{'Acerto zipf':>11} | {'B/entrada':>9} | {'Pico B/ent.':>11}")
+    print("-" * 99)
+    for record in results:
+        memory = (f"{record['bytes_per_entry']:>9,.0f} | {record['peak_bytes_per_entry']:>11,.0f}"
+                  if 'bytes_per_entry' in record else f"{'-':>9} | {'-':>11}")
+        print(f"{record['policy']:<13} | {record['capacity']:>10,} | {record['hit_ns']:>8,.0f} | "
+              f"{record['miss_ns']:>8,.0f} | {record['zipf_ns']:>8,.0f} | "
+              f"{record['zipf_hit_ratio'] * 100:>10.2f}% | {memory}")
+
+    # Crescimento do custo entre a menor e a maior capacidade: perto de 1x para estruturas O(1).
+    capacities = sorted({record['capacity'] for record in results})
+    if len(capacities) > 1:
+        print(f"\nCrescimento do custo de {capacities[0]:,} para {capacities[-1]:,} entradas:")
+        by_key = {(record['policy'], record['capacity']): record for record in results}
+        for policy in dict.fromkeys(record['policy'] for record in results):
+            smallest, largest = by_key[(policy, capacities[0])], by_key[(policy, capacities[-1])]
+            growth = ", ".join(
+                f"{workload} {largest[f'{workload}_ns'] / smallest[f'{workload}_ns']:.1f}x" for workload in WORKLOADS
+            )
+            print(f"  {policy:<13} {growth}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--capacities", nargs="+", type=int, default=CAPACITIES)
+    parser.add_argument("--policies", nargs="+", choices=[policy.__name__ for policy in POLICIES],
+                        default=[policy.__name__ for policy in POLICIES])
+    parser.add_argument("--ops", type=int, default=100_000, help="operações por carga")
+    parser.add_argument("--repeat", type=int, default=3, help="repetições de cada carga (vale a mais rápida)")
+    parser.add_argument("--no-memory", action="store_true", help="não mede a memória por entrada")
+    parser.add_argument("--output", default=None, help="arquivo JSON para gravar os resultados")
+    parser.add_argument("--baseline", default=None, help="arquivo JSON de uma execução anterior para comparação")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="razão atual/baseline a partir da qual uma operação é considerada regressão")
+    args = parser.parse_args()
+
+    policies = [policy for policy in POLICIES if policy.__name__ in args.policies]
+    start = time.perf_counter()
+    results = run_benchmarks(policies, args.capacities, ops=args.ops, repeat=args.repeat, memory=not args.no_memory)
+    print(f"Benchmark concluído em {time.perf_counter() - start:.1f} s.\n")
+    _print_table(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                'python': sys.version.split()[0],
+                'platform': platform.platform(),
+                'ops': args.ops,
+                'results': results,
+            }, f, indent=2)
+        print(f"\nResultados salvos em '{args.output}'.")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare_with_baseline(results, baseline, args.threshold)
+        if not regressions:
+            print(f"\nNenhuma regressão acima de {args.threshold:.2f}x em relação a '{args.baseline}'.")
+            return 0
+        print(f"\nRegressões em relação a '{args.baseline}' (limite {args.threshold:.2f}x):")
+        for policy, capacity, workload, old_ns, new_ns, ratio in regressions:
+            print(f"  {policy:<13} capacidade {capacity:>10,} {workload:<5}: {old_ns:,.0f} -> {new_ns:,.0f} ns ({ratio:.2f}x)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""
+Benchmark de escalabilidade do LFUCache.
+
+Mede o custo médio por acesso (hit e miss com evicção) para capacidades
+crescentes. Com os baldes de frequência, o custo deve ficar praticamente
+constante à medida que a capacidade aumenta.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.lfu_scaling
+"""
+import time
+
+from algorithms.lfu import LFUCache
+
+CAPACITIES = [1_000, 10_000, 100_000, 200_000]
+OPERATIONS = 50_000
+
+
+def _fast_reader(text_id: int) -> str:
+    """Leitor sem atraso, para medir apenas o custo da estrutura do cache."""
+    return "x"
+
+
+def _measure(capacity: int) -> tuple[float, float]:
+    """Retorna (ns por hit, ns por miss com evicção) para a capacidade dada."""
+    cache = LFUCache(capacity=capacity, reader_func=_fast_reader)
+    for key in range(capacity):
+        cache.access(key)
+    # Frequências variadas para que os baldes não fiquem todos iguais.
+    for key in range(0, capacity, 3):
+        cache.access(key)
+
+    hit_keys = [key % capacity for key in range(OPERATIONS)]
+    start = time.perf_counter()
+    for key in hit_keys:
+        cache.access(key)
+    hit_ns = (time.perf_counter() - start) / OPERATIONS * 1e9
+
+    miss_keys = range(capacity, capacity + OPERATIONS)
+    start = time.perf_counter()
+    for key in miss_keys:
+        cache.access(key)
+    miss_ns = (time.perf_counter() - start) / OPERATIONS * 1e9
+
+    return hit_ns, miss_ns
+
+
+def main():
+    results = []
+    for capacity in CAPACITIES:
+        results.append((capacity, *_measure(capacity)))
+
+    print(f"{'Capacidade':>12} | {'ns/hit':>10} | {'ns/miss':>10}")
+    print("-" * 38)
+    for capacity, hit_ns, miss_ns in results:
+        print(f"{capacity:>12,} | {hit_ns:>10,.0f} | {miss_ns:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Compara caches privados por processo com o servidor de cache compartilhado.
+
+N processos leitores fazem a mesma carga Zipf. No modo privado, cada processo
+tem o seu próprio cache de C textos; no modo compartilhado, todos usam o
+servidor (server/cache_server.py) com a mesma memória total (N x C textos),
+dividida entre os processos do servidor. São medidos a vazão agregada e o
+total de leituras do disco lento.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.server_throughput --clients 4 --requests 2000 --workers 2
+"""
+import argparse
+import multiprocessing
+import random
+import time
+
+from algorithms.lru_cache import LRUCache
+from server.cache_server import CacheServer
+from server.client import RemoteCache
+
+NUM_TEXTS = 100
+SOCKET = "/tmp/ra2_cache_bench.sock"
+
+
+def _reader(text_id: int) -> str:
+    time.sleep(_reader.delay)
+    return f"Texto {text_id} " * 200
+
+
+_reader.delay = 0.002
+
+
+def _zipf_trace(length: int, skew: float, seed: int) -> list[int]:
+    rng = random.Random(seed)
+    weights = [1 / (rank ** skew) for rank in range(1, NUM_TEXTS + 1)]
+    return rng.choices(range(1, NUM_TEXTS + 1), weights=weights, k=length)
+
+
+def _private_client(capacity: int, trace: list[int], delay: float, results):
+    _reader.delay = delay
+    cache = LRUCache(capacity=capacity, reader_func=_reader)
+    for text_id in trace:
+        cache.access(text_id)
+    results.put(cache.get_metrics().misses)
+
+
+def _shared_client(trace: list[int], results):
+    cache = RemoteCache(SOCKET)
+    for text_id in trace:
+        cache.access(text_id)
+    cache.close()
+    results.put(0)
+
+
+def _run_clients(target, args_per_client: list[tuple]) -> tuple[float, int]:
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=target, args=args + (results,)) for args in args_per_client]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    misses = sum(results.get() for _ in processes)
+    for process in processes:
+        process.join()
+    return time.perf_counter() - start, misses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=4, help="processos leitores")
+    parser.add_argument("--requests", type=int, default=2000, help="acessos por leitor")
+    parser.add_argument("--capacity", type=int, default=10, help="textos por leitor")
+    parser.add_argument("--workers", type=int, default=2, help="processos do servidor")
+    parser.add_argument("--skew", type=float, default=1.0)
+    parser.add_argument("--delay", type=float, default=0.002, help="atraso de cada leitura do disco (s)")
+    args = parser.parse_args()
+
+    traces = [_zipf_trace(args.requests, args.skew, seed) for seed in range(args.clients)]
+    total_requests = args.clients * args.requests
+
+    elapsed, disk_reads = _run_clients(
+        _private_client, [(args.capacity, trace, args.delay) for trace in traces])
+    print(f"{'Modo':<14} {'Tempo (s)':>10} {'Acessos/s':>11} {'Leituras do disco':>18}")
+    print(f"{'Privado':<14} {elapsed:>10.2f} {total_requests / elapsed:>11,.0f} {disk_reads:>18,}")
+
+    _reader.delay = args.delay
+    with CacheServer(LRUCache, SOCKET, capacity=args.clients * args.capacity, reader_func=_reader,
+                     workers=args.workers):
+        elapsed, _ = _run_clients(_shared_client, [(trace,) for trace in traces])
+        cache = RemoteCache(SOCKET)
+        disk_reads = cache.get_metrics().misses
+        cache.close()
+    print(f"{'Compartilhado':<14} {elapsed:>10.2f} {total_requests / elapsed:>11,.0f} {disk_reads:>18,}")
+
+
+if __name__ == "__main__":
+    main()
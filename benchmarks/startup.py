@@ -0,0 +1,61 @@
+"""
+Mede o tempo de inicialização e a memória (RSS máximo) de um processo leitor.
+
+Compara o caminho interativo do ra2_main, que carrega só o cache e os
+leitores, com o carregamento do simulador (numpy, pandas, matplotlib e
+seaborn), que antes acontecia em toda inicialização. Cada medida roda em um
+processo Python novo, e o resultado é a mediana das repetições.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks.startup --repeat 5
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+# Cada cenário importa os módulos e imprime o tempo de importação e o RSS máximo (em KiB, no Linux).
+_PROBE = """
+import resource, time
+start = time.perf_counter()
+{imports}
+elapsed = time.perf_counter() - start
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+# O último cenário equivale à inicialização antiga, que importava o simulador com os gráficos.
+SCENARIOS = {
+    "Leitor (ra2_main)": "import ra2_main",
+    "Leitor + simulador": "import ra2_main\nimport simulation.simulator",
+    "Leitor + simulador + gráficos": "import ra2_main\nimport simulation.simulator\n"
+                                     "from simulation.plotting import load_pyplot\nload_pyplot()\nimport seaborn",
+}
+
+
+def _measure(imports: str) -> tuple[float, float, float]:
+    """
+    Retorna (tempo total do processo, tempo de importação, RSS máximo em MB) de uma execução.
+    """
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", _PROBE.format(imports=imports)],
+                            capture_output=True, text=True, check=True).stdout
+    wall = time.perf_counter() - start
+    import_time, max_rss_kib = output.split()
+    return wall, float(import_time), int(max_rss_kib) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="execuções por cenário")
+    args = parser.parse_args()
+
+    print(f"{'Cenário':<32} {'Processo (s)':>13} {'Importação (s)':>15} {'RSS (MB)':>9}")
+    for name, imports in SCENARIOS.items():
+        runs = [_measure(imports) for _ in range(args.repeat)]
+        wall, import_time, rss = (statistics.median(values) for values in zip(*runs))
+        print(f"{name:<32} {wall:>13.3f} {import_time:>15.3f} {rss:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
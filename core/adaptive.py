@@ -0,0 +1,260 @@
+from core.byte_budget import text_size
+from core.cache_abc import Cache, CacheStats
+from core.metrics import CacheMetrics, cache_log
+from core.registry import available_policies
+
+_MASK64 = (1 << 64) - 1
+# Constante de Knuth para o hash multiplicativo que decide quais chaves são amostradas.
+_KNUTH = 0x9E3779B97F4A7C15
+_SHADOW_CONTENT = ""
+# Buffer de zeros compartilhado; o "conteúdo" de cada texto nas sombras é uma fatia dele.
+_shadow_buffer = bytes(64 * 1024)
+
+
+def _shadow_placeholder(size: int) -> memoryview:
+    """
+    Retorna um conteúdo de 'size' bytes para as sombras, sem copiar memória:
+    a fatia de um buffer compartilhado tem o tamanho certo para o limite de bytes.
+    """
+    global _shadow_buffer
+    if size > len(_shadow_buffer):
+        _shadow_buffer = bytes(max(size, 2 * len(_shadow_buffer)))
+    return memoryview(_shadow_buffer)[:size]
+
+
+class AdaptiveCache(Cache):
+    """
+    Cache que escolhe a política de substituição durante a execução.
+
+    Além da política em uso (a "viva"), mantém uma cópia "sombra" de cada
+    política candidata, que recebe os mesmos acessos mas guarda apenas as
+    chaves. Com 'sample_rate' < 1, as sombras recebem só uma amostra fixa das
+    chaves (escolhida por hash) e têm a capacidade reduzida na mesma proporção,
+    o que mantém a taxa de acerto estimada e reduz o custo. Com 'max_bytes', as
+    sombras também têm o limite de bytes (reduzido pela amostragem) e cada chave
+    ocupa nelas o tamanho real do texto, sem guardar o conteúdo.
+
+    As sombras não leem o disco, então as políticas que usam o custo medido da
+    leitura (como o GDSF, com 'uses_read_cost') ficam fora das candidatas padrão.
+
+    A cada 'window' acessos amostrados, a taxa de acerto de cada sombra é
+    atualizada com média móvel exponencial. Se a melhor candidata superar a
+    política viva por mais que 'margin', ela passa a ser a política viva: os
+    textos em cache são transferidos para uma instância nova, na ordem da
+    política anterior, sem reler o disco e sem esvaziar o cache.
+    """
+    __slots__ = ('capacity', 'max_bytes', 'read_from_slow_disk', 'live', 'shadows', 'window', 'decay',
+                 'margin', 'sample_threshold', 'window_hits', 'window_accesses', 'scores',
+                 'switches', 'retired_metrics', 'listeners', 'shadow_size')
+
+    def __init__(self, capacity: int = 10, reader_func=None, max_bytes: int | None = None,
+                 candidates=None, initial=None, sample_rate: float = 1.0,
+                 window: int = 200, decay: float = 0.5, margin: float = 0.02):
+        """
+        Args:
+            capacity (int): Capacidade máxima do cache.
+            reader_func: Função usada para ler os textos do disco.
+            max_bytes (int | None): Limite opcional de memória (em bytes) para os textos.
+            candidates: Classes das políticas candidatas (padrão: todas as registradas que
+                não dependem do custo da leitura).
+            initial: Classe da política viva no início (padrão: a primeira candidata).
+            sample_rate (float): Fração das chaves acompanhada pelas sombras (0 < taxa <= 1).
+            window (int): Acessos amostrados entre duas reavaliações.
+            decay (float): Peso das janelas anteriores na taxa de acerto móvel (0 a 1).
+            margin (float): Vantagem mínima, na taxa de acerto, para trocar de política.
+        """
+        if capacity <= 0:
+            raise ValueError("A capacidade do cache deve ser maior que zero.")
+        if reader_func is None:
+            raise ValueError("Uma função de leitura (reader_func) deve ser fornecida.")
+        if not 0 < sample_rate <= 1:
+            raise ValueError("A taxa de amostragem deve estar entre 0 (exclusive) e 1.")
+        if window <= 0:
+            raise ValueError("A janela de avaliação deve ser maior que zero.")
+
+        candidates = list(candidates or (
+            cache_class for cache_class in available_policies().values()
+            if not getattr(cache_class, 'uses_read_cost', False)
+        ))
+        if initial is not None and initial not in candidates:
+            candidates.insert(0, initial)
+
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.read_from_slow_disk = reader_func
+        self.window = window
+        self.decay = decay
+        self.margin = margin
+        self.sample_threshold = int(sample_rate * (1 << 64))
+        # Ouvintes de evicção, registrados também em cada nova política viva.
+        self.listeners = []
+
+        # Tamanho do texto que está sendo repassado às sombras (ver '_shadow_reader').
+        self.shadow_size = 0
+        shadow_capacity = max(1, round(capacity * sample_rate))
+        shadow_max_bytes = max(1, round(max_bytes * sample_rate)) if max_bytes is not None else None
+        self.shadows = {
+            cache_class: cache_class(capacity=shadow_capacity, reader_func=self._shadow_reader,
+                                     max_bytes=shadow_max_bytes)
+            for cache_class in candidates
+        }
+        self.live = self._new_policy(initial or candidates[0])
+
+        self.window_hits = dict.fromkeys(self.shadows, 0)
+        self.window_accesses = 0
+        # Taxa de acerto móvel de cada sombra (None até a primeira janela completa).
+        self.scores = dict.fromkeys(self.shadows)
+        self.switches = 0
+        # Métricas acumuladas pelas políticas vivas anteriores.
+        self.retired_metrics = CacheMetrics()
+
+    @property
+    def policy(self) -> type:
+        """
+        Classe da política viva.
+        """
+        return type(self.live)
+
+    def _new_policy(self, cache_class: type) -> Cache:
+        cache = cache_class(capacity=self.capacity, reader_func=self.read_from_slow_disk, max_bytes=self.max_bytes)
+        for listener in self.listeners:
+            cache.add_eviction_listener(listener)
+        return cache
+
+    def _shadow_reader(self, text_id: int):
+        # Sem limite de bytes, as sombras guardam só as chaves: o conteúdo é sempre o mesmo objeto vazio.
+        if self.max_bytes is None:
+            return _SHADOW_CONTENT
+        return _shadow_placeholder(self.shadow_size)
+
+    def _observe(self, text_id: int, content=None):
+        """
+        Repassa o acesso às sombras (se a chave for amostrada) e reavalia a
+        política viva ao final de cada janela.
+        """
+        if ((hash(text_id) * _KNUTH) & _MASK64) >= self.sample_threshold:
+            return
+        if self.max_bytes is not None:
+            size = self.live.budget.sizes.get(text_id) if hasattr(self.live, 'budget') else None
+            if size is None:
+                size = text_size(content) if content is not None else 0
+            self.shadow_size = size
+        window_hits = self.window_hits
+        for cache_class, shadow in self.shadows.items():
+            if shadow.access(text_id)[0]:
+                window_hits[cache_class] += 1
+        self.window_accesses += 1
+        if self.window_accesses >= self.window:
+            self._reevaluate()
+
+    def _reevaluate(self):
+        for cache_class, hits in self.window_hits.items():
+            ratio = hits / self.window_accesses
+            previous = self.scores[cache_class]
+            self.scores[cache_class] = ratio if previous is None else self.decay * previous + (1 - self.decay) * ratio
+            self.window_hits[cache_class] = 0
+        self.window_accesses = 0
+
+        best = max(self.scores, key=self.scores.get)
+        if best is not self.policy and self.scores[best] > self.scores[self.policy] + self.margin:
+            cache_log.info("Política trocada: %s -> %s (taxa de acerto estimada %.1f%% -> %.1f%%).",
+                           self.policy.__name__, best.__name__,
+                           self.scores[self.policy] * 100, self.scores[best] * 100)
+            self._switch_to(best)
+
+    def _switch_to(self, cache_class: type):
+        """
+        Troca a política viva, transferindo os textos em cache para a nova instância.
+        """
+        old = self.live
+        new = self._new_policy(cache_class)
+        # Do mais antigo para o mais novo (na ordem da política anterior), sem contar como acessos.
+        for text_id, content in old.snapshot_state()['entries']:
+            new.put(text_id, content)
+        # As inserções da transferência não são inserções novas.
+        new.get_metrics().inserts = 0
+
+        old_metrics = old.get_metrics()
+        old_metrics.gauges.clear()
+        self.retired_metrics.merge(old_metrics)
+        self.live = new
+        self.switches += 1
+
+    def access(self, text_id: int) -> tuple[bool, str, float]:
+        """
+        Acessa um texto na política viva e repassa o acesso às sombras.
+        """
+        result = self.live.access(text_id)
+        self._observe(text_id, result[1])
+        return result
+
+    def put(self, text_id: int, content: str):
+        self.live.put(text_id, content)
+
+    def __contains__(self, text_id: int) -> bool:
+        return text_id in self.live
+
+    def invalidate(self, text_id: int) -> bool:
+        # As sombras guardam só chaves, que continuam valendo para estimar a taxa de acerto.
+        return self.live.invalidate(text_id)
+
+    def replace(self, text_id: int, content: str) -> bool:
+        return self.live.replace(text_id, content)
+
+    def invalidate_all(self):
+        self.live.invalidate_all()
+
+    def add_eviction_listener(self, listener):
+        self.listeners.append(listener)
+        self.live.add_eviction_listener(listener)
+
+    def _record_miss(self, text_id: int, access_time: float):
+        self.live._record_miss(text_id, access_time)
+        self._observe(text_id)
+
+    def snapshot_state(self) -> dict:
+        state = self.live.snapshot_state()
+        state['live_policy'] = self.policy.__name__
+        return state
+
+    def restore_state(self, state: dict, exclude=frozenset()):
+        # Volta para a política que estava viva quando o snapshot foi salvo, se ela for candidata.
+        for cache_class in self.shadows:
+            if cache_class.__name__ == state.get('live_policy') and cache_class is not self.policy:
+                self.live = self._new_policy(cache_class)
+        if state.get('live_policy') == self.policy.__name__:
+            self.live.restore_state(state, exclude)
+        else:
+            # Estado de uma política que não é mais candidata: aproveita apenas os textos.
+            self.live = self._new_policy(self.policy)
+            for text_id, content in state['entries']:
+                if text_id not in exclude:
+                    self.live.put(text_id, content)
+
+    def get_metrics(self) -> CacheMetrics:
+        """
+        Métricas somadas de todas as políticas que já estiveram vivas, com o número
+        de trocas e a taxa de acerto estimada de cada candidata.
+        """
+        metrics = CacheMetrics()
+        metrics.merge(self.retired_metrics)
+        metrics.merge(self.live.get_metrics())
+        metrics.counters['policy_switches'] = self.switches
+        for cache_class, score in self.scores.items():
+            if score is not None:
+                metrics.gauges[f'shadow_hit_ratio_{cache_class.__name__}'] = score
+        return metrics
+
+    def get_stats(self) -> CacheStats:
+        live = self.live.get_stats()
+        retired = self.retired_metrics
+        return CacheStats(
+            hits=retired.hits + live.hits,
+            misses=retired.misses + live.misses,
+            total_access_time=retired.total_access_time + live.total_access_time,
+            bytes_in_use=live.bytes_in_use,
+            bytes_evicted=live.bytes_evicted,
+        )
+
+    def __str__(self) -> str:
+        return f"{self.live} [adaptativo: {self.policy.__name__}]"
@@ -0,0 +1,96 @@
+def text_size(content) -> int:
+    """
+    Retorna o tamanho em bytes de um conteúdo armazenado no cache.
+    Textos são medidos pela sua codificação UTF-8; bytes são medidos diretamente.
+    """
+    if isinstance(content, (bytes, bytearray, memoryview)):
+        return len(content)
+    return len(content.encode('utf-8'))
+
+
+class ByteBudget:
+    """
+    Contabiliza a memória ocupada pelos textos de um cache.
+
+    Se 'max_bytes' for None, o orçamento é ilimitado e serve apenas para
+    medir os bytes em uso e os bytes removidos.
+    """
+    __slots__ = ('max_bytes', 'sizes', 'bytes_in_use', 'bytes_evicted')
+
+    def __init__(self, max_bytes: int | None = None):
+        """
+        Args:
+            max_bytes (int | None): Limite de bytes do cache, ou None para ilimitado.
+        """
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("O limite de bytes do cache deve ser maior que zero.")
+        self.max_bytes = max_bytes
+        self.sizes = {}
+        self.bytes_in_use = 0
+        self.bytes_evicted = 0
+
+    def admits(self, size: int) -> bool:
+        """
+        Verifica se um item desse tamanho cabe no cache quando ele está vazio.
+        """
+        return self.max_bytes is None or size <= self.max_bytes
+
+    def needs_room(self, size: int) -> bool:
+        """
+        Verifica se é preciso remover itens antes de inserir um de 'size' bytes.
+        """
+        return self.max_bytes is not None and self.bytes_in_use + size > self.max_bytes
+
+    def charge(self, key: int, size: int):
+        """
+        Registra a entrada de um item no cache.
+        """
+        self.sizes[key] = size
+        self.bytes_in_use += size
+
+    def release(self, key: int, evicted: bool = True) -> int:
+        """
+        Registra a saída de um item do cache e retorna o seu tamanho.
+
+        Args:
+            key (int): Chave do item removido.
+            evicted (bool): Se True, o tamanho é somado aos bytes removidos por evicção.
+        """
+        size = self.sizes.pop(key, 0)
+        self.bytes_in_use -= size
+        if evicted:
+            self.bytes_evicted += size
+        return size
+
+    def clear(self):
+        """
+        Esquece todos os itens, sem contá-los como removidos por evicção.
+        """
+        self.sizes.clear()
+        self.bytes_in_use = 0
+
+    def newest_that_fit(self, entries, capacity: int, exclude=frozenset()) -> list[tuple[int, str, int]]:
+        """
+        Escolhe, entre os itens de um snapshot (do mais antigo para o mais novo), os
+        mais novos que cabem juntos em 'capacity' itens e no limite de bytes, para
+        restaurar o cache sem evicções.
+
+        Returns:
+            list[tuple[int, str, int]]: (chave, conteúdo, tamanho), na ordem original.
+        """
+        chosen = []
+        total = 0
+        for key, value in reversed(entries):
+            if len(chosen) >= capacity:
+                break
+            if key in exclude:
+                continue
+            size = text_size(value)
+            if not self.admits(size):
+                continue
+            if self.max_bytes is not None and total + size > self.max_bytes:
+                break
+            chosen.append((key, value, size))
+            total += size
+        chosen.reverse()
+        return chosen
@@ -1,15 +1,22 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
 from abc import ABC, abstractmethod
 from typing import NamedTuple
+from core.metrics import CacheMetrics
 
 class CacheStats(NamedTuple):
     hits: int
     misses: int
-    total_access_time: int
+    total_access_time: float
+    bytes_in_use: int = 0
+    bytes_evicted: int = 0
 
 class Cache(ABC):
     """
     Essa classe abstrata deverá ser usada como base para implementação do algoritmo de cache.
     """
+    # Leituras assíncronas em andamento (text_id -> Task), criado sob demanda por 'aaccess'.
+    __slots__ = ('_pending_loads',)
 
     @abstractmethod
     def access(self, text_id: int) -> tuple[bool, str, float]:
@@ -27,4 +34,207 @@ class Cache(ABC):
             - str: Conteúdo do texto solicitado.
             - float: O tempo gasto nessa operação de acesso.
         """
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def put(self, text_id: int, content: str):
+        """
+        Armazena um texto já carregado, aplicando a política de substituição,
+        sem contar como acesso (não altera hits nem misses).
+        Se o texto já estiver no cache, nada é feito.
+
+        Args:
+            text_id (int): Identificador numérico do texto.
+            content (str): Conteúdo do texto.
+        """
+        pass
+
+    @abstractmethod
+    def __contains__(self, text_id: int) -> bool:
+        """
+        Verifica se o texto está no cache, sem alterar o estado da política.
+        """
+        pass
+
+    @abstractmethod
+    def invalidate(self, text_id: int) -> bool:
+        """
+        Remove um texto do cache porque o conteúdo guardado deixou de valer
+        (ex.: o arquivo foi alterado). Não conta como evicção.
+
+        Returns:
+            bool: True se o texto estava no cache.
+        """
+        pass
+
+    @abstractmethod
+    def replace(self, text_id: int, content: str) -> bool:
+        """
+        Troca o conteúdo de um texto que já está no cache (ex.: uma versão relida
+        do disco), mantendo o seu estado na política: recência, frequência,
+        listas fantasma etc. Não conta como acesso nem como inserção. Se o novo
+        conteúdo passar do limite de bytes, outros textos são removidos por
+        evicção; se não couber nem sozinho, o texto é invalidado.
+
+        Returns:
+            bool: True se o texto está no cache com o novo conteúdo.
+        """
+        pass
+
+    @abstractmethod
+    def invalidate_all(self):
+        """
+        Remove todos os textos do cache, sem contá-los como evicções.
+        """
+        pass
+
+    @abstractmethod
+    def add_eviction_listener(self, listener):
+        """
+        Registra uma função 'listener(text_id, conteúdo)', chamada sempre que um texto
+        sai do cache por evicção (não por invalidação), logo depois de sair.
+        """
+        pass
+
+    @abstractmethod
+    def snapshot_state(self) -> dict:
+        """
+        Retorna o conteúdo e o estado da política em estruturas simples (listas,
+        números e strings), para que o cache possa ser salvo em disco.
+        Todo snapshot tem a chave 'entries': uma lista de pares (text_id, conteúdo).
+        """
+        pass
+
+    @abstractmethod
+    def restore_state(self, state: dict, exclude=frozenset()):
+        """
+        Substitui o conteúdo do cache pelo estado salvo por 'snapshot_state',
+        respeitando os limites atuais de capacidade e de bytes.
+
+        Args:
+            state (dict): Estado retornado por 'snapshot_state' da mesma política.
+            exclude: Textos que não devem ser restaurados (por exemplo, desatualizados).
+        """
+        pass
+
+    @abstractmethod
+    def get_metrics(self) -> CacheMetrics:
+        """
+        Retorna as métricas da política: contadores de hits, misses, inserções e
+        evicções, histogramas de latência e medidores específicos da política.
+        """
+        pass
+
+    def _record_miss(self, text_id: int, access_time: float):
+        """
+        Contabiliza um miss resolvido fora de 'access' (por exemplo, em 'aaccess').
+        Políticas que mantêm estatísticas devem sobrescrever este método.
+        """
+        pass
+
+    async def _load_and_put(self, text_id: int, reader) -> str:
+        """
+        Lê um texto sem bloquear o event loop e o armazena no cache.
+        """
+        import asyncio
+        try:
+            if reader is None:
+                content = await asyncio.to_thread(self.read_from_slow_disk, text_id)
+            else:
+                content = await reader(text_id)
+            self.put(text_id, content)
+            return content
+        finally:
+            del self._pending_loads[text_id]
+
+    async def aaccess(self, text_id: int, reader=None) -> tuple[bool, str, float]:
+        """
+        Versão assíncrona de 'access', para uso dentro de um event loop asyncio.
+
+        Hits são resolvidos na memória, sem suspender a corrotina. Em um miss, o texto
+        é lido pela corrotina 'reader' (ou pelo leitor síncrono da política, executado
+        em uma thread) e todas as requisições simultâneas para o mesmo texto aguardam
+        uma única leitura em andamento.
+
+        Args:
+            text_id (int): Identificador numérico do texto.
+            reader: Corrotina opcional 'async def reader(text_id) -> str'.
+
+        Returns:
+            A mesma tupla de 'access': (is_hit, conteúdo, tempo de acesso).
+        """
+        if text_id in self:
+            return self.access(text_id)
+
+        # Importado aqui: só quem já roda um event loop paga pelo asyncio.
+        import asyncio
+        start_time = time.perf_counter()
+        try:
+            pending = self._pending_loads
+        except AttributeError:
+            pending = self._pending_loads = {}
+
+        task = pending.get(text_id)
+        if task is None:
+            task = pending[text_id] = asyncio.ensure_future(self._load_and_put(text_id, reader))
+        # shield: cancelar um cliente não cancela a leitura que os outros aguardam.
+        content = await asyncio.shield(task)
+
+        access_time = time.perf_counter() - start_time
+        self._record_miss(text_id, access_time)
+        return False, content, access_time
+
+    def access_many(self, text_ids, reader_many=None, max_workers: int | None = None) -> list[tuple[bool, str, float]]:
+        """
+        Acessa vários textos de uma vez (por exemplo, todos os textos de uma página).
+
+        Os textos que não estão no cache são lidos do disco em paralelo, em uma única
+        rodada, e depois a política é aplicada na ordem das requisições: cada texto
+        lido é inserido com 'put' e os demais passam por 'access' normalmente.
+
+        Args:
+            text_ids: Sequência de identificadores, na ordem das requisições.
+            reader_many: Função opcional 'reader_many(ids) -> list[str]' que lê vários
+                textos de uma vez, na mesma ordem. Sem ela, o leitor da política é
+                executado em um pool de threads.
+            max_workers (int | None): Número máximo de threads do pool.
+
+        Returns:
+            Uma lista com a tupla de 'access' (is_hit, conteúdo, tempo) de cada requisição.
+        """
+        text_ids = list(text_ids)
+        missing = [text_id for text_id in dict.fromkeys(text_ids) if text_id not in self]
+
+        loaded = {}
+        load_times = {}
+        if missing and reader_many is not None:
+            start_time = time.perf_counter()
+            contents = reader_many(missing)
+            elapsed = time.perf_counter() - start_time
+            for text_id, content in zip(missing, contents):
+                loaded[text_id] = content
+                load_times[text_id] = elapsed
+        elif missing:
+            def timed_read(text_id: int) -> tuple[str, float]:
+                start_time = time.perf_counter()
+                content = self.read_from_slow_disk(text_id)
+                return content, time.perf_counter() - start_time
+
+            workers = max_workers or min(32, len(missing))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for text_id, (content, elapsed) in zip(missing, pool.map(timed_read, missing)):
+                    loaded[text_id] = content
+                    load_times[text_id] = elapsed
+
+        results = []
+        for text_id in text_ids:
+            if text_id in loaded and text_id not in self:
+                start_time = time.perf_counter()
+                content = loaded[text_id]
+                self.put(text_id, content)
+                access_time = load_times[text_id] + (time.perf_counter() - start_time)
+                self._record_miss(text_id, access_time)
+                results.append((False, content, access_time))
+            else:
+                results.append(self.access(text_id))
+        return results
@@ -1,4 +1,12 @@
-from core.cache_abc import Cache
+from abc import abstractmethod
+from collections import OrderedDict
+from itertools import islice
+from core.cache_abc import Cache, CacheStats
+from core.byte_budget import ByteBudget, text_size
+from core.metrics import CacheMetrics, cache_log
+
+# Número máximo de chaves exibidas por __str__, para não percorrer caches grandes.
+_STR_MAX_ITEMS = 20
 
 class BaseCache(Cache):
     """
@@ -6,17 +14,74 @@ class BaseCache(Cache):
     Esta classe implementa a interface Cache.
     A lógica de substituição e o método 'access' serão implementados
     nas classes de algoritmos específicos.
+
+    Os itens ficam em um OrderedDict, que guarda a ordem de inserção e permite
+    inserir, remover qualquer chave e retirar a mais antiga em O(1).
     """
-    def __init__(self, capacity: int = 10):
+    __slots__ = ('capacity', 'data', 'budget', 'metrics', 'listeners')
+
+    def __init__(self, capacity: int = 10, max_bytes: int | None = None):
         """
         Inicializa o cache.
         
         Args:
             capacity (int): A capacidade máxima de armazenamento do cache.
+            max_bytes (int | None): Limite opcional de memória (em bytes) para os textos.
         """
         self.capacity = capacity
-        self.data = {}
-        self.order = []
+        self.data = OrderedDict()
+        self.budget = ByteBudget(max_bytes)
+        self.metrics = CacheMetrics()
+        self.listeners = []
+
+    @abstractmethod
+    def _evict(self):
+        """
+        Remove um item do cache segundo a política de substituição.
+        Deve ser implementado pelas classes de algoritmos específicos.
+        """
+
+    def _evicted(self, key: int, value: str):
+        """
+        Registra a saída de um item removido por evicção (já retirado de 'data')
+        e avisa os ouvintes de evicção.
+        """
+        self.budget.release(key)
+        for listener in self.listeners:
+            listener(key, value)
+
+    def add_eviction_listener(self, listener):
+        self.listeners.append(listener)
+
+    def _admit(self, key: int, value: str) -> bool:
+        """
+        Insere um item novo, removendo itens até que ele caiba no cache.
+        Itens maiores que o limite de bytes são recusados, sem esvaziar o cache.
+
+        Returns:
+            bool: True se o item foi armazenado.
+        """
+        size = text_size(value)
+        if not self.budget.admits(size):
+            self.metrics.rejections += 1
+            cache_log.warning("Texto %s (%s bytes) excede o limite de memória do cache. Não será armazenado.", key, size)
+            return False
+
+        while self.data and (self.get_size() >= self.capacity or self.budget.needs_room(size)):
+            self._evict()
+            self.metrics.evictions += 1
+
+        self.data[key] = value
+        self.budget.charge(key, size)
+        self.metrics.inserts += 1
+        return True
+
+    @property
+    def order(self):
+        """
+        Chaves do cache na ordem de inserção (da mais antiga para a mais nova).
+        """
+        return self.data.keys()
 
     def get(self, key: int) -> str | None:
         """
@@ -24,21 +89,121 @@ class BaseCache(Cache):
         """
         return self.data.get(key)
 
+    def pop_oldest(self) -> tuple[int, str]:
+        """
+        Remove e retorna o item inserido há mais tempo, em O(1).
+        """
+        return self.data.popitem(last=False)
+
+    def remove(self, key: int) -> str:
+        """
+        Remove um item específico do cache, em O(1).
+        """
+        return self.data.pop(key)
+
     def is_in_cache(self, key: int) -> bool:
         """
         Verifica se um item (texto) já está no cache.
         """
         return key in self.data
 
+    def __contains__(self, key: int) -> bool:
+        return key in self.data
+
     def get_size(self) -> int:
         """
         Retorna o número atual de itens no cache.
         """
         return len(self.data)
 
+    def _clear(self):
+        """
+        Esvazia o cache, sem contar os itens como removidos por evicção.
+        """
+        self.data.clear()
+        self.budget.clear()
+
+    def _forget(self, key: int):
+        """
+        Retira uma chave das estruturas próprias da política (listas, baldes etc.),
+        antes de o item sair de 'data'. Políticas com estruturas extras devem sobrescrever.
+        """
+        pass
+
+    def invalidate(self, text_id: int) -> bool:
+        if text_id not in self.data:
+            return False
+        self._forget(text_id)
+        self.remove(text_id)
+        self.budget.release(text_id, evicted=False)
+        self.metrics.increment('invalidations')
+        return True
+
+    def replace(self, text_id: int, content: str) -> bool:
+        if text_id not in self.data:
+            return False
+        size = text_size(content)
+        if not self.budget.admits(size):
+            self.invalidate(text_id)
+            return False
+        # Atribuir a uma chave existente não muda a sua posição no OrderedDict.
+        self.data[text_id] = content
+        old_size = self.budget.sizes.get(text_id, 0)
+        self.budget.release(text_id, evicted=False)
+        self.budget.charge(text_id, size)
+        self._resized(text_id, old_size)
+        while self.budget.needs_room(0):
+            self._evict()
+            self.metrics.evictions += 1
+        return text_id in self.data
+
+    def _resized(self, key: int, old_size: int):
+        """
+        Chamado por 'replace' quando o tamanho de um texto muda. As políticas que
+        usam o tamanho na prioridade a atualizam aqui.
+        """
+        pass
+
+    def invalidate_all(self):
+        self.metrics.increment('invalidations', len(self.data))
+        self._clear()
+
+    def snapshot_state(self) -> dict:
+        return {'entries': list(self.data.items())}
+
+    def restore_state(self, state: dict, exclude=frozenset()):
+        # Reinserir na ordem original reconstrói a ordem da política. Só entram os textos mais
+        # novos que cabem nos limites atuais, então 'put' não remove nada: a restauração não
+        # conta evicções nem inserções e não chama os ouvintes de evicção.
+        self._clear()
+        inserts = self.metrics.inserts
+        for key, value, _ in self.budget.newest_that_fit(state['entries'], self.capacity, exclude):
+            self.put(key, value)
+        self.metrics.inserts = inserts
+
+    def _record_miss(self, text_id: int, access_time: float):
+        self.metrics.record_miss(int(access_time * 1e9))
+
+    def get_metrics(self) -> CacheMetrics:
+        self.metrics.gauges['entries'] = len(self.data)
+        self.metrics.gauges['bytes_in_use'] = self.budget.bytes_in_use
+        return self.metrics
+
+    def get_stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self.metrics.hits,
+            misses=self.metrics.misses,
+            total_access_time=self.metrics.total_access_time,
+            bytes_in_use=self.budget.bytes_in_use,
+            bytes_evicted=self.budget.bytes_evicted
+        )
+
     def __str__(self) -> str:
         """
         Representação em string do estado atual do cache.
         """
-        items = ', '.join(map(str, self.order))
+        items = ', '.join(map(str, islice(self.data, _STR_MAX_ITEMS)))
+        hidden = len(self.data) - _STR_MAX_ITEMS
+        if hidden > 0:
+            items += f", ... (+{hidden})"
         return f"Cache (Size: {self.get_size()}/{self.capacity}) -> [{items}]"
\ No newline at end of file
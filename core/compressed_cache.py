@@ -0,0 +1,216 @@
+import time
+from collections import OrderedDict
+from core.byte_budget import ByteBudget, text_size
+from core.cache_abc import Cache, CacheStats
+from core.metrics import CacheMetrics
+from storage.compression import TextCodec
+
+
+class CompressedCache(Cache):
+    """
+    Guarda os textos comprimidos, para caber mais textos no mesmo limite de bytes.
+
+    A política escolhida recebe os textos já comprimidos (o seu limite de bytes
+    passa a contar os bytes comprimidos) e os descomprime apenas em um hit. Os
+    textos usados mais recentemente também ficam descomprimidos em uma pequena
+    camada "quente" (LRU), que responde aos hits sem descompressão. A memória da
+    camada quente sai do mesmo limite de bytes: 'hot_bytes' ficam reservados
+    para ela e o restante vai para a política.
+    """
+    __slots__ = ('cache', 'codec', 'read_from_slow_disk', 'hot', 'hot_size', 'hot_budget', 'metrics',
+                 'last_read', 'bytes_in', 'bytes_out', 'compress_ns', 'decompress_ns', 'decompressions')
+
+    def __init__(self, cache_class, capacity: int = 10, reader_func=None, max_bytes: int | None = None,
+                 codec: TextCodec | None = None, hot_size: int = 2, hot_bytes: int | None = None):
+        """
+        Args:
+            cache_class: Classe da política (ex.: LRUCache) que guarda os textos comprimidos.
+            capacity (int): Número máximo de textos (comprimidos) no cache.
+            reader_func: Função usada para ler os textos do disco.
+            max_bytes (int | None): Limite opcional de memória, somando os textos comprimidos e a camada quente.
+            codec (TextCodec | None): Método de compressão (padrão: zlib nível 6, sem dicionário).
+            hot_size (int): Número máximo de textos descomprimidos na camada quente (0 desativa).
+            hot_bytes (int | None): Bytes reservados para a camada quente (padrão: 1/8 de 'max_bytes').
+        """
+        if reader_func is None:
+            raise ValueError("Uma função de leitura (reader_func) deve ser fornecida.")
+        if max_bytes is not None and hot_bytes is None:
+            hot_bytes = max_bytes // 8 if hot_size else 0
+        if max_bytes is not None and hot_bytes >= max_bytes:
+            raise ValueError("A reserva da camada quente deve ser menor que o limite de bytes do cache.")
+
+        self.codec = codec or TextCodec()
+        self.read_from_slow_disk = reader_func
+        self.cache = cache_class(capacity=capacity, reader_func=self._read_compressed,
+                                 max_bytes=None if max_bytes is None else max_bytes - hot_bytes)
+        self.hot = OrderedDict()
+        self.hot_size = hot_size
+        self.hot_budget = ByteBudget(hot_bytes or None)
+        # Hits, misses e latências vistos por fora, incluindo a descompressão.
+        self.metrics = CacheMetrics()
+        # Último texto lido do disco, para não descomprimir o que acabou de ser comprimido.
+        self.last_read = None
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.compress_ns = 0
+        self.decompress_ns = 0
+        self.decompressions = 0
+
+    @property
+    def policy(self) -> type:
+        """
+        Classe da política que guarda os textos comprimidos.
+        """
+        return getattr(self.cache, 'policy', type(self.cache))
+
+    def _compress(self, content: str) -> bytes:
+        start_time = time.perf_counter_ns()
+        data = self.codec.compress(content)
+        self.compress_ns += time.perf_counter_ns() - start_time
+        self.bytes_in += text_size(content)
+        self.bytes_out += len(data)
+        return data
+
+    def _read_compressed(self, text_id: int) -> bytes:
+        content = self.read_from_slow_disk(text_id)
+        self.last_read = content
+        return self._compress(content)
+
+    def _decompress(self, data: bytes) -> str:
+        start_time = time.perf_counter_ns()
+        content = self.codec.decompress(data)
+        self.decompress_ns += time.perf_counter_ns() - start_time
+        self.decompressions += 1
+        return content
+
+    def _drop_hot(self, text_id: int):
+        if self.hot.pop(text_id, None) is not None:
+            self.hot_budget.release(text_id, evicted=False)
+
+    def _promote(self, text_id: int, content: str):
+        """
+        Coloca o texto na camada quente, removendo os menos recentes até ele caber.
+        """
+        size = text_size(content)
+        if not self.hot_size or not self.hot_budget.admits(size):
+            return
+        while self.hot and (len(self.hot) >= self.hot_size or self.hot_budget.needs_room(size)):
+            old_id, _ = self.hot.popitem(last=False)
+            self.hot_budget.release(old_id)
+        self.hot[text_id] = content
+        self.hot_budget.charge(text_id, size)
+
+    def access(self, text_id: int) -> tuple[bool, str, float]:
+        """
+        Acessa um texto: da camada quente, se estiver lá; senão, da política, descomprimindo em um hit.
+        """
+        start_time = time.perf_counter_ns()
+
+        content = self.hot.get(text_id)
+        if content is not None and text_id not in self.cache:
+            # A política removeu o texto; a cópia quente também sai.
+            self._drop_hot(text_id)
+            content = None
+
+        if content is not None:
+            # O acesso passa pela política para atualizar recência e frequência.
+            self.cache.access(text_id)
+            self.hot.move_to_end(text_id)
+            is_hit = True
+        else:
+            is_hit, data, _ = self.cache.access(text_id)
+            content = self._decompress(data) if is_hit else self.last_read
+            if text_id in self.cache:
+                self._promote(text_id, content)
+
+        access_time_ns = time.perf_counter_ns() - start_time
+        if is_hit:
+            self.metrics.record_hit(access_time_ns)
+        else:
+            self.metrics.record_miss(access_time_ns)
+        return is_hit, content, access_time_ns / 1e9
+
+    def put(self, text_id: int, content: str):
+        if text_id not in self.cache:
+            self.cache.put(text_id, self._compress(content))
+
+    def __contains__(self, text_id: int) -> bool:
+        return text_id in self.cache
+
+    def invalidate(self, text_id: int) -> bool:
+        self._drop_hot(text_id)
+        return self.cache.invalidate(text_id)
+
+    def replace(self, text_id: int, content: str) -> bool:
+        # A cópia quente seria a versão antiga; o próximo hit descomprime a nova.
+        self._drop_hot(text_id)
+        return self.cache.replace(text_id, self._compress(content))
+
+    def invalidate_all(self):
+        self.hot.clear()
+        self.hot_budget.clear()
+        self.cache.invalidate_all()
+
+    def add_eviction_listener(self, listener):
+        # Os ouvintes recebem o texto descomprimido.
+        self.cache.add_eviction_listener(lambda text_id, data: listener(text_id, self.codec.decompress(data)))
+
+    def _record_miss(self, text_id: int, access_time: float):
+        self.metrics.record_miss(int(access_time * 1e9))
+        self.cache._record_miss(text_id, access_time)
+
+    def snapshot_state(self) -> dict:
+        # O snapshot guarda os textos descomprimidos, como o das demais políticas.
+        state = self.cache.snapshot_state()
+        state['entries'] = [(text_id, self.codec.decompress(data)) for text_id, data in state['entries']]
+        return state
+
+    def restore_state(self, state: dict, exclude=frozenset()):
+        self.hot.clear()
+        self.hot_budget.clear()
+        compressed = dict(state)
+        compressed['entries'] = [
+            (text_id, self._compress(content)) for text_id, content in state['entries'] if text_id not in exclude
+        ]
+        self.cache.restore_state(compressed, exclude)
+
+    @property
+    def compression_ratio(self) -> float:
+        """
+        Tamanho original / tamanho comprimido de todos os textos comprimidos até agora.
+        """
+        return self.bytes_in / self.bytes_out if self.bytes_out else 0.0
+
+    def get_metrics(self) -> CacheMetrics:
+        """
+        Hits, misses e latências medidos por fora (com a descompressão), junto com
+        as inserções, evicções e medidores da política e os números da compressão.
+        """
+        metrics = CacheMetrics()
+        metrics.merge(self.metrics)
+        policy = self.cache.get_metrics()
+        metrics.inserts = policy.inserts
+        metrics.evictions = policy.evictions
+        metrics.rejections = policy.rejections
+        metrics.counters.update(policy.counters)
+        metrics.gauges.update(policy.gauges)
+        metrics.counters['decompressions'] = self.decompressions
+        metrics.counters['compressed_input_bytes'] = self.bytes_in
+        metrics.counters['compressed_output_bytes'] = self.bytes_out
+        metrics.gauges['hot_entries'] = len(self.hot)
+        metrics.gauges['hot_bytes'] = self.hot_budget.bytes_in_use
+        metrics.gauges['bytes_in_use'] = policy.gauges.get('bytes_in_use', 0) + self.hot_budget.bytes_in_use
+        return metrics
+
+    def get_stats(self) -> CacheStats:
+        policy = self.cache.get_stats()
+        return CacheStats(
+            hits=self.metrics.hits,
+            misses=self.metrics.misses,
+            total_access_time=self.metrics.total_access_time,
+            bytes_in_use=policy.bytes_in_use + self.hot_budget.bytes_in_use,
+            bytes_evicted=policy.bytes_evicted
+        )
+
+    def __str__(self) -> str:
+        return f"{self.cache} [{self.codec.name}, quentes: {len(self.hot)}]"
@@ -0,0 +1,227 @@
+import threading
+import time
+from concurrent.futures import Future
+from core.cache_abc import Cache, CacheStats
+from core.metrics import CacheMetrics
+
+
+class _Shard:
+    """
+    Uma fatia do cache concorrente: uma instância da política, o lock que a
+    protege e as leituras de disco em andamento para as chaves dessa fatia.
+    """
+    __slots__ = ('lock', 'cache', 'inflight', 'metrics', 'coalesced')
+
+    def __init__(self, cache: Cache):
+        self.lock = threading.Lock()
+        self.cache = cache
+        self.inflight = {}
+        # Hits, misses e latências vistos pelo cache concorrente (incluindo a espera pelo lock).
+        self.metrics = CacheMetrics()
+        self.coalesced = 0
+
+
+class ConcurrentCache(Cache):
+    """
+    Versão segura para várias threads de qualquer política de cache.
+
+    As chaves são divididas entre 'shards' instâncias da política, cada uma com
+    o seu próprio lock, de modo que threads acessando textos de fatias diferentes
+    não disputam o mesmo lock. A leitura do disco acontece fora do lock, e misses
+    simultâneos para o mesmo texto esperam uma única leitura em andamento
+    (single-flight) em vez de cada um ler o disco.
+    """
+    __slots__ = ('capacity', 'read_from_slow_disk', 'shards')
+
+    def __init__(self, cache_class, capacity: int = 10, reader_func=None, shards: int = 8,
+                 max_bytes: int | None = None):
+        """
+        Args:
+            cache_class: Classe da política (ex.: LRUCache) usada em cada fatia.
+            capacity (int): Capacidade total, dividida entre as fatias.
+            reader_func: Função usada para ler os textos do disco.
+            shards (int): Número de fatias (limitado à capacidade).
+            max_bytes (int | None): Limite opcional de bytes, dividido entre as fatias.
+        """
+        if capacity <= 0:
+            raise ValueError("A capacidade do cache deve ser maior que zero.")
+        if reader_func is None:
+            raise ValueError("Uma função de leitura (reader_func) deve ser fornecida.")
+        if shards <= 0:
+            raise ValueError("O número de fatias (shards) deve ser maior que zero.")
+
+        self.capacity = capacity
+        self.read_from_slow_disk = reader_func
+
+        shards = min(shards, capacity)
+        self.shards = []
+        for i in range(shards):
+            shard_capacity = capacity // shards + (1 if i < capacity % shards else 0)
+            shard_bytes = None if max_bytes is None else max(1, max_bytes // shards)
+            policy = cache_class(capacity=shard_capacity, reader_func=reader_func, max_bytes=shard_bytes)
+            self.shards.append(_Shard(policy))
+
+    def _shard_for(self, text_id: int) -> _Shard:
+        return self.shards[hash(text_id) % len(self.shards)]
+
+    def access(self, text_id: int) -> tuple[bool, str, float]:
+        """
+        Acessa um texto de forma segura entre threads.
+        Em um miss, apenas a primeira thread lê o disco; as demais aguardam o resultado.
+        """
+        start_time = time.perf_counter_ns()
+        shard = self._shard_for(text_id)
+
+        with shard.lock:
+            if text_id in shard.cache:
+                # O lock garante que este acesso será um hit na política.
+                _, content, _ = shard.cache.access(text_id)
+                access_time_ns = time.perf_counter_ns() - start_time
+                shard.metrics.record_hit(access_time_ns)
+                return True, content, access_time_ns / 1e9
+
+            future = shard.inflight.get(text_id)
+            is_leader = future is None
+            if is_leader:
+                future = shard.inflight[text_id] = Future()
+
+        if is_leader:
+            try:
+                content = self.read_from_slow_disk(text_id)
+            except BaseException as exc:
+                with shard.lock:
+                    del shard.inflight[text_id]
+                future.set_exception(exc)
+                raise
+            # Inserir e encerrar a leitura juntos impede que outra thread
+            # não encontre o texto nem no cache nem entre as leituras em andamento.
+            with shard.lock:
+                shard.cache.put(text_id, content)
+                del shard.inflight[text_id]
+                load_time = (time.perf_counter_ns() - start_time) / 1e9
+                # A política também vê o miss (custo da leitura no GDSF, sketch do W-TinyLFU).
+                shard.cache._record_miss(text_id, load_time)
+            future.set_result((content, load_time))
+        else:
+            content, load_time = future.result()
+
+        access_time_ns = time.perf_counter_ns() - start_time
+        with shard.lock:
+            shard.metrics.record_miss(access_time_ns)
+            if not is_leader:
+                shard.coalesced += 1
+                # Com o tempo da leitura que foi aguardada, não o da espera.
+                shard.cache._record_miss(text_id, load_time)
+        return False, content, access_time_ns / 1e9
+
+    def put(self, text_id: int, content: str):
+        shard = self._shard_for(text_id)
+        with shard.lock:
+            shard.cache.put(text_id, content)
+
+    def __contains__(self, text_id: int) -> bool:
+        shard = self._shard_for(text_id)
+        with shard.lock:
+            return text_id in shard.cache
+
+    def invalidate(self, text_id: int) -> bool:
+        shard = self._shard_for(text_id)
+        with shard.lock:
+            return shard.cache.invalidate(text_id)
+
+    def replace(self, text_id: int, content: str) -> bool:
+        shard = self._shard_for(text_id)
+        with shard.lock:
+            return shard.cache.replace(text_id, content)
+
+    def invalidate_all(self):
+        for shard in self.shards:
+            with shard.lock:
+                shard.cache.invalidate_all()
+
+    def add_eviction_listener(self, listener):
+        # O ouvinte é chamado com o lock da fatia adquirido.
+        for shard in self.shards:
+            with shard.lock:
+                shard.cache.add_eviction_listener(listener)
+
+    def _record_miss(self, text_id: int, access_time: float):
+        shard = self._shard_for(text_id)
+        with shard.lock:
+            shard.metrics.record_miss(int(access_time * 1e9))
+            shard.cache._record_miss(text_id, access_time)
+
+    def snapshot_state(self) -> dict:
+        """
+        Estado de cada fatia, além da lista de todos os textos em 'entries'.
+        """
+        shard_states = []
+        for shard in self.shards:
+            with shard.lock:
+                shard_states.append(shard.cache.snapshot_state())
+        return {
+            'entries': [entry for state in shard_states for entry in state['entries']],
+            'shards': shard_states,
+        }
+
+    def restore_state(self, state: dict, exclude=frozenset()):
+        shard_states = state.get('shards')
+        if shard_states is None or len(shard_states) != len(self.shards):
+            # Outro número de fatias (ou snapshot de uma política simples): redistribui só os textos.
+            shard_states = [{'entries': []} for _ in self.shards]
+            for text_id, content in state['entries']:
+                shard_states[self.shards.index(self._shard_for(text_id))]['entries'].append((text_id, content))
+        for shard, shard_state in zip(self.shards, shard_states):
+            with shard.lock:
+                shard.cache.restore_state(shard_state, exclude)
+
+    @property
+    def coalesced_loads(self) -> int:
+        """
+        Número de misses que aguardaram a leitura de outra thread em vez de ler o disco.
+        """
+        return sum(shard.coalesced for shard in self.shards)
+
+    def get_metrics(self) -> CacheMetrics:
+        """
+        Junta as métricas das fatias: hits, misses e latências medidos pelo cache
+        concorrente, e inserções, evicções, contadores e medidores das políticas.
+        """
+        metrics = CacheMetrics()
+        for shard in self.shards:
+            with shard.lock:
+                metrics.merge(shard.metrics)
+                policy = shard.cache.get_metrics()
+                metrics.inserts += policy.inserts
+                metrics.evictions += policy.evictions
+                metrics.rejections += policy.rejections
+                for name, value in policy.counters.items():
+                    metrics.increment(name, value)
+                for name, value in policy.gauges.items():
+                    metrics.gauges[name] = metrics.gauges.get(name, 0) + value
+                metrics.increment('coalesced_loads', shard.coalesced)
+        return metrics
+
+    def get_stats(self) -> CacheStats:
+        hits = misses = bytes_in_use = bytes_evicted = 0
+        total_access_time = 0.0
+        for shard in self.shards:
+            with shard.lock:
+                hits += shard.metrics.hits
+                misses += shard.metrics.misses
+                total_access_time += shard.metrics.total_access_time
+                policy_stats = shard.cache.get_stats()
+            bytes_in_use += policy_stats.bytes_in_use
+            bytes_evicted += policy_stats.bytes_evicted
+        return CacheStats(
+            hits=hits,
+            misses=misses,
+            total_access_time=total_access_time,
+            bytes_in_use=bytes_in_use,
+            bytes_evicted=bytes_evicted
+        )
+
+    def __str__(self) -> str:
+        """ Representação em string do estado do cache para a interface. """
+        shards = ' | '.join(str(shard.cache) for shard in self.shards)
+        return f"ConcurrentCache (Shards: {len(self.shards)}, Capacity: {self.capacity}) -> {shards}"
@@ -0,0 +1,349 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from core.cache_abc import Cache, CacheStats
+from core.metrics import CacheMetrics
+
+
+class TimerWheel:
+    """
+    Roda de temporização (hashed timing wheel) para prazos de expiração.
+
+    O tempo é dividido em 'ticks' de 'tick' segundos, e cada prazo fica na
+    posição (tick do prazo) % 'size' da roda. Avançar a roda visita apenas as
+    posições dos ticks que passaram desde o último avanço (no máximo uma volta
+    completa), sem percorrer todos os prazos. Prazos mais distantes que uma
+    volta dividem a posição com prazos próximos e só saem quando vencem.
+    """
+    __slots__ = ('tick', 'slots', 'deadlines', 'current_tick')
+
+    def __init__(self, tick: float = 1.0, size: int = 256, now: float = 0.0):
+        """
+        Args:
+            tick (float): Resolução da roda, em segundos.
+            size (int): Número de posições da roda.
+            now (float): Instante inicial, no mesmo relógio dos prazos.
+        """
+        if tick <= 0 or size <= 0:
+            raise ValueError("'tick' e 'size' devem ser maiores que zero.")
+        self.tick = tick
+        self.slots = [set() for _ in range(size)]
+        self.deadlines = {}
+        self.current_tick = int(now // tick)
+
+    def _slot(self, deadline: float) -> set:
+        return self.slots[int(deadline // self.tick) % len(self.slots)]
+
+    def schedule(self, key: int, deadline: float):
+        """
+        Define (ou substitui) o prazo de uma chave.
+        """
+        self.cancel(key)
+        self.deadlines[key] = deadline
+        self._slot(deadline).add(key)
+
+    def cancel(self, key: int):
+        deadline = self.deadlines.pop(key, None)
+        if deadline is not None:
+            self._slot(deadline).discard(key)
+
+    def advance(self, now: float) -> list[int]:
+        """
+        Avança a roda até 'now' e retorna as chaves cujo prazo venceu.
+        """
+        target = int(now // self.tick)
+        expired = []
+        steps = min(target - self.current_tick + 1, len(self.slots))
+        for tick in range(self.current_tick, self.current_tick + steps):
+            slot = self.slots[tick % len(self.slots)]
+            due = [key for key in slot if self.deadlines[key] <= now]
+            for key in due:
+                slot.discard(key)
+                del self.deadlines[key]
+            expired.extend(due)
+        self.current_tick = max(self.current_tick, target)
+        return expired
+
+    def clear(self):
+        for slot in self.slots:
+            slot.clear()
+        self.deadlines.clear()
+
+
+class ExpiringCache(Cache):
+    """
+    Envolve qualquer política de cache e dá a cada texto um tempo de vida (TTL).
+
+    A expiração é preguiçosa: um texto vencido é descartado quando é acessado.
+    Os textos vencidos que ninguém acessa saem pela roda de temporização, que
+    avança a cada acesso e só visita os prazos que venceram.
+
+    Com 'stale_ttl' > 0 (stale-while-revalidate), um texto vencido há menos de
+    'stale_ttl' segundos ainda é entregue na hora, como hit, enquanto uma nova
+    leitura do disco roda em segundo plano e substitui o conteúdo. Depois
+    desse período, o texto é descartado e o acesso vira um miss.
+    """
+    __slots__ = ('cache', 'read_from_slow_disk', 'default_ttl', 'stale_ttl', 'clock', 'lock', 'executor',
+                 'ttls', 'wheel', 'expires', 'next_sweep', 'revalidating', 'loading', 'expirations', 'stale_hits',
+                 'revalidations')
+
+    def __init__(self, cache: Cache, reader_func=None, default_ttl: float | None = None, stale_ttl: float = 0.0,
+                 tick: float = 1.0, background: bool = True, clock=time.monotonic):
+        """
+        Args:
+            cache (Cache): Política que guarda os textos.
+            reader_func: Função de leitura usada na revalidação (padrão: a da política).
+            default_ttl (float | None): Tempo de vida, em segundos, dos textos sem TTL próprio.
+                None: os textos só saem por evicção ou invalidação.
+            stale_ttl (float): Por quanto tempo, depois de vencido, um texto ainda pode ser
+                entregue enquanto é revalidado (0 desativa o stale-while-revalidate).
+            tick (float): Resolução da roda de temporização, em segundos.
+            background (bool): Se False, a revalidação é feita de forma síncrona após o acesso.
+            clock: Relógio usado nos prazos (padrão: time.monotonic).
+        """
+        if stale_ttl < 0:
+            raise ValueError("'stale_ttl' não pode ser negativo.")
+        self.cache = cache
+        self.read_from_slow_disk = reader_func or cache.read_from_slow_disk
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.clock = clock
+        self.lock = threading.RLock()
+        self.executor = ThreadPoolExecutor(max_workers=1) if background else None
+        # TTLs próprios de alguns textos (text_id -> segundos), definidos por 'put' ou 'set_ttl'.
+        self.ttls = {}
+        now = clock()
+        # A roda guarda o prazo final de cada texto (vencimento + período de stale).
+        self.wheel = TimerWheel(tick, now=now)
+        # Vencimento de cada texto com TTL (text_id -> instante).
+        self.expires = {}
+        self.next_sweep = now + tick
+        # Revalidações em andamento (text_id -> Future).
+        self.revalidating = {}
+        # Leituras de misses em andamento (text_id -> Future).
+        self.loading = {}
+        self.expirations = 0
+        self.stale_hits = 0
+        self.revalidations = 0
+
+    @property
+    def policy(self) -> type:
+        """
+        Classe da política que guarda os textos.
+        """
+        return getattr(self.cache, 'policy', type(self.cache))
+
+    def _set_ttl(self, text_id: int, now: float):
+        ttl = self.ttls.get(text_id, self.default_ttl)
+        if ttl is None:
+            self.expires.pop(text_id, None)
+            self.wheel.cancel(text_id)
+            return
+        self.expires[text_id] = now + ttl
+        self.wheel.schedule(text_id, now + ttl + self.stale_ttl)
+
+    def _forget(self, text_id: int):
+        self.expires.pop(text_id, None)
+        self.wheel.cancel(text_id)
+
+    def _expire(self, text_id: int):
+        self._forget(text_id)
+        if self.cache.invalidate(text_id):
+            self.expirations += 1
+
+    def sweep(self, now: float | None = None):
+        """
+        Descarta os textos cujo prazo (incluindo o período de stale) já venceu.
+        É chamado automaticamente pelos acessos, uma vez por tick.
+        """
+        with self.lock:
+            if now is None:
+                now = self.clock()
+            for text_id in self.wheel.advance(now):
+                self.expires.pop(text_id, None)
+                if self.cache.invalidate(text_id):
+                    self.expirations += 1
+            self.next_sweep = now + self.wheel.tick
+
+    def set_ttl(self, text_id: int, ttl: float | None):
+        """
+        Define o tempo de vida de um texto, contado a partir de agora se ele estiver
+        no cache e usado também nas próximas leituras (None: volta ao TTL padrão).
+        """
+        with self.lock:
+            if ttl is None:
+                self.ttls.pop(text_id, None)
+            else:
+                self.ttls[text_id] = ttl
+            if text_id in self.cache:
+                self._set_ttl(text_id, self.clock())
+
+    def _revalidate(self, text_id: int):
+        """
+        Lê o texto de novo e substitui o conteúdo vencido.
+        """
+        try:
+            content = self.read_from_slow_disk(text_id)
+            with self.lock:
+                # Troca só o conteúdo: o texto mantém a sua recência e frequência na política.
+                # Se ele saiu do cache durante a leitura, não volta.
+                if self.cache.replace(text_id, content):
+                    self._set_ttl(text_id, self.clock())
+        finally:
+            with self.lock:
+                self.revalidating.pop(text_id, None)
+
+    def _schedule_revalidation(self, text_id: int):
+        if text_id in self.revalidating:
+            return
+        self.revalidations += 1
+        if self.executor is not None:
+            self.revalidating[text_id] = self.executor.submit(self._revalidate, text_id)
+        else:
+            self.revalidating[text_id] = None
+
+    def access(self, text_id: int) -> tuple[bool, str, float]:
+        """
+        Acessa um texto, descartando-o antes se estiver vencido, ou entregando a
+        versão vencida e agendando a revalidação, se ainda estiver no período de stale.
+
+        Em um miss, a leitura do disco acontece fora do lock, e misses simultâneos
+        para o mesmo texto esperam uma única leitura (como no ConcurrentCache).
+        """
+        start_time = time.perf_counter()
+        future = None
+        with self.lock:
+            now = self.clock()
+            if now >= self.next_sweep:
+                self.sweep(now)
+
+            expires_at = self.expires.get(text_id)
+            if expires_at is not None and now >= expires_at and text_id in self.cache:
+                if now < expires_at + self.stale_ttl:
+                    self.stale_hits += 1
+                    self._schedule_revalidation(text_id)
+                else:
+                    self._expire(text_id)
+
+            if text_id in self.cache:
+                result = self.cache.access(text_id)
+            else:
+                future = self.loading.get(text_id)
+                is_leader = future is None
+                if is_leader:
+                    future = self.loading[text_id] = Future()
+            synchronous = self.executor is None and text_id in self.revalidating
+
+        if future is not None:
+            if is_leader:
+                try:
+                    content = self.read_from_slow_disk(text_id)
+                except BaseException as exc:
+                    with self.lock:
+                        del self.loading[text_id]
+                    future.set_exception(exc)
+                    raise
+                # O tempo de vida começa quando o texto entra no cache, depois da leitura.
+                with self.lock:
+                    self.cache.put(text_id, content)
+                    if text_id in self.cache:
+                        self._set_ttl(text_id, self.clock())
+                    del self.loading[text_id]
+                future.set_result(content)
+            else:
+                content = future.result()
+            access_time = time.perf_counter() - start_time
+            with self.lock:
+                self.cache._record_miss(text_id, access_time)
+            result = (False, content, access_time)
+
+        if synchronous:
+            self._revalidate(text_id)
+        return result
+
+    def put(self, text_id: int, content: str, ttl: float | None = None):
+        """
+        Armazena um texto. Com 'ttl', o texto passa a ter esse tempo de vida (ver 'set_ttl').
+        """
+        with self.lock:
+            if ttl is not None:
+                self.ttls[text_id] = ttl
+            if text_id in self.cache:
+                return
+            self.cache.put(text_id, content)
+            if text_id in self.cache:
+                self._set_ttl(text_id, self.clock())
+
+    def __contains__(self, text_id: int) -> bool:
+        with self.lock:
+            return text_id in self.cache
+
+    def invalidate(self, text_id: int) -> bool:
+        with self.lock:
+            self._forget(text_id)
+            return self.cache.invalidate(text_id)
+
+    def replace(self, text_id: int, content: str) -> bool:
+        """
+        Troca o conteúdo de um texto em cache; o tempo de vida recomeça.
+        """
+        with self.lock:
+            if not self.cache.replace(text_id, content):
+                self._forget(text_id)
+                return False
+            self._set_ttl(text_id, self.clock())
+            return True
+
+    def invalidate_all(self):
+        with self.lock:
+            self.expires.clear()
+            self.wheel.clear()
+            self.cache.invalidate_all()
+
+    def add_eviction_listener(self, listener):
+        self.cache.add_eviction_listener(listener)
+
+    def _record_miss(self, text_id: int, access_time: float):
+        self.cache._record_miss(text_id, access_time)
+
+    def snapshot_state(self) -> dict:
+        with self.lock:
+            return self.cache.snapshot_state()
+
+    def restore_state(self, state: dict, exclude=frozenset()):
+        # Os textos restaurados começam um tempo de vida novo.
+        with self.lock:
+            self.expires.clear()
+            self.wheel.clear()
+            self.cache.restore_state(state, exclude)
+            now = self.clock()
+            for text_id, _ in state['entries']:
+                if text_id in self.cache:
+                    self._set_ttl(text_id, now)
+
+    def get_stats(self) -> CacheStats:
+        return self.cache.get_stats()
+
+    def get_metrics(self) -> CacheMetrics:
+        """
+        Métricas da política, com os contadores de expiração e revalidação.
+        """
+        with self.lock:
+            metrics = self.cache.get_metrics()
+            metrics.counters['expirations'] = self.expirations
+            metrics.counters['stale_hits'] = self.stale_hits
+            metrics.counters['revalidations'] = self.revalidations
+            metrics.gauges['ttl_deadlines'] = len(self.expires)
+        return metrics
+
+    def close(self):
+        """
+        Encerra a thread de revalidação, aguardando as leituras em andamento.
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+
+    def __str__(self) -> str:
+        if self.default_ttl is None:
+            return f"{self.cache} + TTL por texto"
+        return f"{self.cache} + TTL {self.default_ttl:g}s"
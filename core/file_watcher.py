@@ -0,0 +1,197 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+from core.cache_abc import Cache
+
+# Constantes do inotify (linux/inotify.h).
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_DELETE = 0x00000200
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_DELETE
+# Cabeçalho de cada evento: wd, mask, cookie, len (seguido de 'len' bytes com o nome).
+_EVENT = struct.Struct("iIII")
+
+
+def _text_id_from_name(name: str) -> int | None:
+    """
+    Converte o nome de um arquivo de texto ('42.txt') no seu identificador.
+    """
+    stem, ext = os.path.splitext(name)
+    if ext != ".txt" or not stem.isdigit():
+        return None
+    return int(stem)
+
+
+def _open_inotify(directory: str) -> int | None:
+    """
+    Cria um descritor inotify (não bloqueante) observando o diretório.
+    Retorna None se o inotify não estiver disponível (outros sistemas, limites do kernel etc.).
+    """
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        inotify_init1 = libc.inotify_init1
+        inotify_add_watch = libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    fd = inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+    if fd < 0:
+        return None
+    if inotify_add_watch(fd, os.fsencode(directory), _WATCH_MASK) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+class TextFileWatcher:
+    """
+    Invalida no cache os textos cujo arquivo foi alterado, substituído ou removido.
+
+    No Linux, usa o inotify (via ctypes, sem dependências extras) e recebe os
+    eventos do diretório sem precisar olhar os arquivos. Nos demais sistemas,
+    compara a data de modificação e o tamanho dos arquivos a cada 'interval'
+    segundos.
+
+    Como o SnapshotManager, pode ser usado de forma síncrona ('maybe_check' a
+    cada acesso, sem threads) ou com uma thread em segundo plano ('start').
+    """
+
+    def __init__(self, cache: Cache, directory: str, interval: float = 1.0, lock=None,
+                 use_inotify: bool = True, id_from_name=_text_id_from_name):
+        """
+        Args:
+            cache (Cache): Cache cujos textos devem ser invalidados.
+            directory (str): Diretório dos arquivos de texto.
+            interval (float): Intervalo, em segundos, entre verificações por data de modificação.
+            lock: Lock opcional que protege o cache, usado pela thread em segundo plano.
+            use_inotify (bool): Se False, usa sempre a verificação por data de modificação.
+            id_from_name: Função 'nome do arquivo -> text_id' (None para ignorar o arquivo).
+        """
+        self.cache = cache
+        self.directory = directory
+        self.interval = interval
+        self.lock = lock
+        self.id_from_name = id_from_name
+        self.fd = _open_inotify(directory) if use_inotify else None
+        self.signatures = {} if self.fd is not None else self._scan()
+        self.invalidated = 0
+        self._last_check = time.monotonic()
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self.fd is not None
+
+    def _scan(self) -> dict:
+        signatures = {}
+        try:
+            entries = os.scandir(self.directory)
+        except OSError:
+            return signatures
+        with entries:
+            for entry in entries:
+                text_id = self.id_from_name(entry.name)
+                if text_id is None:
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                signatures[text_id] = (stat.st_mtime_ns, stat.st_size)
+        return signatures
+
+    def _changed_by_scan(self) -> set:
+        current = self._scan()
+        previous = self.signatures
+        self.signatures = current
+        changed = {text_id for text_id, signature in current.items() if previous.get(text_id) != signature}
+        changed.update(text_id for text_id in previous if text_id not in current)
+        return changed
+
+    def _changed_by_inotify(self) -> set:
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                _, _, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                text_id = self.id_from_name(os.fsdecode(name))
+                if text_id is not None:
+                    changed.add(text_id)
+        return changed
+
+    def check(self) -> list[int]:
+        """
+        Verifica as alterações desde a última chamada e invalida os textos afetados.
+
+        Returns:
+            list[int]: Textos alterados que estavam no cache e foram invalidados.
+        """
+        changed = self._changed_by_inotify() if self.fd is not None else self._changed_by_scan()
+        self._last_check = time.monotonic()
+        if not changed:
+            return []
+        if self.lock is not None:
+            with self.lock:
+                invalidated = [text_id for text_id in sorted(changed) if self.cache.invalidate(text_id)]
+        else:
+            invalidated = [text_id for text_id in sorted(changed) if self.cache.invalidate(text_id)]
+        self.invalidated += len(invalidated)
+        return invalidated
+
+    def maybe_check(self) -> list[int]:
+        """
+        Chamado a cada acesso: com inotify, lê os eventos pendentes (sem bloquear);
+        sem inotify, verifica os arquivos se o intervalo já passou desde a última vez.
+        """
+        if self.fd is None and time.monotonic() - self._last_check < self.interval:
+            return []
+        return self.check()
+
+    def start(self):
+        """
+        Inicia a verificação em uma thread em segundo plano.
+        O cache deve ser protegido por 'lock' se for usado por outras threads ao mesmo tempo.
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self.fd is not None:
+                select.select([self.fd], [], [], self.interval)
+            else:
+                self._stop.wait(self.interval)
+            if not self._stop.is_set():
+                self.check()
+
+    def stop(self):
+        """
+        Interrompe a thread em segundo plano.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def close(self):
+        self.stop()
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
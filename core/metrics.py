@@ -0,0 +1,260 @@
+"""
+Métricas compartilhadas pelas políticas de cache.
+
+Cada política mantém um 'CacheMetrics' com contadores de hits, misses,
+inserções, evicções e recusas, e um histograma de latência separado para o
+caminho de hit e o de miss. O registro de um acesso custa algumas operações
+com inteiros, e as métricas podem ser exportadas como dict ('snapshot') ou
+no formato de texto do Prometheus ('to_prometheus').
+
+As mensagens de hit, miss e evicção das políticas vão para o logger
+'ra2.cache', desativado por padrão (ver 'enable_debug_log').
+"""
+import logging
+import sys
+
+cache_log = logging.getLogger("ra2.cache")
+
+# Precisão do histograma: cada potência de 2 é dividida em 2**(_SUB_BITS - 1)
+# faixas lineares, o que dá um erro relativo de no máximo ~3%.
+_SUB_BITS = 5
+_HALF_SUB = 1 << (_SUB_BITS - 1)
+# Maior latência representável: 2**40 ns (~18 minutos); valores acima vão para a última faixa.
+_MAX_EXPONENT = 40 - _SUB_BITS + 1
+_BUCKETS = (_MAX_EXPONENT + 2) * _HALF_SUB
+
+QUANTILES = (0.5, 0.99, 0.999)
+
+
+def enable_debug_log(enabled: bool = True, stream=None):
+    """
+    Ativa (ou desativa) as mensagens de depuração das políticas: hits, misses e evicções.
+
+    Args:
+        enabled (bool): True para mostrar as mensagens.
+        stream: Destino das mensagens (padrão: sys.stdout).
+    """
+    if enabled and not cache_log.handlers:
+        handler = logging.StreamHandler(stream or sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        cache_log.addHandler(handler)
+        cache_log.propagate = False
+    cache_log.setLevel(logging.DEBUG if enabled else logging.NOTSET)
+
+
+def _bucket_upper_bound(index: int) -> int:
+    """
+    Maior valor (em ns) que cai na faixa 'index'.
+    """
+    if index < 2 * _HALF_SUB:
+        return index
+    exponent = (index >> (_SUB_BITS - 1)) - 1
+    mantissa = index - (exponent << (_SUB_BITS - 1))
+    return ((mantissa + 1) << exponent) - 1
+
+
+class LatencyHistogram:
+    """
+    Histograma de latência com faixas fixas em escala logarítmica (estilo HDR).
+
+    As faixas cobrem de 1 ns a ~18 minutos com erro relativo de ~3%, usando
+    memória constante, independentemente do número de amostras. As amostras são
+    inteiros em nanossegundos (como os de 'time.perf_counter_ns'), o que evita
+    conversões de float no caminho de cada acesso.
+    """
+    __slots__ = ('counts', 'total_ns')
+
+    def __init__(self):
+        self.counts = [0] * _BUCKETS
+        self.total_ns = 0
+
+    def record(self, nanoseconds: int):
+        """
+        Registra uma amostra de latência, em nanossegundos.
+        """
+        self.total_ns += nanoseconds
+        # Os _SUB_BITS bits mais significativos escolhem a faixa dentro da potência de 2.
+        exponent = nanoseconds.bit_length() - _SUB_BITS
+        if exponent <= 0:
+            self.counts[nanoseconds] += 1
+        elif exponent <= _MAX_EXPONENT:
+            self.counts[(exponent << (_SUB_BITS - 1)) + (nanoseconds >> exponent)] += 1
+        else:
+            self.counts[-1] += 1
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    @property
+    def total(self) -> float:
+        """
+        Soma das latências, em segundos.
+        """
+        return self.total_ns / 1e9
+
+    @property
+    def mean(self) -> float:
+        count = self.count
+        return self.total_ns / count / 1e9 if count else 0.0
+
+    def percentile(self, quantile: float) -> float:
+        """
+        Retorna o valor (em segundos) abaixo do qual está a fração 'quantile' das amostras.
+        """
+        count = self.count
+        if not count:
+            return 0.0
+        target = max(1, int(quantile * count + 0.5))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return _bucket_upper_bound(index) / 1e9
+        return 0.0
+
+    def merge(self, other: "LatencyHistogram"):
+        """
+        Soma as amostras de outro histograma a este.
+        """
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.total_ns += other.total_ns
+
+    def snapshot(self) -> dict:
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'p50': self.percentile(0.5),
+            'p99': self.percentile(0.99),
+            'p999': self.percentile(0.999),
+            'max': self.percentile(1.0),
+        }
+
+
+class CacheMetrics:
+    """
+    Contadores e histogramas de uma política de cache.
+
+    - hits, misses: acessos resolvidos na memória e no disco.
+    - inserts: textos armazenados; evictions: textos removidos pela política;
+      rejections: textos recusados por excederem o limite de bytes.
+    - hit_latency, miss_latency: histogramas de latência de cada caminho.
+    - counters, gauges: valores específicos de cada política (ex.: o 'p' do ARC).
+    """
+    __slots__ = ('hits', 'misses', 'inserts', 'evictions', 'rejections',
+                 'hit_latency', 'miss_latency', 'counters', 'gauges')
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.inserts = 0
+        self.evictions = 0
+        self.rejections = 0
+        self.hit_latency = LatencyHistogram()
+        self.miss_latency = LatencyHistogram()
+        self.counters = {}
+        self.gauges = {}
+
+    def record_hit(self, nanoseconds: int):
+        self.hits += 1
+        self.hit_latency.record(nanoseconds)
+
+    def record_miss(self, nanoseconds: int):
+        self.misses += 1
+        self.miss_latency.record(nanoseconds)
+
+    def increment(self, name: str, amount: int = 1):
+        """
+        Incrementa um contador específico da política.
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    @property
+    def total_access_time(self) -> float:
+        """
+        Soma das latências de todos os acessos, em segundos.
+        """
+        return (self.hit_latency.total_ns + self.miss_latency.total_ns) / 1e9
+
+    @property
+    def hit_ratio(self) -> float:
+        accesses = self.hits + self.misses
+        return self.hits / accesses if accesses else 0.0
+
+    def merge(self, other: "CacheMetrics"):
+        """
+        Soma as métricas de outra instância a esta (ex.: fatias de um cache concorrente).
+        Os medidores (gauges) são somados, pois representam partes do mesmo cache.
+        """
+        self.hits += other.hits
+        self.misses += other.misses
+        self.inserts += other.inserts
+        self.evictions += other.evictions
+        self.rejections += other.rejections
+        self.hit_latency.merge(other.hit_latency)
+        self.miss_latency.merge(other.miss_latency)
+        for name, value in other.counters.items():
+            self.counters[name] = self.counters.get(name, 0) + value
+        for name, value in other.gauges.items():
+            self.gauges[name] = self.gauges.get(name, 0) + value
+
+    def snapshot(self) -> dict:
+        """
+        Retorna todas as métricas em um dict de valores simples (serializável em JSON).
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hit_ratio,
+            'inserts': self.inserts,
+            'evictions': self.evictions,
+            'rejections': self.rejections,
+            'latency': {
+                'hit': self.hit_latency.snapshot(),
+                'miss': self.miss_latency.snapshot(),
+            },
+            'counters': dict(self.counters),
+            'gauges': dict(self.gauges),
+        }
+
+    def to_prometheus(self, policy: str, prefix: str = "ra2_cache") -> str:
+        """
+        Exporta as métricas no formato de texto do Prometheus.
+        As latências são exportadas como 'summary', com os quantis p50, p99 e p999.
+
+        Args:
+            policy (str): Valor do rótulo 'policy' (ex.: o nome da classe da política).
+            prefix (str): Prefixo dos nomes das métricas.
+        """
+        label = f'policy="{policy}"'
+        lines = []
+
+        def counter(name: str, value, help_text: str):
+            lines.append(f"# HELP {prefix}_{name}_total {help_text}")
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total{{{label}}} {value}")
+
+        counter("hits", self.hits, "Acessos resolvidos pelo cache.")
+        counter("misses", self.misses, "Acessos que precisaram ler o disco.")
+        counter("inserts", self.inserts, "Textos armazenados no cache.")
+        counter("evictions", self.evictions, "Textos removidos pela política de substituição.")
+        counter("rejections", self.rejections, "Textos recusados por excederem o limite de bytes.")
+        for name, value in sorted(self.counters.items()):
+            counter(name, value, f"Contador específico da política: {name}.")
+
+        for name, value in sorted(self.gauges.items()):
+            lines.append(f"# HELP {prefix}_{name} Medidor da política: {name}.")
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{prefix}_{name}{{{label}}} {value}")
+
+        lines.append(f"# HELP {prefix}_access_seconds Latência de acesso por caminho (hit ou miss).")
+        lines.append(f"# TYPE {prefix}_access_seconds summary")
+        for path, histogram in (("hit", self.hit_latency), ("miss", self.miss_latency)):
+            path_label = f'{label},path="{path}"'
+            for quantile in QUANTILES:
+                lines.append(f'{prefix}_access_seconds{{{path_label},quantile="{quantile}"}} '
+                             f'{histogram.percentile(quantile):.9f}')
+            lines.append(f"{prefix}_access_seconds_sum{{{path_label}}} {histogram.total:.9f}")
+            lines.append(f"{prefix}_access_seconds_count{{{path_label}}} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,296 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from core.cache_abc import Cache, CacheStats
+from core.metrics import CacheMetrics
+
+
+class PrefetchStrategy(ABC):
+    """
+    Estratégia de previsão usada pelo PrefetchingCache.
+    Recebe a sequência de acessos e sugere quais textos devem ser carregados antes de serem pedidos.
+    """
+
+    @abstractmethod
+    def record(self, text_id: int):
+        """
+        Registra um acesso feito pelo usuário.
+        """
+        pass
+
+    @abstractmethod
+    def predict(self, text_id: int) -> list[int]:
+        """
+        Retorna os textos que provavelmente serão pedidos depois de 'text_id'.
+        """
+        pass
+
+
+class SequentialPrefetch(PrefetchStrategy):
+    """
+    Leitura antecipada sequencial: depois de 'trigger' acessos consecutivos
+    (n, n+1, ...), carrega os próximos 'depth' textos.
+    """
+
+    def __init__(self, depth: int = 2, trigger: int = 2, max_id: int | None = None):
+        """
+        Args:
+            depth (int): Quantos textos à frente devem ser carregados.
+            trigger (int): Tamanho mínimo da sequência para começar a leitura antecipada.
+            max_id (int | None): Maior identificador de texto existente.
+        """
+        if depth <= 0 or trigger <= 0:
+            raise ValueError("'depth' e 'trigger' devem ser maiores que zero.")
+        self.depth = depth
+        self.trigger = trigger
+        self.max_id = max_id
+        self.last_id = None
+        self.run_length = 0
+
+    def record(self, text_id: int):
+        if self.last_id is not None and text_id == self.last_id + 1:
+            self.run_length += 1
+        else:
+            self.run_length = 1
+        self.last_id = text_id
+
+    def predict(self, text_id: int) -> list[int]:
+        if self.run_length < self.trigger:
+            return []
+        last = text_id + self.depth
+        if self.max_id is not None:
+            last = min(last, self.max_id)
+        return list(range(text_id + 1, last + 1))
+
+
+class MarkovPrefetch(PrefetchStrategy):
+    """
+    Preditor de Markov de primeira ordem: conta as transições observadas
+    (texto anterior -> próximo texto) e carrega os 'top_k' sucessores mais comuns.
+    """
+
+    def __init__(self, top_k: int = 1, min_count: int = 2):
+        """
+        Args:
+            top_k (int): Quantos sucessores devem ser carregados.
+            min_count (int): Número mínimo de vezes que a transição deve ter sido vista.
+        """
+        if top_k <= 0:
+            raise ValueError("'top_k' deve ser maior que zero.")
+        self.top_k = top_k
+        self.min_count = min_count
+        self.transitions = defaultdict(Counter)
+        self.last_id = None
+
+    def record(self, text_id: int):
+        if self.last_id is not None:
+            self.transitions[self.last_id][text_id] += 1
+        self.last_id = text_id
+
+    def predict(self, text_id: int) -> list[int]:
+        successors = self.transitions.get(text_id)
+        if not successors:
+            return []
+        return [next_id for next_id, count in successors.most_common(self.top_k) if count >= self.min_count]
+
+
+class PrefetchingCache(Cache):
+    """
+    Envolve qualquer política de cache e carrega em segundo plano os textos
+    previstos pela estratégia de prefetch.
+
+    Os textos antecipados entram na política por 'put', sem contar como hits.
+    Um acesso que encontra um texto antecipado conta como hit normal, e a
+    precisão do prefetch (textos antecipados que foram de fato usados) é
+    acompanhada em 'get_prefetch_stats'.
+
+    A leitura do disco de um miss acontece fora do lock, como no ConcurrentCache:
+    apenas a primeira thread lê o texto, e as demais aguardam o resultado.
+    """
+    __slots__ = ('cache', 'strategy', 'read_from_slow_disk', 'background', 'lock', 'executor',
+                 'inflight', 'loading', 'prefetched', 'issued', 'useful')
+
+    def __init__(self, cache: Cache, strategy: PrefetchStrategy, reader_func=None,
+                 background: bool = True, max_workers: int = 2):
+        """
+        Args:
+            cache (Cache): Política que vai receber os textos antecipados.
+            strategy (PrefetchStrategy): Estratégia de previsão.
+            reader_func: Função de leitura usada no prefetch (padrão: a da política).
+            background (bool): Se False, o prefetch é feito de forma síncrona após cada acesso.
+            max_workers (int): Número de threads dedicadas ao prefetch.
+        """
+        self.cache = cache
+        self.strategy = strategy
+        self.read_from_slow_disk = reader_func or cache.read_from_slow_disk
+        self.background = background
+        self.lock = threading.RLock()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers) if background else None
+        # Prefetches em andamento (text_id -> Future) e textos antecipados ainda não usados.
+        self.inflight = {}
+        self.prefetched = set()
+        # Leituras de misses em andamento (text_id -> Future).
+        self.loading = {}
+        self.issued = 0
+        self.useful = 0
+        # Um texto antecipado que sai do cache sem ser usado não conta mais como antecipado.
+        try:
+            cache.add_eviction_listener(self._on_evict)
+        except NotImplementedError:
+            # Cache remoto: as evicções acontecem no servidor.
+            pass
+
+    def _on_evict(self, text_id: int, content):
+        # Chamado pela política, com o lock já adquirido.
+        self.prefetched.discard(text_id)
+
+    def _prefetch(self, text_id: int):
+        """
+        Lê um texto previsto e o coloca na política.
+        """
+        try:
+            content = self.read_from_slow_disk(text_id)
+            with self.lock:
+                if text_id not in self.cache:
+                    self.cache.put(text_id, content)
+                    if text_id in self.cache:
+                        self.prefetched.add(text_id)
+        finally:
+            with self.lock:
+                self.inflight.pop(text_id, None)
+
+    def _schedule(self, text_id: int):
+        for predicted_id in self.strategy.predict(text_id):
+            with self.lock:
+                if predicted_id in self.cache or predicted_id in self.inflight or predicted_id in self.loading:
+                    continue
+                self.issued += 1
+                if self.background:
+                    self.inflight[predicted_id] = self.executor.submit(self._prefetch, predicted_id)
+                    continue
+            self._prefetch(predicted_id)
+
+    def access(self, text_id: int) -> tuple[bool, str, float]:
+        """
+        Acessa um texto na política e agenda o prefetch dos próximos textos previstos.
+        Se o texto pedido já estiver sendo antecipado, aguarda essa leitura em vez de repeti-la.
+        """
+        start_time = time.perf_counter()
+        with self.lock:
+            pending = self.inflight.get(text_id)
+        if pending is not None:
+            pending.result()
+
+        with self.lock:
+            if text_id in self.cache:
+                is_hit, content, _ = self.cache.access(text_id)
+                if text_id in self.prefetched:
+                    self.prefetched.discard(text_id)
+                    self.useful += 1
+                self.strategy.record(text_id)
+                future = None
+            else:
+                self.prefetched.discard(text_id)
+                self.strategy.record(text_id)
+                future = self.loading.get(text_id)
+                is_leader = future is None
+                if is_leader:
+                    future = self.loading[text_id] = Future()
+
+        if future is not None:
+            is_hit = False
+            if is_leader:
+                try:
+                    content = self.read_from_slow_disk(text_id)
+                except BaseException as exc:
+                    with self.lock:
+                        del self.loading[text_id]
+                    future.set_exception(exc)
+                    raise
+                # Inserir e encerrar a leitura juntos impede que outra thread
+                # não encontre o texto nem no cache nem entre as leituras em andamento.
+                with self.lock:
+                    self.cache.put(text_id, content)
+                    del self.loading[text_id]
+                future.set_result(content)
+            else:
+                content = future.result()
+            with self.lock:
+                self.cache._record_miss(text_id, time.perf_counter() - start_time)
+
+        self._schedule(text_id)
+        return is_hit, content, time.perf_counter() - start_time
+
+    def put(self, text_id: int, content: str):
+        with self.lock:
+            self.cache.put(text_id, content)
+
+    def __contains__(self, text_id: int) -> bool:
+        with self.lock:
+            return text_id in self.cache
+
+    def invalidate(self, text_id: int) -> bool:
+        with self.lock:
+            self.prefetched.discard(text_id)
+            return self.cache.invalidate(text_id)
+
+    def replace(self, text_id: int, content: str) -> bool:
+        with self.lock:
+            return self.cache.replace(text_id, content)
+
+    def invalidate_all(self):
+        with self.lock:
+            self.prefetched.clear()
+            self.cache.invalidate_all()
+
+    def add_eviction_listener(self, listener):
+        self.cache.add_eviction_listener(listener)
+
+    def _record_miss(self, text_id: int, access_time: float):
+        self.cache._record_miss(text_id, access_time)
+
+    def snapshot_state(self) -> dict:
+        with self.lock:
+            return self.cache.snapshot_state()
+
+    def restore_state(self, state: dict, exclude=frozenset()):
+        with self.lock:
+            self.cache.restore_state(state, exclude)
+            self.prefetched.clear()
+
+    def get_stats(self) -> CacheStats:
+        return self.cache.get_stats()
+
+    def get_metrics(self) -> CacheMetrics:
+        """
+        Métricas da política, com os contadores do prefetch.
+        """
+        with self.lock:
+            metrics = self.cache.get_metrics()
+            metrics.counters['prefetch_issued'] = self.issued
+            metrics.counters['prefetch_useful'] = self.useful
+        return metrics
+
+    def get_prefetch_stats(self) -> dict:
+        """
+        Retorna quantos textos foram antecipados, quantos foram usados e a precisão do prefetch.
+        """
+        with self.lock:
+            issued, useful = self.issued, self.useful
+        return {
+            'issued': issued,
+            'useful': useful,
+            'accuracy': useful / issued if issued else 0.0,
+        }
+
+    def close(self):
+        """
+        Encerra as threads de prefetch, aguardando as leituras em andamento.
+        """
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+
+    def __str__(self) -> str:
+        return f"{self.cache} + prefetch {type(self.strategy).__name__}"
@@ -0,0 +1,56 @@
+"""
+Registro das políticas de cache.
+
+Cada política se registra com o decorador 'register_policy', pelo nome da
+classe (o mesmo nome gravado em 'docs/cache_config.txt' e usado nos relatórios
+do simulador). Os módulos da pasta 'algorithms' são importados na primeira
+consulta, então uma política nova só precisa do decorador para aparecer na
+simulação e poder ser escolhida pelo arquivo de configuração.
+"""
+import importlib
+import pkgutil
+
+_POLICY_PACKAGE = "algorithms"
+_registry: dict[str, type] = {}
+_discovered = False
+
+
+def register_policy(cache_class: type) -> type:
+    """
+    Decorador que registra uma classe de política pelo seu nome.
+    """
+    _registry[cache_class.__name__] = cache_class
+    return cache_class
+
+
+def _discover():
+    """
+    Importa todos os módulos do pacote de algoritmos, o que executa os decoradores.
+    """
+    global _discovered
+    if _discovered:
+        return
+    package = importlib.import_module(_POLICY_PACKAGE)
+    for module in sorted(pkgutil.iter_modules(package.__path__, f"{_POLICY_PACKAGE}."), key=lambda m: m.name):
+        importlib.import_module(module.name)
+    _discovered = True
+
+
+def available_policies() -> dict[str, type]:
+    """
+    Retorna todas as políticas registradas (nome da classe -> classe).
+    """
+    _discover()
+    return dict(_registry)
+
+
+def get_policy(name: str) -> type:
+    """
+    Retorna a classe da política com o nome dado.
+    Lança ValueError se não houver política com esse nome.
+    """
+    policies = available_policies()
+    try:
+        return policies[name]
+    except KeyError:
+        raise ValueError(f"Política de cache desconhecida: '{name}'. Disponíveis: {', '.join(policies)}.") from None
@@ -0,0 +1,175 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import zlib
+from core.cache_abc import Cache
+
+# Cabeçalho do arquivo de snapshot: identificador + versão do formato.
+_MAGIC = b"RA2S"
+_VERSION = 1
+
+
+def save_snapshot(path: str, snapshot: dict):
+    """
+    Grava o snapshot de forma atômica: escreve em um arquivo temporário no mesmo
+    diretório e o renomeia por cima do anterior, de modo que uma interrupção
+    nunca deixa um snapshot pela metade.
+    O conteúdo é JSON compactado com zlib.
+    """
+    payload = json.dumps(snapshot, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    data = _MAGIC + bytes([_VERSION]) + zlib.compress(payload, 6)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".snapshot-", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_snapshot(path: str) -> dict:
+    """
+    Lê um snapshot gravado por 'save_snapshot'.
+    Lança ValueError se o arquivo não estiver no formato esperado.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:4] != _MAGIC or data[4:5] != bytes([_VERSION]):
+        raise ValueError(f"Arquivo de snapshot inválido: {path}")
+    return json.loads(zlib.decompress(data[5:]).decode('utf-8'))
+
+
+class SnapshotManager:
+    """
+    Salva e restaura o conteúdo de um cache entre execuções (warm start).
+
+    Junto com o estado da política, guarda a data de modificação e o tamanho do
+    arquivo de cada texto em cache. Ao restaurar, textos cujo arquivo mudou (ou
+    sumiu) desde o snapshot são descartados.
+    """
+
+    def __init__(self, cache: Cache, path: str, text_path_func, interval: float | None = None, lock=None):
+        """
+        Args:
+            cache (Cache): Cache a ser salvo e restaurado.
+            path (str): Arquivo do snapshot.
+            text_path_func: Função 'text_id -> caminho do arquivo do texto'.
+            interval (float | None): Intervalo, em segundos, entre snapshots periódicos.
+            lock: Lock opcional que protege o cache, usado pelos snapshots em segundo plano.
+        """
+        self.cache = cache
+        self.path = path
+        self.text_path_func = text_path_func
+        self.interval = interval
+        self.lock = lock
+        self._last_save = time.monotonic()
+        self._timer = None
+        self._running = False
+
+    def _file_signature(self, text_id: int) -> list | None:
+        try:
+            stat = os.stat(self.text_path_func(text_id))
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def save(self):
+        """
+        Grava o estado atual do cache no arquivo de snapshot.
+        """
+        if self.lock is not None:
+            with self.lock:
+                state = self.cache.snapshot_state()
+        else:
+            state = self.cache.snapshot_state()
+
+        files = {str(text_id): self._file_signature(text_id) for text_id, _ in state['entries']}
+        save_snapshot(self.path, {
+            'policy': type(self.cache).__name__,
+            'state': state,
+            'files': files,
+        })
+        self._last_save = time.monotonic()
+
+    def load(self) -> bool:
+        """
+        Restaura o cache a partir do snapshot, descartando textos desatualizados.
+
+        Returns:
+            bool: True se algum estado foi restaurado.
+        """
+        try:
+            snapshot = load_snapshot(self.path)
+        except FileNotFoundError:
+            return False
+        except (ValueError, zlib.error, OSError) as e:
+            print(f"Snapshot do cache ignorado: {e}")
+            return False
+
+        state = snapshot['state']
+        # JSON transforma tuplas em listas; as chaves voltam a ser inteiros aqui.
+        state['entries'] = [(text_id, content) for text_id, content in state['entries']]
+        files = snapshot.get('files', {})
+        stale = {
+            text_id for text_id, _ in state['entries']
+            if files.get(str(text_id)) is None or files[str(text_id)] != self._file_signature(text_id)
+        }
+
+        if snapshot.get('policy') == type(self.cache).__name__:
+            self.cache.restore_state(state, exclude=stale)
+        else:
+            # Snapshot de outra política: aproveita apenas os textos, na ordem salva.
+            for text_id, content in state['entries']:
+                if text_id not in stale:
+                    self.cache.put(text_id, content)
+
+        restored = len(state['entries']) - len(stale)
+        print(f"Cache restaurado do snapshot: {restored} textos ({len(stale)} desatualizados descartados).")
+        return True
+
+    def maybe_save(self):
+        """
+        Grava um snapshot se o intervalo configurado já passou desde o último.
+        Pode ser chamado a cada acesso, sem precisar de uma thread separada.
+        """
+        if self.interval is not None and time.monotonic() - self._last_save >= self.interval:
+            self.save()
+
+    def start(self):
+        """
+        Inicia snapshots periódicos em uma thread em segundo plano.
+        O cache deve ser protegido por 'lock' se for usado por outras threads ao mesmo tempo.
+        """
+        if self.interval is None:
+            raise ValueError("Defina 'interval' para usar snapshots periódicos.")
+        self._running = True
+        self._schedule()
+
+    def _schedule(self):
+        self._timer = threading.Timer(self.interval, self._periodic_save)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _periodic_save(self):
+        try:
+            self.save()
+        except OSError as e:
+            print(f"Erro ao salvar o snapshot do cache: {e}")
+        if self._running:
+            self._schedule()
+
+    def stop(self):
+        """
+        Interrompe os snapshots periódicos.
+        """
+        self._running = False
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
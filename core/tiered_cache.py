@@ -0,0 +1,251 @@
+import time
+from core.cache_abc import Cache, CacheStats
+from core.metrics import CacheMetrics, cache_log
+from storage.disk_store import DEFAULT_STORE_PATH, SQLiteTextStore
+
+
+def _index_reader(text_id: int) -> str:
+    """
+    Leitor da política do L2, que guarda só as chaves: o conteúdo fica no banco.
+    """
+    return ""
+
+
+class TieredCache(Cache):
+    """
+    Cache hierárquico: uma política em memória (L1) sobre um armazenamento
+    local maior em SQLite (L2), com a sua própria política de substituição.
+
+    Um miss no L1 procura o texto no L2 antes de ir ao disco lento. Um hit no
+    L2 promove o texto para o L1, e um texto removido do L1 por evicção desce
+    para o L2 (se ainda não estiver lá). A política do L2 guarda só as chaves
+    (a ordem de uso e as evicções); o conteúdo fica no banco.
+
+    - inclusivo (padrão): todo texto lido do disco vai para os dois níveis, e
+      o L2 mantém a sua cópia quando o texto sobe para o L1;
+    - exclusivo: cada texto fica em um só nível. Textos lidos do disco entram
+      só no L1, saem do L2 quando sobem e só descem ao L2 por evicção, o que
+      aumenta o número de textos distintos guardados nos dois níveis.
+
+    O banco é esvaziado ao abrir, pois os arquivos podem ter mudado enquanto o
+    programa estava fechado; o L1 pode voltar "quente" pelo snapshot.
+    """
+    __slots__ = ('l1', 'l2', 'store', 'exclusive', 'read_from_slow_disk', 'metrics', 'l2_metrics',
+                 'promotions', 'demotions', 'listeners')
+
+    def __init__(self, cache_class, capacity: int = 10, reader_func=None, max_bytes: int | None = None,
+                 l2_class=None, l2_capacity: int = 1000, l2_path: str = DEFAULT_STORE_PATH,
+                 exclusive: bool = False):
+        """
+        Args:
+            cache_class: Classe da política do L1 (ex.: LRUCache).
+            capacity (int): Capacidade do L1.
+            reader_func: Função usada para ler os textos do disco lento.
+            max_bytes (int | None): Limite opcional de memória (em bytes) do L1.
+            l2_class: Classe da política do L2 (padrão: a mesma do L1).
+            l2_capacity (int): Número máximo de textos no L2.
+            l2_path (str): Arquivo SQLite do L2 (":memory:" para um banco só em memória).
+            exclusive (bool): Se True, cada texto fica em um só nível (ver acima).
+        """
+        if reader_func is None:
+            raise ValueError("Uma função de leitura (reader_func) deve ser fornecida.")
+        if l2_capacity <= 0:
+            raise ValueError("A capacidade do L2 deve ser maior que zero.")
+
+        self.read_from_slow_disk = reader_func
+        self.exclusive = exclusive
+        self.l1 = cache_class(capacity=capacity, reader_func=reader_func, max_bytes=max_bytes)
+        self.l1.add_eviction_listener(self._demote)
+        self.l2 = (l2_class or cache_class)(capacity=l2_capacity, reader_func=_index_reader)
+        self.l2.add_eviction_listener(self._drop_from_store)
+        self.store = SQLiteTextStore(l2_path)
+        self.store.clear()
+        # Acessos vistos por fora (hit = L1 ou L2) e os acessos que chegaram ao L2.
+        self.metrics = CacheMetrics()
+        self.l2_metrics = CacheMetrics()
+        self.promotions = 0
+        self.demotions = 0
+        # Ouvintes de evicção: chamados quando um texto sai do L2 sem estar no L1 (sai dos dois níveis).
+        self.listeners = []
+
+    @property
+    def policy(self) -> type:
+        """
+        Classe da política do L1.
+        """
+        return getattr(self.l1, 'policy', type(self.l1))
+
+    def _drop_from_store(self, text_id: int, _):
+        if self.listeners and text_id not in self.l1:
+            content = self.store.get(text_id)
+            for listener in self.listeners:
+                listener(text_id, content)
+        self.store.delete(text_id)
+        cache_log.debug("L2 cheio. Removido: Texto %s", text_id)
+
+    def _store(self, text_id: int, content: str):
+        """
+        Guarda o texto no L2, removendo antes o que a política do L2 escolher.
+        """
+        self.l2.put(text_id, "")
+        if text_id in self.l2:
+            self.store.put(text_id, content)
+
+    def _remove_from_l2(self, text_id: int) -> bool:
+        if not self.l2.invalidate(text_id):
+            return False
+        self.store.delete(text_id)
+        return True
+
+    def _demote(self, text_id: int, content: str):
+        """
+        Ouvinte de evicção do L1: o texto removido desce para o L2.
+        """
+        if text_id not in self.l2:
+            self._store(text_id, content)
+            self.demotions += 1
+
+    def _fill(self, text_id: int, content: str):
+        """
+        Coloca no L1 um texto que veio do disco lento (ou de 'put').
+        """
+        if self.exclusive:
+            self._remove_from_l2(text_id)
+        self.l1.put(text_id, content)
+        # Um texto recusado pelo L1 (maior que o seu limite de bytes) ainda pode ficar no L2.
+        if not self.exclusive or text_id not in self.l1:
+            self._store(text_id, content)
+
+    def access(self, text_id: int) -> tuple[bool, str, float]:
+        """
+        Acessa um texto no L1, depois no L2 e, por último, no disco lento.
+        Um hit no L2 conta como hit.
+        """
+        start_time = time.perf_counter_ns()
+
+        if text_id in self.l1:
+            _, content, _ = self.l1.access(text_id)
+            is_hit = True
+        else:
+            content = self.store.get(text_id) if text_id in self.l2 else None
+            if content is not None:
+                if self.exclusive:
+                    self._fill(text_id, content)
+                else:
+                    # Atualiza a recência/frequência do texto na política do L2.
+                    self.l2.access(text_id)
+                    self.l1.put(text_id, content)
+                self.promotions += 1
+                is_hit = True
+            else:
+                content = self.read_from_slow_disk(text_id)
+                self._fill(text_id, content)
+                is_hit = False
+            tier_time_ns = time.perf_counter_ns() - start_time
+            self.l1._record_miss(text_id, tier_time_ns / 1e9)
+            if is_hit:
+                self.l2_metrics.record_hit(tier_time_ns)
+            else:
+                self.l2_metrics.record_miss(tier_time_ns)
+
+        access_time_ns = time.perf_counter_ns() - start_time
+        if is_hit:
+            self.metrics.record_hit(access_time_ns)
+        else:
+            self.metrics.record_miss(access_time_ns)
+        return is_hit, content, access_time_ns / 1e9
+
+    def put(self, text_id: int, content: str):
+        if text_id not in self.l1:
+            self._fill(text_id, content)
+
+    def __contains__(self, text_id: int) -> bool:
+        return text_id in self.l1 or text_id in self.l2
+
+    def invalidate(self, text_id: int) -> bool:
+        in_l1 = self.l1.invalidate(text_id)
+        in_l2 = self._remove_from_l2(text_id)
+        return in_l1 or in_l2
+
+    def replace(self, text_id: int, content: str) -> bool:
+        in_l1 = self.l1.replace(text_id, content)
+        in_l2 = text_id in self.l2
+        if in_l2:
+            self.store.put(text_id, content)
+        return in_l1 or in_l2
+
+    def invalidate_all(self):
+        self.l1.invalidate_all()
+        self.l2.invalidate_all()
+        self.store.clear()
+
+    def add_eviction_listener(self, listener):
+        # Um texto removido do L1 desce para o L2; só a saída do L2 o tira do cache.
+        self.listeners.append(listener)
+
+    def _record_miss(self, text_id: int, access_time: float):
+        # Miss resolvido por fora (texto lido do disco e inserido com 'put'): passou pelos dois níveis.
+        self.metrics.record_miss(int(access_time * 1e9))
+        self.l2_metrics.record_miss(int(access_time * 1e9))
+        self.l1._record_miss(text_id, access_time)
+
+    def snapshot_state(self) -> dict:
+        # Só o L1: o L2 já está em disco e é esvaziado ao abrir.
+        return self.l1.snapshot_state()
+
+    def restore_state(self, state: dict, exclude=frozenset()):
+        self.l1.restore_state(state, exclude)
+
+    def get_tier_metrics(self) -> dict[str, CacheMetrics]:
+        """
+        Métricas de cada nível. No L1, um miss é um acesso que precisou do L2 ou
+        do disco; no L2, um hit evitou o disco lento e um miss chegou até ele.
+        """
+        l2 = CacheMetrics()
+        l2.merge(self.l2_metrics)
+        l2_policy = self.l2.get_metrics()
+        l2.inserts = l2_policy.inserts
+        l2.evictions = l2_policy.evictions
+        l2.counters['promotions'] = self.promotions
+        l2.counters['demotions'] = self.demotions
+        l2.gauges['entries'] = l2_policy.gauges.get('entries', len(self.store))
+        l2.gauges['bytes_in_use'] = self.store.bytes_in_use
+        return {'l1': self.l1.get_metrics(), 'l2': l2}
+
+    def get_metrics(self) -> CacheMetrics:
+        """
+        Hits e misses vistos por fora (um hit no L2 conta como hit), com as
+        inserções, evicções e medidores do L1 e os números do L2.
+        """
+        metrics = CacheMetrics()
+        metrics.merge(self.metrics)
+        l1 = self.l1.get_metrics()
+        metrics.inserts = l1.inserts
+        metrics.evictions = l1.evictions
+        metrics.rejections = l1.rejections
+        metrics.counters.update(l1.counters)
+        metrics.gauges.update(l1.gauges)
+        metrics.counters['l2_hits'] = self.l2_metrics.hits
+        metrics.counters['l2_misses'] = self.l2_metrics.misses
+        metrics.counters['promotions'] = self.promotions
+        metrics.counters['demotions'] = self.demotions
+        metrics.counters['l2_evictions'] = self.l2.get_metrics().evictions
+        metrics.gauges['l2_entries'] = len(self.store)
+        return metrics
+
+    def get_stats(self) -> CacheStats:
+        l1 = self.l1.get_stats()
+        return CacheStats(
+            hits=self.metrics.hits,
+            misses=self.metrics.misses,
+            total_access_time=self.metrics.total_access_time,
+            bytes_in_use=l1.bytes_in_use,
+            bytes_evicted=l1.bytes_evicted
+        )
+
+    def close(self):
+        self.store.close()
+
+    def __str__(self) -> str:
+        mode = "exclusivo" if self.exclusive else "inclusivo"
+        return f"{self.l1} [L2 {mode}: {len(self.store)} textos]"
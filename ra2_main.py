@@ -1,32 +1,132 @@
 import time
 import os
-from algorithms.lru_cache import LRUCache
-from algorithms.fifo import FIFOCache
-from algorithms.lfu import LFUCache
-from algorithms.arc_cache import ARCCache
-from simulation.simulator import start_simulation_mode
+from functools import partial
+from core.registry import get_policy
+from core.adaptive import AdaptiveCache
+from core.expiry import ExpiringCache
+from core.file_watcher import TextFileWatcher
+# O simulador (numpy, pandas, matplotlib e seaborn), o L2 (sqlite3), a compressão (lzma), o
+# cliente do servidor (socket) e o asyncio só são importados quando a opção ou o comando que os
+# usa está ativo, para que a leitura de textos comece rápido e sem carregar essas bibliotecas.
+from core.metrics import enable_debug_log
+from core.snapshot import SnapshotManager
+from storage.text_pack import PackedTextStore
 
 TEXTS_DIR = "texts"
+# Pacote com todos os textos (gerado por 'python -m storage.text_pack build').
+# Se existir, os textos são lidos dele via mmap em vez de um arquivo por texto.
+TEXTS_PACK = "texts.pack"
 CONFIG_FILE = "docs/cache_config.txt"
+# Limite de itens do cache e limite opcional de memória (em bytes) para os textos.
+# Com CACHE_MAX_BYTES definido, o cache remove itens até o novo texto caber nos dois limites.
+CACHE_CAPACITY = 10
+CACHE_MAX_BYTES = None
+# Snapshot do cache para reiniciar "quente": gravado ao sair e a cada SNAPSHOT_INTERVAL segundos.
+SNAPSHOT_FILE = "docs/cache_snapshot.bin"
+SNAPSHOT_INTERVAL = 60
+# Escolhe a política durante a execução, comparando cópias "sombra" das políticas registradas;
+# a política do arquivo de configuração é só a inicial. Desativado por padrão: cada acesso
+# também passa por todas as sombras, e o arquivo de configuração já traz a melhor política
+# da última simulação.
+ADAPTIVE_CACHE = False
+# Guarda os textos comprimidos ("zlib" ou "lzma"; None desativa), para caber mais textos em
+# CACHE_MAX_BYTES. Com zlib, usa o dicionário de 'python -m storage.compression train', se existir.
+# A compressão usa a política do arquivo de configuração, sem a troca adaptativa.
+CACHE_COMPRESSION = None
+# Segundo nível do cache (L2): até L2_CAPACITY textos em um banco SQLite local, consultado
+# antes do disco lento (None desativa). Com L2_EXCLUSIVE, cada texto fica em um só nível.
+L2_CAPACITY = None
+L2_EXCLUSIVE = False
+# Socket do servidor de cache compartilhado ('python -m server.cache_server'). Se definido, os
+# textos ficam no servidor, compartilhados com os outros leitores da máquina, e as opções de
+# cache acima (e o snapshot) valem só no servidor.
+CACHE_SERVER = None
+# Tempo de vida dos textos no cache, em segundos (None: sem expiração). Com TEXT_STALE_TTL > 0,
+# um texto vencido ainda é entregue por esse tempo enquanto é relido em segundo plano.
+TEXT_TTL = None
+TEXT_STALE_TTL = 0.0
+# Invalida os textos cujo arquivo em TEXTS_DIR foi alterado (inotify, ou data de modificação).
+WATCH_TEXTS = True
+# Mostra as mensagens internas das políticas (hits, misses e evicções) a cada acesso.
+DEBUG_LOG = False
 
-def read_from_slow_disk(text_id: int) -> str:
+def _text_path(text_id: int) -> str:
     """
-    Simula a leitura lenta dos arquivos no disco.
+    Retorna o caminho do arquivo de um texto.
+    """
+    return os.path.join(TEXTS_DIR, f"{text_id}.txt")
+
+_packed_store = None
+# Data de modificação (ns) do pacote aberto; os arquivos alterados depois dela são lidos diretamente.
+_packed_mtime_ns = 0
+
+def _get_packed_store() -> PackedTextStore | None:
+    """
+    Abre o pacote de textos na primeira chamada, se ele existir.
     """
+    global _packed_store, _packed_mtime_ns
+    if _packed_store is None:
+        try:
+            _packed_mtime_ns = os.stat(TEXTS_PACK).st_mtime_ns
+            _packed_store = PackedTextStore(TEXTS_PACK)
+        except (OSError, ValueError):
+            _packed_store = False
+    return _packed_store or None
+
+def _read_text_file(text_id: int) -> str:
+    """
+    Lê o arquivo do texto, sem o atraso artificial do disco lento.
+    O pacote de textos só é usado se o arquivo não foi alterado depois que ele foi gerado,
+    para que um texto editado (e invalidado pelo observador de TEXTS_DIR) não volte com a versão antiga.
+    """
+    store = _get_packed_store()
+    if store is not None and text_id in store:
+        try:
+            stale = os.stat(_text_path(text_id)).st_mtime_ns > _packed_mtime_ns
+        except OSError:
+            stale = False
+        if not stale:
+            return store.read(text_id)
     try:
-        with open(os.path.join(TEXTS_DIR, f"{text_id}.txt"), 'r', encoding='utf-8-sig') as f:
-            content = f.read()
-        time.sleep(0.1)
-        return content
+        with open(_text_path(text_id), 'r', encoding='utf-8-sig') as f:
+            return f.read()
     except FileNotFoundError:
         return f"Erro: Texto {text_id} não encontrado."
     except Exception as e:
         return f"Erro ao ler o arquivo: {e}"
 
-def load_cache_from_config(reader_func):
+def read_from_slow_disk(text_id: int) -> str:
+    """
+    Simula a leitura lenta dos arquivos no disco.
+    """
+    content = _read_text_file(text_id)
+    time.sleep(0.1)
+    return content
+
+async def read_from_slow_disk_async(text_id: int) -> str:
+    """
+    Versão assíncrona da leitura lenta, para uso com 'Cache.aaccess'.
+    A abertura do arquivo roda em uma thread e o atraso usa asyncio.sleep,
+    de modo que o event loop nunca fica bloqueado.
+    """
+    import asyncio
+    content = await asyncio.to_thread(_read_text_file, text_id)
+    await asyncio.sleep(0.1)
+    return content
+
+def load_cache_from_config(reader_func, capacity: int = CACHE_CAPACITY, max_bytes: int | None = CACHE_MAX_BYTES,
+                           snapshot_file: str | None = SNAPSHOT_FILE, adaptive: bool = ADAPTIVE_CACHE):
     """
     Lê o arquivo de configuração e retorna uma instância do cache escolhido.
     Se o arquivo não existir, usa LRUCache como padrão.
+    Se houver um snapshot salvo, o cache é restaurado a partir dele.
+
+    Args:
+        reader_func: Função usada para ler os textos do disco.
+        capacity (int): Número máximo de textos no cache.
+        max_bytes (int | None): Limite opcional de memória (em bytes) para os textos.
+        snapshot_file (str | None): Snapshot a restaurar, ou None para começar com o cache vazio.
+        adaptive (bool): Se True, a política pode ser trocada durante a execução (AdaptiveCache).
     """
     try:
         with open(CONFIG_FILE, 'r') as f:
@@ -37,52 +137,120 @@ def load_cache_from_config(reader_func):
 
     print(f"Carregando algoritmo de cache: {algorithm_name}")
 
-    if algorithm_name == "FIFOCache":
-        return FIFOCache(capacity=10, reader_func=reader_func)
-    elif algorithm_name == "LFUCache":
-        return LFUCache(capacity=10, reader_func=reader_func)
-    elif algorithm_name == "ARCCache":
-        return ARCCache(capacity=10, reader_func=reader_func)
-    elif algorithm_name == "LRUCache":
-        return LRUCache(capacity=10, reader_func=reader_func)
-    else:
+    try:
+        cache_class = get_policy(algorithm_name)
+    except ValueError:
         print(f"Algoritmo '{algorithm_name}' desconhecido. Usando LRUCache como padrão.")
-        return LRUCache(capacity=10, reader_func=reader_func)
+        cache_class = get_policy("LRUCache")
+    if CACHE_COMPRESSION is not None:
+        from core.compressed_cache import CompressedCache
+        from storage.compression import TextCodec, load_dictionary
+        zdict = load_dictionary() if CACHE_COMPRESSION == "zlib" else None
+        memory_class = partial(CompressedCache, cache_class, codec=TextCodec(CACHE_COMPRESSION, zdict=zdict))
+    elif adaptive:
+        memory_class = partial(AdaptiveCache, initial=cache_class)
+    else:
+        memory_class = cache_class
+    if L2_CAPACITY is not None:
+        # O L2 usa a política do arquivo de configuração.
+        from core.tiered_cache import TieredCache
+        cache = TieredCache(memory_class, capacity=capacity, reader_func=reader_func, max_bytes=max_bytes,
+                            l2_class=cache_class, l2_capacity=L2_CAPACITY, exclusive=L2_EXCLUSIVE)
+    else:
+        cache = memory_class(capacity=capacity, reader_func=reader_func, max_bytes=max_bytes)
+    if TEXT_TTL is not None:
+        cache = ExpiringCache(cache, reader_func, default_ttl=TEXT_TTL, stale_ttl=TEXT_STALE_TTL)
+
+    if snapshot_file is not None:
+        SnapshotManager(cache, snapshot_file, _text_path).load()
+    return cache
 
 def main():
     """
     Função principal que executa o laço de interação com o usuário.
     """
-    cache_em_uso = load_cache_from_config(read_from_slow_disk)
+    enable_debug_log(DEBUG_LOG)
+    if CACHE_SERVER is not None:
+        from server.client import RemoteCache
+        cache_em_uso = RemoteCache(CACHE_SERVER)
+        snapshots = None
+    else:
+        cache_em_uso = load_cache_from_config(read_from_slow_disk)
+        snapshots = SnapshotManager(cache_em_uso, SNAPSHOT_FILE, _text_path, interval=SNAPSHOT_INTERVAL)
+    watcher = TextFileWatcher(cache_em_uso, TEXTS_DIR) if WATCH_TEXTS else None
     print(f"Sistema iniciado com o cache: {type(cache_em_uso).__name__}")
     print("----------------------------------------------------")
 
-    while True:
-        try:
-            user_input = input("Digite o número do texto (1-100), -1 para simulação ou 0 para sair: ")
-            text_id = int(user_input)
-
-            if text_id == 0:
-                print("Encerrando...")
-                break
-            elif text_id == -1:
-                # A função de leitura é passada como argumento aqui
-                start_simulation_mode(read_from_slow_disk)
-                print("\nSimulação concluída. Os gráficos foram salvos na pasta do projeto.")
-                print("----------------------------------------------------")
-            elif 1 <= text_id <= 100:
-                is_hit, content, access_time = cache_em_uso.access(text_id)
-
-                print("\n--- Conteúdo do Texto ---")
-                print(content[:500] + "..." if len(content) > 500 else content)
-                print("--------------------------------")
-                print(f"Status do Cache: {'HIT' if is_hit else 'MISS'}")
-                print(f"Tempo de carregamento: {access_time * 1e9:,.0f} nanossegundos.")
-                print(f"Estado atual do cache: {cache_em_uso}\n")
-            else:
-                print("Entrada inválida.\n")
-        except ValueError:
-            print("Entrada inválida. Por favor, digite um número.\n")
+    try:
+        while True:
+            try:
+                user_input = input("Digite o número do texto (1-100), -1 para simulação, -2 para comparar o prefetch, -3 para ver as métricas, -4 para comparar a compressão, -5 para comparar o L2 ou 0 para sair: ")
+                text_id = int(user_input)
+
+                if text_id == 0:
+                    print("Encerrando...")
+                    break
+                elif text_id == -1:
+                    from simulation.simulator import start_simulation_mode
+                    # A função de leitura é passada como argumento aqui
+                    start_simulation_mode(read_from_slow_disk)
+                    print("\nSimulação concluída. Os gráficos foram salvos na pasta do projeto.")
+                    print("----------------------------------------------------")
+                elif text_id == -2:
+                    from simulation.simulator import run_prefetch_comparison
+                    run_prefetch_comparison(read_from_slow_disk, getattr(cache_em_uso, 'policy', type(cache_em_uso)))
+                    print("----------------------------------------------------")
+                elif text_id == -4:
+                    from simulation.simulator import run_compression_comparison
+                    from storage.compression import load_dictionary, train_dictionary
+                    zdict = load_dictionary() or train_dictionary(TEXTS_DIR)
+                    run_compression_comparison(read_from_slow_disk, getattr(cache_em_uso, 'policy', type(cache_em_uso)),
+                                               zdict=zdict)
+                    print("----------------------------------------------------")
+                elif text_id == -5:
+                    from simulation.simulator import run_tiered_comparison
+                    run_tiered_comparison(read_from_slow_disk, getattr(cache_em_uso, 'policy', type(cache_em_uso)))
+                    print("----------------------------------------------------")
+                elif text_id == -3:
+                    # Formato de texto do Prometheus: contadores, latências p50/p99/p999 e medidores.
+                    print(cache_em_uso.get_metrics().to_prometheus(type(cache_em_uso).__name__))
+                    from core.tiered_cache import TieredCache
+                    # O TieredCache pode estar embrulhado (ex.: pelo ExpiringCache, com TEXT_TTL).
+                    tiered = cache_em_uso
+                    while not isinstance(tiered, TieredCache) and hasattr(tiered, 'cache'):
+                        tiered = tiered.cache
+                    if isinstance(tiered, TieredCache):
+                        for tier, metrics in tiered.get_tier_metrics().items():
+                            print(metrics.to_prometheus(tiered.policy.__name__, prefix=f"ra2_cache_{tier}"))
+                    print("----------------------------------------------------")
+                elif 1 <= text_id <= 100:
+                    if watcher is not None:
+                        watcher.maybe_check()
+                    is_hit, content, access_time = cache_em_uso.access(text_id)
+                    if snapshots is not None:
+                        snapshots.maybe_save()
+
+                    print("\n--- Conteúdo do Texto ---")
+                    print(content[:500] + "..." if len(content) > 500 else content)
+                    print("--------------------------------")
+                    print(f"Status do Cache: {'HIT' if is_hit else 'MISS'}")
+                    print(f"Tempo de carregamento: {access_time * 1e9:,.0f} nanossegundos.")
+                    print(f"Estado atual do cache: {cache_em_uso}\n")
+                else:
+                    print("Entrada inválida.\n")
+            except ValueError:
+                print("Entrada inválida. Por favor, digite um número.\n")
+    finally:
+        if watcher is not None:
+            watcher.close()
+        if snapshots is not None:
+            # Salva o cache ao sair, para que a próxima execução comece "quente".
+            try:
+                snapshots.save()
+            except OSError as e:
+                print(f"Erro ao salvar o snapshot do cache: {e}")
+        else:
+            cache_em_uso.close()
     
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,213 @@
+"""
+Servidor de cache compartilhado entre os processos leitores de uma máquina.
+
+Cada processo leitor do ra2_main tem o seu próprio cache, e vários leitores
+na mesma máquina aquecem e guardam cópias dos mesmos textos. O servidor guarda
+um único conjunto de textos para todos: as chaves são divididas entre N
+processos (um por núcleo), cada um com uma instância da política escolhida,
+e os clientes (server/client.py) falam direto com o processo de cada chave,
+por sockets Unix, com o protocolo de server/protocol.py.
+
+Cada processo atende as conexões em um event loop asyncio. Um miss é lido do
+disco em uma thread ('aaccess'), sem bloquear as outras conexões, e misses
+simultâneos para o mesmo texto esperam uma única leitura.
+
+Uso (a partir da raiz do projeto):
+    python -m server.cache_server --socket /tmp/ra2_cache.sock --workers 4 --capacity 40
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import sys
+
+from core.cache_abc import Cache
+from core.registry import get_policy
+from server.protocol import (
+    OP_ACCESS, OP_CONTAINS, OP_INFO, OP_INVALIDATE, OP_INVALIDATE_ALL, OP_METRICS, OP_PUT, OP_REPLACE, REQUEST,
+    STATUS_ERROR, STATUS_OK, encode_metrics, encode_response, shard_path,
+)
+
+DEFAULT_SOCKET = "/tmp/ra2_cache.sock"
+
+
+async def _dispatch(cache: Cache, op: int, text_id: int, payload: bytes, info: bytes) -> bytes:
+    """
+    Executa uma requisição e retorna a resposta codificada.
+    """
+    if op == OP_ACCESS:
+        is_hit, content, access_time = await cache.aaccess(text_id)
+        return encode_response(STATUS_OK, is_hit, access_time, content.encode('utf-8'))
+    if op == OP_CONTAINS:
+        return encode_response(STATUS_OK, text_id in cache)
+    if op == OP_PUT:
+        cache.put(text_id, payload.decode('utf-8'))
+        return encode_response(STATUS_OK, text_id in cache)
+    if op == OP_REPLACE:
+        return encode_response(STATUS_OK, cache.replace(text_id, payload.decode('utf-8')))
+    if op == OP_INVALIDATE:
+        return encode_response(STATUS_OK, cache.invalidate(text_id))
+    if op == OP_INVALIDATE_ALL:
+        cache.invalidate_all()
+        return encode_response(STATUS_OK)
+    if op == OP_METRICS:
+        metrics = cache.get_metrics()
+        # Os bytes removidos só aparecem em 'get_stats'; seguem como contador para o cliente.
+        metrics.counters['bytes_evicted'] = cache.get_stats().bytes_evicted
+        return encode_response(STATUS_OK, payload=encode_metrics(metrics))
+    if op == OP_INFO:
+        return encode_response(STATUS_OK, payload=info)
+    return encode_response(STATUS_ERROR, payload=f"Operação desconhecida: {op}.".encode('utf-8'))
+
+
+async def _serve(cache: Cache, path: str, info: bytes, ready):
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                op, text_id, length = REQUEST.unpack(await reader.readexactly(REQUEST.size))
+                payload = await reader.readexactly(length) if length else b""
+                try:
+                    response = await _dispatch(cache, op, text_id, payload, info)
+                except Exception as e:
+                    response = encode_response(STATUS_ERROR, payload=str(e).encode('utf-8'))
+                writer.write(response)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    if os.path.exists(path):
+        os.unlink(path)
+    server = await asyncio.start_unix_server(handle, path)
+    ready.set()
+    async with server:
+        await server.serve_forever()
+
+
+def _run_shard(cache_class, capacity: int, max_bytes: int | None, reader_func, path: str, index: int,
+               shards: int, ready):
+    """
+    Ponto de entrada de cada processo do servidor.
+    """
+    # Quem encerra os processos é o CacheServer (ou o Ctrl+C do terminal, que chega a todo o grupo).
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    cache = cache_class(capacity=capacity, reader_func=reader_func, max_bytes=max_bytes)
+    info = json.dumps({'shards': shards, 'shard': index, 'policy': cache_class.__name__}).encode('utf-8')
+    asyncio.run(_serve(cache, shard_path(path, index), info, ready))
+
+
+class CacheServer:
+    """
+    Inicia e encerra os processos do servidor de cache.
+    A capacidade e o limite de bytes são divididos entre os processos.
+    """
+
+    def __init__(self, cache_class, path: str = DEFAULT_SOCKET, capacity: int = 10, reader_func=None,
+                 max_bytes: int | None = None, workers: int = 2):
+        """
+        Args:
+            cache_class: Classe da política usada em cada processo.
+            path (str): Caminho base dos sockets (o processo i escuta em '<path>.<i>').
+            capacity (int): Capacidade total, dividida entre os processos.
+            reader_func: Função de leitura dos textos (precisa poder ser enviada a outro processo).
+            max_bytes (int | None): Limite opcional de bytes, dividido entre os processos.
+            workers (int): Número de processos (limitado à capacidade).
+        """
+        if capacity <= 0:
+            raise ValueError("A capacidade do cache deve ser maior que zero.")
+        if reader_func is None:
+            raise ValueError("Uma função de leitura (reader_func) deve ser fornecida.")
+        if workers <= 0:
+            raise ValueError("O número de processos (workers) deve ser maior que zero.")
+        self.cache_class = cache_class
+        self.path = path
+        self.capacity = capacity
+        self.reader_func = reader_func
+        self.max_bytes = max_bytes
+        self.workers = min(workers, capacity)
+        self.processes = []
+
+    def start(self, timeout: float = 10.0):
+        """
+        Inicia os processos e espera todos os sockets estarem prontos.
+        """
+        for index in range(self.workers):
+            shard_capacity = self.capacity // self.workers + (1 if index < self.capacity % self.workers else 0)
+            shard_bytes = None if self.max_bytes is None else max(1, self.max_bytes // self.workers)
+            ready = multiprocessing.Event()
+            process = multiprocessing.Process(
+                target=_run_shard,
+                args=(self.cache_class, shard_capacity, shard_bytes, self.reader_func, self.path, index,
+                      self.workers, ready),
+                daemon=True,
+            )
+            process.start()
+            self.processes.append((process, ready))
+        for process, ready in self.processes:
+            if not ready.wait(timeout):
+                self.stop()
+                raise RuntimeError("O servidor de cache não ficou pronto a tempo.")
+
+    def stop(self):
+        """
+        Encerra os processos e remove os sockets.
+        """
+        for process, _ in self.processes:
+            process.terminate()
+        for process, _ in self.processes:
+            process.join()
+        self.processes = []
+        for index in range(self.workers):
+            try:
+                os.unlink(shard_path(self.path, index))
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self) -> "CacheServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    # Importado aqui para que o leitor e o arquivo de configuração sejam os mesmos do ra2_main.
+    import ra2_main
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="caminho base dos sockets")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="número de processos")
+    parser.add_argument("--capacity", type=int, default=ra2_main.CACHE_CAPACITY, help="capacidade total")
+    parser.add_argument("--max-bytes", type=int, default=ra2_main.CACHE_MAX_BYTES, help="limite total de bytes")
+    parser.add_argument("--policy", default=None, help="política (padrão: a de docs/cache_config.txt)")
+    args = parser.parse_args()
+
+    policy = args.policy
+    if policy is None:
+        try:
+            with open(ra2_main.CONFIG_FILE) as f:
+                policy = f.read().strip()
+        except FileNotFoundError:
+            policy = "LRUCache"
+
+    server = CacheServer(get_policy(policy), args.socket, capacity=args.capacity,
+                         reader_func=ra2_main.read_from_slow_disk, max_bytes=args.max_bytes, workers=args.workers)
+    server.start()
+    print(f"Servidor de cache ({policy}, {server.workers} processos) em '{args.socket}.*'. Ctrl+C para encerrar.")
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        while True:
+            signal.pause()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print("Servidor de cache encerrado.")
+
+
+if __name__ == "__main__":
+    main()
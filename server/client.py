@@ -0,0 +1,260 @@
+"""
+Cliente do servidor de cache (server/cache_server.py).
+
+- CacheClient: conexões por processo do servidor, mantidas em um pool e
+  reaproveitadas entre chamadas (e entre threads), com pipelining em 'many'.
+- RemoteCache: adaptador com a interface 'Cache', para usar o servidor no
+  lugar de um cache local (ex.: no ra2_main).
+- 'CacheClient.read' também serve de 'reader_func' para um cache local
+  pequeno na frente do servidor.
+"""
+import json
+import queue
+import socket
+import time
+from contextlib import ExitStack, contextmanager
+
+from core.cache_abc import Cache, CacheStats
+from core.metrics import CacheMetrics
+from core.registry import get_policy
+from server.protocol import (
+    OP_ACCESS, OP_CONTAINS, OP_INFO, OP_INVALIDATE, OP_INVALIDATE_ALL, OP_METRICS, OP_PUT, OP_REPLACE, RESPONSE,
+    STATUS_OK, decode_metrics, encode_request, shard_for, shard_path,
+)
+
+
+class _Connection:
+    """
+    Uma conexão com um processo do servidor.
+    """
+    __slots__ = ('sock', 'rfile')
+
+    def __init__(self, path: str, timeout: float | None):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(path)
+        self.rfile = self.sock.makefile('rb')
+
+    def send(self, data: bytes):
+        self.sock.sendall(data)
+
+    def receive(self) -> tuple[int, bool, float, bytes]:
+        """
+        Lê a próxima resposta: (status, indicador, segundos no servidor, conteúdo).
+        """
+        header = self.rfile.read(RESPONSE.size)
+        if len(header) < RESPONSE.size:
+            raise ConnectionError("O servidor de cache fechou a conexão.")
+        status, flag, seconds, length = RESPONSE.unpack(header)
+        payload = self.rfile.read(length) if length else b""
+        if len(payload) < length:
+            raise ConnectionError("O servidor de cache fechou a conexão.")
+        return status, bool(flag), seconds, payload
+
+    def close(self):
+        self.rfile.close()
+        self.sock.close()
+
+
+def _check(response: tuple[int, bool, float, bytes]) -> tuple[int, bool, float, bytes]:
+    if response[0] != STATUS_OK:
+        raise RuntimeError(f"Erro no servidor de cache: {response[3].decode('utf-8', 'replace')}")
+    return response
+
+
+class CacheClient:
+    """
+    Fala com todos os processos de um servidor de cache.
+
+    O número de processos é descoberto no processo 0. Cada processo tem um pool
+    de até 'pool_size' conexões ociosas; uma conexão que falha é descartada.
+    """
+
+    def __init__(self, path: str, pool_size: int = 4, timeout: float | None = 30.0):
+        """
+        Args:
+            path (str): Caminho base dos sockets do servidor.
+            pool_size (int): Máximo de conexões ociosas guardadas por processo.
+            timeout (float | None): Tempo máximo de espera por uma resposta, em segundos.
+        """
+        self.path = path
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.pools = [queue.LifoQueue()]
+        info = json.loads(self.call(0, OP_INFO)[3])
+        self.shards = info['shards']
+        self.policy_name = info['policy']
+        self.pools.extend(queue.LifoQueue() for _ in range(self.shards - 1))
+
+    @contextmanager
+    def _connection(self, shard: int):
+        pool = self.pools[shard]
+        try:
+            conn = pool.get_nowait()
+        except queue.Empty:
+            conn = _Connection(shard_path(self.path, shard), self.timeout)
+        try:
+            yield conn
+        except BaseException:
+            # O estado da conexão é desconhecido (resposta pela metade): não volta para o pool.
+            conn.close()
+            raise
+        if pool.qsize() < self.pool_size:
+            pool.put(conn)
+        else:
+            conn.close()
+
+    def call(self, shard: int, op: int, text_id: int = 0, payload: bytes = b"") -> tuple[int, bool, float, bytes]:
+        """
+        Envia uma requisição a um processo e espera a resposta.
+        """
+        with self._connection(shard) as conn:
+            conn.send(encode_request(op, text_id, payload))
+            return _check(conn.receive())
+
+    def many(self, op: int, text_ids) -> list[tuple[int, bool, float, bytes]]:
+        """
+        Envia a mesma operação para vários textos com pipelining: todas as
+        requisições de cada processo vão em um único envio, antes de ler as
+        respostas, e os processos trabalham ao mesmo tempo.
+
+        Returns:
+            As respostas, na ordem de 'text_ids'.
+        """
+        text_ids = list(text_ids)
+        by_shard = {}
+        for position, text_id in enumerate(text_ids):
+            by_shard.setdefault(shard_for(text_id, self.shards), []).append(position)
+
+        responses = [None] * len(text_ids)
+        with ExitStack() as stack:
+            conns = [stack.enter_context(self._connection(shard)) for shard in by_shard]
+            for conn, positions in zip(conns, by_shard.values()):
+                conn.send(b"".join(encode_request(op, text_ids[position]) for position in positions))
+            for conn, positions in zip(conns, by_shard.values()):
+                for position in positions:
+                    responses[position] = _check(conn.receive())
+        return responses
+
+    def access(self, text_id: int) -> tuple[bool, str, float]:
+        start_time = time.perf_counter()
+        _, is_hit, _, payload = self.call(shard_for(text_id, self.shards), OP_ACCESS, text_id)
+        return is_hit, payload.decode('utf-8'), time.perf_counter() - start_time
+
+    def read(self, text_id: int) -> str:
+        """
+        Lê um texto pelo servidor (pode ser usado como 'reader_func' de um cache local).
+        """
+        return self.access(text_id)[1]
+
+    def metrics(self) -> CacheMetrics:
+        """
+        Métricas somadas de todos os processos do servidor.
+        """
+        metrics = CacheMetrics()
+        for shard in range(self.shards):
+            metrics.merge(decode_metrics(self.call(shard, OP_METRICS)[3]))
+        return metrics
+
+    def close(self):
+        for pool in self.pools:
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
+
+
+class RemoteCache(Cache):
+    """
+    Usa um servidor de cache com a interface 'Cache'. A política, a leitura do
+    disco e as evicções acontecem no servidor, compartilhadas entre todos os
+    processos que usam o mesmo servidor, assim como as métricas.
+    """
+    __slots__ = ('client',)
+
+    def __init__(self, path: str, pool_size: int = 4, timeout: float | None = 30.0):
+        """
+        Args:
+            path (str): Caminho base dos sockets do servidor.
+            pool_size (int): Máximo de conexões ociosas guardadas por processo do servidor.
+            timeout (float | None): Tempo máximo de espera por uma resposta, em segundos.
+        """
+        self.client = CacheClient(path, pool_size, timeout)
+
+    @property
+    def policy(self) -> type:
+        """
+        Classe da política usada pelo servidor.
+        """
+        return get_policy(self.client.policy_name)
+
+    def read_from_slow_disk(self, text_id: int) -> str:
+        return self.client.read(text_id)
+
+    def access(self, text_id: int) -> tuple[bool, str, float]:
+        return self.client.access(text_id)
+
+    def access_many(self, text_ids, reader_many=None, max_workers: int | None = None) -> list[tuple[bool, str, float]]:
+        """
+        Acessa vários textos em uma rodada de pipelining. Os misses são lidos pelo
+        servidor, então 'reader_many' e 'max_workers' não são usados.
+        """
+        start_time = time.perf_counter()
+        responses = self.client.many(OP_ACCESS, text_ids)
+        # O tempo de cada acesso é o da rodada inteira, como no 'access_many' padrão.
+        access_time = time.perf_counter() - start_time
+        return [(is_hit, payload.decode('utf-8'), access_time) for _, is_hit, _, payload in responses]
+
+    def put(self, text_id: int, content: str):
+        self.client.call(shard_for(text_id, self.client.shards), OP_PUT, text_id, content.encode('utf-8'))
+
+    def __contains__(self, text_id: int) -> bool:
+        return self.client.call(shard_for(text_id, self.client.shards), OP_CONTAINS, text_id)[1]
+
+    def invalidate(self, text_id: int) -> bool:
+        return self.client.call(shard_for(text_id, self.client.shards), OP_INVALIDATE, text_id)[1]
+
+    def replace(self, text_id: int, content: str) -> bool:
+        return self.client.call(shard_for(text_id, self.client.shards), OP_REPLACE, text_id, content.encode('utf-8'))[1]
+
+    def invalidate_all(self):
+        for shard in range(self.client.shards):
+            self.client.call(shard, OP_INVALIDATE_ALL)
+
+    def add_eviction_listener(self, listener):
+        raise NotImplementedError("As evicções acontecem no servidor de cache e não são enviadas aos clientes.")
+
+    def snapshot_state(self) -> dict:
+        """
+        Os textos ficam no servidor, que continua com eles entre as execuções dos
+        clientes; o snapshot local não guarda nenhum texto.
+        """
+        return {'entries': []}
+
+    def restore_state(self, state: dict, exclude=frozenset()):
+        # O servidor mantém o próprio estado; um snapshot local não o substitui.
+        pass
+
+    def get_metrics(self) -> CacheMetrics:
+        """
+        Métricas do servidor, somadas entre os processos e entre todos os clientes.
+        As latências são as medidas no servidor, sem a ida e volta pelo socket.
+        """
+        return self.client.metrics()
+
+    def get_stats(self) -> CacheStats:
+        metrics = self.client.metrics()
+        return CacheStats(
+            hits=metrics.hits,
+            misses=metrics.misses,
+            total_access_time=metrics.total_access_time,
+            bytes_in_use=metrics.gauges.get('bytes_in_use', 0),
+            bytes_evicted=metrics.counters.get('bytes_evicted', 0),
+        )
+
+    def close(self):
+        self.client.close()
+
+    def __str__(self) -> str:
+        return f"Servidor de cache ({self.client.policy_name}, {self.client.shards} processos) em '{self.client.path}'"
@@ -0,0 +1,89 @@
+"""
+Protocolo binário entre o servidor de cache e os seus clientes.
+
+Cada requisição é um cabeçalho de 9 bytes (operação, text_id e tamanho do
+conteúdo que vem em seguida) e cada resposta é um cabeçalho de 14 bytes
+(status, indicador, tempo gasto no servidor e tamanho do conteúdo). As
+respostas saem na ordem das requisições, então um cliente pode enviar
+várias requisições de uma vez (pipelining) e ler as respostas depois.
+
+As chaves são divididas entre os processos do servidor por 'shard_for', e
+cada processo escuta no seu próprio socket ('shard_path').
+"""
+import json
+import struct
+
+from core.metrics import CacheMetrics
+
+# Requisição: operação, text_id e tamanho do conteúdo.
+REQUEST = struct.Struct("<BII")
+# Resposta: status, indicador (hit ou resultado booleano), segundos no servidor e tamanho do conteúdo.
+RESPONSE = struct.Struct("<BBdI")
+
+# Operações.
+OP_ACCESS = 1
+OP_CONTAINS = 2
+OP_PUT = 3
+OP_INVALIDATE = 4
+OP_INVALIDATE_ALL = 5
+OP_METRICS = 6
+OP_INFO = 7
+OP_REPLACE = 8
+
+# Status das respostas. Em caso de erro, o conteúdo é a mensagem (UTF-8).
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+
+def shard_path(path: str, index: int) -> str:
+    """
+    Caminho do socket do processo 'index' de um servidor iniciado em 'path'.
+    """
+    return f"{path}.{index}"
+
+
+def shard_for(text_id: int, shards: int) -> int:
+    """
+    Processo responsável por um texto.
+    """
+    return text_id % shards
+
+
+def encode_request(op: int, text_id: int = 0, payload: bytes = b"") -> bytes:
+    return REQUEST.pack(op, text_id, len(payload)) + payload
+
+
+def encode_response(status: int, flag: bool = False, seconds: float = 0.0, payload: bytes = b"") -> bytes:
+    return RESPONSE.pack(status, flag, seconds, len(payload)) + payload
+
+
+def encode_metrics(metrics: CacheMetrics) -> bytes:
+    """
+    Serializa as métricas de um processo (incluindo os histogramas) em JSON.
+    """
+    return json.dumps({
+        'hits': metrics.hits,
+        'misses': metrics.misses,
+        'inserts': metrics.inserts,
+        'evictions': metrics.evictions,
+        'rejections': metrics.rejections,
+        'hit_latency': [metrics.hit_latency.counts, metrics.hit_latency.total_ns],
+        'miss_latency': [metrics.miss_latency.counts, metrics.miss_latency.total_ns],
+        'counters': metrics.counters,
+        'gauges': metrics.gauges,
+    }).encode('utf-8')
+
+
+def decode_metrics(data: bytes) -> CacheMetrics:
+    values = json.loads(data)
+    metrics = CacheMetrics()
+    metrics.hits = values['hits']
+    metrics.misses = values['misses']
+    metrics.inserts = values['inserts']
+    metrics.evictions = values['evictions']
+    metrics.rejections = values['rejections']
+    metrics.hit_latency.counts, metrics.hit_latency.total_ns = values['hit_latency']
+    metrics.miss_latency.counts, metrics.miss_latency.total_ns = values['miss_latency']
+    metrics.counters = values['counters']
+    metrics.gauges = values['gauges']
+    return metrics
@@ -0,0 +1,220 @@
+"""
+Curvas de miss ratio do LRU em uma única passada pelo trace.
+
+Para cada acesso, calcula a distância de pilha (stack distance): o número de
+textos distintos acessados desde o acesso anterior ao mesmo texto. Um cache LRU
+de capacidade c acerta exatamente os acessos com distância menor que c, então
+o histograma das distâncias dá a taxa de miss de todas as capacidades de uma vez.
+
+A contagem de textos distintos usa uma árvore de Fenwick sobre as posições do
+trace (O(log n) por acesso). Para traces muito grandes, o modo de amostragem
+(SHARDS) processa apenas os textos cujo hash cai abaixo de um limiar e escala as
+distâncias pela taxa de amostragem.
+
+Uso (a partir da raiz do projeto):
+    python -m simulation.miss_ratio --pattern zipf --length 1000000 --sample-rate 0.1
+    python -m simulation.miss_ratio --log acessos.csv.gz --column text_id
+"""
+import argparse
+import time
+from typing import Iterable
+
+import numpy as np
+
+from simulation.plotting import load_pyplot
+from simulation.trace_engine import PATTERNS, generate_trace
+
+# Hash multiplicativo (Knuth) usado para escolher os textos amostrados.
+_HASH_MULTIPLIER = 2654435761
+_HASH_SPACE = 1 << 32
+
+
+class _FenwickTree:
+    """
+    Árvore de Fenwick (Binary Indexed Tree) para somas de prefixo com atualização pontual.
+    """
+    __slots__ = ('size', 'tree')
+
+    def __init__(self, size: int):
+        self.size = size
+        self.tree = [0] * (size + 1)
+
+    def add(self, index: int, delta: int):
+        index += 1
+        tree = self.tree
+        size = self.size
+        while index <= size:
+            tree[index] += delta
+            index += index & -index
+
+    def prefix_sum(self, index: int) -> int:
+        """
+        Soma das posições 0..index-1.
+        """
+        total = 0
+        tree = self.tree
+        while index > 0:
+            total += tree[index]
+            index -= index & -index
+        return total
+
+
+def _sample(trace: Iterable[int], sample_rate: float) -> tuple[list, int]:
+    """
+    Mantém apenas os acessos aos textos selecionados pelo hash (amostragem espacial):
+    um texto amostrado tem todos os seus acessos mantidos.
+
+    Returns:
+        tuple[list, int]: Acessos amostrados e número total de acessos do trace.
+    """
+    threshold = int(sample_rate * _HASH_SPACE)
+    if isinstance(trace, np.ndarray):
+        hashes = (trace.astype(np.uint64) * np.uint64(_HASH_MULTIPLIER)) % np.uint64(_HASH_SPACE)
+        return trace[hashes < threshold], len(trace)
+
+    sampled = []
+    total = 0
+    for text_id in trace:
+        total += 1
+        if (text_id * _HASH_MULTIPLIER) % _HASH_SPACE < threshold:
+            sampled.append(text_id)
+    return sampled, total
+
+
+def stack_distances(trace: Iterable[int]) -> np.ndarray:
+    """
+    Calcula a distância de pilha de cada acesso do trace.
+
+    Returns:
+        np.ndarray: Uma distância por acesso; -1 indica o primeiro acesso ao texto (miss compulsório).
+    """
+    trace = trace.tolist() if isinstance(trace, np.ndarray) else list(trace)
+    distances = np.empty(len(trace), dtype=np.int64)
+    # A posição do último acesso de cada texto é marcada com 1 na árvore;
+    # as marcas entre dois acessos ao mesmo texto são os textos distintos no intervalo.
+    tree = _FenwickTree(len(trace))
+    last_position = {}
+    marked = 0
+
+    for position, text_id in enumerate(trace):
+        previous = last_position.get(text_id)
+        if previous is None:
+            distances[position] = -1
+        else:
+            distances[position] = marked - tree.prefix_sum(previous + 1)
+            tree.add(previous, -1)
+            marked -= 1
+        tree.add(position, 1)
+        marked += 1
+        last_position[text_id] = position
+
+    return distances
+
+
+def miss_ratio_curve(trace: Iterable[int], max_capacity: int | None = None,
+                     sample_rate: float = 1.0) -> np.ndarray:
+    """
+    Calcula a taxa de miss de um cache LRU para todas as capacidades de 0 a max_capacity.
+
+    Args:
+        trace: Sequência (ou iterador) de text_ids.
+        max_capacity (int | None): Maior capacidade da curva (padrão: número de textos distintos).
+        sample_rate (float): Fração dos textos processados (modo SHARDS). 1.0 processa o trace inteiro.
+
+    Returns:
+        np.ndarray: 'curve[c]' é a taxa de miss (0 a 1) com capacidade c.
+    """
+    if not 0 < sample_rate <= 1:
+        raise ValueError("A taxa de amostragem deve estar no intervalo (0, 1].")
+
+    if sample_rate < 1:
+        trace, total = _sample(trace, sample_rate)
+    distances = stack_distances(trace)
+    reuses = distances[distances >= 0]
+    if sample_rate < 1:
+        # Cada texto amostrado representa 1/sample_rate textos do trace completo.
+        reuses = (reuses / sample_rate).astype(np.int64)
+
+    if max_capacity is None:
+        distinct = int((distances < 0).sum())
+        max_capacity = int(round(distinct / sample_rate))
+
+    curve = np.ones(max_capacity + 1, dtype=np.float64)
+    if len(distances) == 0:
+        return curve
+
+    # Acessos com distância d são hits para todas as capacidades maiores que d.
+    histogram = np.bincount(np.minimum(reuses, max_capacity), minlength=max_capacity + 1).astype(np.float64)
+    accesses = len(distances)
+    if sample_rate < 1:
+        # Correção do SHARDS: a diferença entre o número esperado e o número real de
+        # acessos amostrados (causada por textos muito populares) é tratada como hits
+        # de distância 0, o que remove a maior parte do viés da amostragem.
+        accesses = total * sample_rate
+        histogram[0] += accesses - len(distances)
+
+    hits = np.concatenate(([0], np.cumsum(histogram)[:max_capacity]))
+    curve -= hits / accesses
+    return np.clip(curve, 0.0, 1.0)
+
+
+def plot_miss_ratio_curves(curves: dict, path: str = "docs/curva_miss_ratio.png"):
+    """
+    Gera o gráfico das curvas de miss ratio.
+
+    Args:
+        curves (dict): Nome (padrão ou trace) -> curva retornada por 'miss_ratio_curve'.
+        path (str): Arquivo da imagem.
+    """
+    plt = load_pyplot()
+
+    plt.figure(figsize=(12, 7))
+    for name, curve in curves.items():
+        plt.plot(np.arange(1, len(curve)), curve[1:] * 100, label=name)
+    plt.title('Curva de Miss Ratio do LRU por Capacidade do Cache')
+    plt.ylabel('Taxa de Miss (%)')
+    plt.xlabel('Capacidade do Cache (textos)')
+    plt.ylim(0, 100)
+    plt.grid(alpha=0.3)
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(path)
+    print(f"Gráfico '{path.rsplit('/', 1)[-1]}' gerado.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pattern", choices=PATTERNS, default="zipf")
+    parser.add_argument("--length", type=int, default=1_000_000)
+    parser.add_argument("--texts", type=int, default=100, help="número de textos distintos")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--log", default=None, help="usa um log de acessos em vez de um trace sintético")
+    parser.add_argument("--column", default="0", help="coluna do text_id no log: posição ou nome")
+    parser.add_argument("--max-capacity", type=int, default=None)
+    parser.add_argument("--sample-rate", type=float, default=1.0)
+    parser.add_argument("--plot", default=None, help="arquivo para salvar o gráfico da curva")
+    args = parser.parse_args()
+
+    if args.log is not None:
+        from simulation.trace_replay import iter_trace
+        column = int(args.column) if args.column.isdigit() else args.column
+        trace, name = iter_trace(args.log, column), args.log
+    else:
+        trace, name = generate_trace(args.pattern, args.length, num_texts=args.texts, seed=args.seed), args.pattern
+
+    start = time.perf_counter()
+    curve = miss_ratio_curve(trace, max_capacity=args.max_capacity, sample_rate=args.sample_rate)
+    print(f"Curva calculada em {time.perf_counter() - start:.2f} s (amostragem: {args.sample_rate:.0%}).")
+
+    print(f"{'Capacidade':>10} | {'Taxa de Miss':>12}")
+    print("-" * 25)
+    step = max(1, (len(curve) - 1) // 20)
+    for capacity in range(1, len(curve), step):
+        print(f"{capacity:>10} | {curve[capacity] * 100:>11.2f}%")
+
+    if args.plot:
+        plot_miss_ratio_curves({name: curve}, args.plot)
+
+
+if __name__ == "__main__":
+    main()
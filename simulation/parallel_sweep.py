@@ -0,0 +1,147 @@
+"""
+Varredura paralela de simulações com um pool de processos ou de threads.
+
+Cada combinação (política, padrão, capacidade, semente) é um trabalho
+independente: o trabalho gera o seu trace, executa a política e devolve
+apenas arrays NumPy compactos (textos, hits e tempos). O processo principal
+junta tudo em um único DataFrame, no mesmo formato usado por
+'analyze_and_plot' e 'print_text_report'.
+
+Com o leitor sem atraso ('fast_reader'), o tempo vai todo para as políticas
+e os trabalhos rodam em processos. Com um leitor que espera (como o disco
+lento simulado), os trabalhos passam quase todo o tempo dormindo, com o GIL
+liberado, e rodam em threads: todos esperam ao mesmo tempo, sem o custo de
+criar processos e enviar os resultados entre eles.
+
+Uso (a partir da raiz do projeto):
+    python -m simulation.parallel_sweep --capacities 5 10 20 --seeds 4 --length 100000
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import product
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from simulation.trace_engine import DEFAULT_POLICIES, fast_reader, generate_trace, run_trace
+
+# Nomes dos padrões do trace_engine como aparecem nos relatórios do simulador.
+PATTERN_LABELS = {
+    "uniform": "Aleatório Puro",
+    "poisson": "Poisson",
+    "weighted": "Ponderado",
+    "zipf": "Zipf",
+}
+DEFAULT_PATTERNS = ("uniform", "poisson", "weighted")
+# Limite de threads para os leitores que esperam: cada thread passa quase todo o tempo dormindo.
+MAX_READER_THREADS = 64
+
+
+class SweepJob(NamedTuple):
+    cache_class: type
+    pattern: str
+    capacity: int
+    seed: int
+    length: int
+
+
+class SweepResult(NamedTuple):
+    job: SweepJob
+    text_ids: np.ndarray
+    hits: np.ndarray
+    times: np.ndarray
+
+
+def _run_job(job: SweepJob, reader_func) -> SweepResult:
+    """
+    Executa um trabalho da varredura (chamado dentro de um processo ou thread do pool).
+    """
+    trace = generate_trace(job.pattern, job.length, seed=job.seed)
+    cache = job.cache_class(capacity=job.capacity, reader_func=reader_func)
+    result = run_trace(cache, trace)
+    return SweepResult(job, trace, result.hits, result.times)
+
+
+def _to_dataframe(results: list) -> pd.DataFrame:
+    """
+    Junta os arrays de todos os trabalhos em um único DataFrame.
+    As colunas de texto usam o tipo 'category', que guarda apenas um código por linha.
+    """
+    if not results:
+        return pd.DataFrame(columns=['algorithm', 'pattern', 'capacity', 'user', 'text_id', 'is_hit', 'time'])
+
+    sizes = [len(result.text_ids) for result in results]
+    algorithms = [result.job.cache_class.__name__ for result in results]
+    patterns = [PATTERN_LABELS.get(result.job.pattern, result.job.pattern) for result in results]
+
+    return pd.DataFrame({
+        'algorithm': pd.Categorical(np.repeat(algorithms, sizes)),
+        'pattern': pd.Categorical(np.repeat(patterns, sizes)),
+        'capacity': np.repeat([result.job.capacity for result in results], sizes).astype(np.int32),
+        'user': np.repeat([result.job.seed for result in results], sizes).astype(np.int32),
+        'text_id': np.concatenate([result.text_ids for result in results]),
+        'is_hit': np.concatenate([result.hits for result in results]),
+        'time': np.concatenate([result.times for result in results]),
+    })
+
+
+def run_sweep(policies=None, patterns=DEFAULT_PATTERNS, capacities=(10,), seeds=(1, 2, 3),
+              length: int = 200, reader_func=fast_reader, max_workers: int | None = None,
+              threads: bool | None = None) -> pd.DataFrame:
+    """
+    Executa todas as combinações (política, padrão, capacidade, semente) em paralelo.
+
+    Args:
+        policies: Classes de cache a testar (padrão: todas as políticas registradas).
+        patterns: Padrões do trace_engine ('uniform', 'poisson', 'weighted', 'zipf').
+        capacities: Capacidades a testar.
+        seeds: Sementes dos traces; cada semente faz o papel de um usuário.
+        length (int): Número de acessos por trabalho.
+        reader_func: Função de leitura (com processos, precisa poder ser enviada a outro processo).
+        max_workers (int | None): Número de processos (padrão: número de CPUs) ou de threads
+            (padrão: um por trabalho, até MAX_READER_THREADS).
+        threads (bool | None): Usa threads em vez de processos. None: threads para qualquer
+            leitor diferente de 'fast_reader', que passa o tempo esperando, e não calculando.
+
+    Returns:
+        pd.DataFrame: Uma linha por acesso, com as colunas do simulador mais 'capacity'.
+    """
+    jobs = [
+        SweepJob(cache_class, pattern, capacity, seed, length)
+        for cache_class, pattern, capacity, seed in product(policies or DEFAULT_POLICIES, patterns, capacities, seeds)
+    ]
+    if threads is None:
+        threads = reader_func is not fast_reader
+    if threads:
+        pool = ThreadPoolExecutor(max_workers=max_workers or max(1, min(len(jobs), MAX_READER_THREADS)))
+    else:
+        pool = ProcessPoolExecutor(max_workers=max_workers)
+    with pool:
+        results = list(pool.map(_run_job, jobs, [reader_func] * len(jobs)))
+    return _to_dataframe(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--patterns", nargs="+", choices=list(PATTERN_LABELS), default=list(DEFAULT_PATTERNS))
+    parser.add_argument("--capacities", nargs="+", type=int, default=[10])
+    parser.add_argument("--seeds", type=int, default=3, help="número de sementes (usuários) por combinação")
+    parser.add_argument("--length", type=int, default=100_000, help="acessos por trabalho")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    df = run_sweep(patterns=args.patterns, capacities=args.capacities, seeds=range(1, args.seeds + 1),
+                   length=args.length, max_workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    summary = df.groupby(['algorithm', 'pattern', 'capacity'], observed=True)['is_hit'].mean().mul(100)
+    print(summary.unstack('capacity').round(2).to_string())
+    print(f"\n{len(df):,} acessos simulados em {elapsed:.2f} s com {args.workers} processos.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""
+Carregamento sob demanda do matplotlib.
+
+O matplotlib (e o seaborn, que depende dele) leva centenas de milissegundos e
+dezenas de MB para carregar, e só é usado quando um gráfico é gerado. Os
+gráficos são salvos em arquivo, então o backend é sempre o Agg (não
+interativo), que não precisa de interface gráfica.
+"""
+
+
+def load_pyplot():
+    """
+    Importa e retorna o matplotlib.pyplot com o backend Agg.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
@@ -0,0 +1,131 @@
+from array import array
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+RESULT_COLUMNS = ['algorithm', 'pattern', 'user', 'text_id', 'is_hit', 'time']
+
+
+class ResultSummary(NamedTuple):
+    """
+    Resumo agregado dos resultados de uma simulação ou de um replay de trace.
+
+    - totals: uma linha por (algorithm, pattern), com as colunas 'accesses',
+      'hits', 'total_time' (soma dos tempos de acesso, em segundos) e
+      'miss_time' (soma dos tempos dos misses: a espera que o usuário sente).
+    - misses_by_text: uma linha por (algorithm, pattern, text_id), com a coluna 'misses'.
+
+    Como o tamanho do resumo não depende do número de acessos, ele pode ser
+    montado de forma incremental para traces muito grandes.
+    """
+    totals: pd.DataFrame
+    misses_by_text: pd.DataFrame
+
+
+class ResultBuffer:
+    """
+    Resultados de acesso guardados por colunas, em arrays tipados, em vez de um
+    dict por acesso.
+
+    Cada acesso ocupa 15 bytes: códigos int16 do algoritmo e do padrão, int16
+    do usuário, int32 do texto, um byte do hit e float32 do tempo. Os nomes de
+    algoritmos e padrões são guardados uma única vez. 'to_dataframe' monta o
+    DataFrame sem copiar linha a linha, com colunas 'category'.
+    """
+    __slots__ = ('algorithms', 'patterns', 'algorithm_codes', 'pattern_codes', 'users', 'text_ids', 'hits', 'times')
+
+    def __init__(self):
+        # Nome -> código, na ordem em que apareceram.
+        self.algorithms = {}
+        self.patterns = {}
+        self.algorithm_codes = array('h')
+        self.pattern_codes = array('h')
+        self.users = array('h')
+        self.text_ids = array('i')
+        self.hits = array('b')
+        self.times = array('f')
+
+    def __len__(self) -> int:
+        return len(self.text_ids)
+
+    @staticmethod
+    def _code(names: dict, name: str) -> int:
+        return names.setdefault(name, len(names))
+
+    def append(self, algorithm: str, pattern: str, user: int, text_id: int, is_hit: bool, access_time: float):
+        """
+        Registra um acesso.
+        """
+        self.algorithm_codes.append(self._code(self.algorithms, algorithm))
+        self.pattern_codes.append(self._code(self.patterns, pattern))
+        self.users.append(user)
+        self.text_ids.append(text_id)
+        self.hits.append(is_hit)
+        self.times.append(access_time)
+
+    def extend(self, algorithm: str, pattern: str, user: int, text_ids: np.ndarray, hits: np.ndarray,
+               times: np.ndarray):
+        """
+        Registra de uma vez um bloco de acessos do mesmo algoritmo, padrão e usuário
+        (ex.: o resultado de 'run_trace').
+        """
+        size = len(text_ids)
+        self.algorithm_codes.extend(array('h', [self._code(self.algorithms, algorithm)]) * size)
+        self.pattern_codes.extend(array('h', [self._code(self.patterns, pattern)]) * size)
+        self.users.extend(array('h', [user]) * size)
+        self.text_ids.frombytes(np.ascontiguousarray(text_ids, dtype=np.int32).tobytes())
+        self.hits.frombytes(np.ascontiguousarray(hits, dtype=np.bool_).tobytes())
+        self.times.frombytes(np.ascontiguousarray(times, dtype=np.float32).tobytes())
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Retorna os acessos como DataFrame, com as colunas de RESULT_COLUMNS.
+        """
+        return pd.DataFrame({
+            'algorithm': pd.Categorical.from_codes(np.frombuffer(self.algorithm_codes, dtype=np.int16),
+                                                   list(self.algorithms)),
+            'pattern': pd.Categorical.from_codes(np.frombuffer(self.pattern_codes, dtype=np.int16),
+                                                 list(self.patterns)),
+            'user': np.frombuffer(self.users, dtype=np.int16),
+            'text_id': np.frombuffer(self.text_ids, dtype=np.int32),
+            'is_hit': np.frombuffer(self.hits, dtype=np.bool_),
+            'time': np.frombuffer(self.times, dtype=np.float32),
+        }, columns=RESULT_COLUMNS)
+
+
+def summarize_results(all_results) -> ResultSummary:
+    """
+    Converte os resultados de acesso (ResultBuffer, lista de dicts ou DataFrame com
+    as colunas 'algorithm', 'pattern', 'text_id', 'is_hit' e 'time') em um ResultSummary.
+    Um ResultSummary recebido é retornado sem alterações.
+    """
+    if isinstance(all_results, ResultSummary):
+        return all_results
+
+    if isinstance(all_results, ResultBuffer):
+        df = all_results.to_dataframe()
+    elif isinstance(all_results, pd.DataFrame):
+        df = all_results
+    else:
+        df = pd.DataFrame(all_results)
+    if df.empty:
+        return ResultSummary(
+            pd.DataFrame(columns=['algorithm', 'pattern', 'accesses', 'hits', 'total_time', 'miss_time']),
+            pd.DataFrame(columns=['algorithm', 'pattern', 'text_id', 'misses']),
+        )
+    totals = (
+        df.assign(miss_time=df['time'].where(~df['is_hit'].astype(bool), 0))
+        .groupby(['algorithm', 'pattern'], observed=True)
+        .agg(accesses=('is_hit', 'size'), hits=('is_hit', 'sum'), total_time=('time', 'sum'),
+             miss_time=('miss_time', 'sum'))
+        .reset_index()
+    )
+    misses_by_text = (
+        df[~df['is_hit'].astype(bool)]
+        .groupby(['algorithm', 'pattern', 'text_id'], observed=True)
+        .size()
+        .rename('misses')
+        .reset_index()
+    )
+    return ResultSummary(totals, misses_by_text)
@@ -1,14 +1,21 @@
+import os
 import random
+import tempfile
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 
 from core.cache_abc import Cache
-from algorithms.fifo import FIFOCache
 from algorithms.lru_cache import LRUCache
-from algorithms.lfu import LFUCache
-from algorithms.arc_cache import ARCCache
+from core.registry import available_policies
+from core.prefetch import PrefetchingCache, SequentialPrefetch, MarkovPrefetch
+from core.compressed_cache import CompressedCache
+from core.tiered_cache import TieredCache
+from storage.compression import TextCodec
+from simulation.parallel_sweep import DEFAULT_PATTERNS, PATTERN_LABELS, run_sweep
+from simulation.miss_ratio import miss_ratio_curve, plot_miss_ratio_curves
+from simulation.trace_engine import generate_trace
+from simulation.plotting import load_pyplot
+from simulation.results import ResultBuffer, summarize_results
 
 def _pattern_pure_random() -> int:
     """Retorna um ID de texto de 1 a 100, com distribuição uniforme."""
@@ -27,10 +34,28 @@ def _pattern_weighted() -> int:
         outros_textos = list(range(1, 30)) + list(range(41, 101))
         return random.choice(outros_textos)
 
-def run_single_simulation(cache_instance: Cache) -> list:
-    """Executa a simulação completa para uma única instância de cache."""
-    print(f"\n--- Iniciando simulação para {type(cache_instance).__name__} ---")
-    results = []
+def _sequential_session_trace(length: int, continue_prob: float = 0.7) -> list:
+    """
+    Gera uma sequência de leitura em que o usuário costuma seguir para o próximo
+    texto (n, n+1, ...) e, de vez em quando, salta para um texto aleatório.
+    """
+    trace = [random.randint(1, 100)]
+    while len(trace) < length:
+        if random.random() < continue_prob and trace[-1] < 100:
+            trace.append(trace[-1] + 1)
+        else:
+            trace.append(random.randint(1, 100))
+    return trace
+
+def run_single_simulation(cache_instance: Cache, results: ResultBuffer | None = None) -> ResultBuffer:
+    """
+    Executa a simulação completa para uma única instância de cache.
+    Os acessos são registrados em 'results' (ou em um ResultBuffer novo), que é retornado.
+    """
+    algorithm = type(cache_instance).__name__
+    print(f"\n--- Iniciando simulação para {algorithm} ---")
+    if results is None:
+        results = ResultBuffer()
     patterns = {
         "Aleatório Puro": _pattern_pure_random,
         "Poisson": _pattern_poisson,
@@ -43,28 +68,26 @@ def run_single_simulation(cache_instance: Cache) -> list:
             for request_num in range(200):
                 text_id = pattern_func()
                 is_hit, _, access_time = cache_instance.access(text_id)
-                
-                results.append({
-                    'algorithm': type(cache_instance).__name__,
-                    'pattern': pattern_name,
-                    'user': user,
-                    'text_id': text_id,
-                    'is_hit': is_hit,
-                    'time': access_time
-                })
-    
-    print(f"--- Simulação para {type(cache_instance).__name__} concluída. ---")
+                results.append(algorithm, pattern_name, user, text_id, is_hit, access_time)
+
+    print(f"--- Simulação para {algorithm} concluída. ---")
     return results
 
-def analyze_and_plot(all_results: list):
-    """Analisa os resultados e gera os gráficos."""
-    if not all_results:
+def analyze_and_plot(all_results):
+    """
+    Analisa os resultados e gera os gráficos.
+    Aceita um ResultBuffer, a lista de acessos, um DataFrame de acessos ou um ResultSummary.
+    """
+    summary = summarize_results(all_results)
+    if summary.totals.empty:
         print("Nenhum resultado para analisar.")
         return
-    df = pd.DataFrame(all_results)
+    totals = summary.totals.assign(mean_time=summary.totals['total_time'] / summary.totals['accesses'])
+    plt = load_pyplot()
+    import seaborn as sns
 
     plt.figure(figsize=(12, 7))
-    sns.barplot(data=df, x='algorithm', y='is_hit', hue='pattern', estimator=sum, errorbar=None)
+    sns.barplot(data=totals, x='algorithm', y='hits', hue='pattern', errorbar=None)
     plt.title('Total de Cache Hits por Algoritmo e Padrão de Acesso')
     plt.ylabel('Número Total de Hits')
     plt.xlabel('Algoritmo de Cache')
@@ -73,7 +96,7 @@ def analyze_and_plot(all_results: list):
     print("Gráfico 'comparacao_hits.png' gerado.")
 
     plt.figure(figsize=(12, 7))
-    sns.barplot(data=df, x='algorithm', y='time', hue='pattern')
+    sns.barplot(data=totals, x='algorithm', y='mean_time', hue='pattern', errorbar=None)
     plt.title('Tempo Médio de Acesso por Algoritmo e Padrão')
     plt.ylabel('Tempo Médio de Acesso (s)')
     plt.xlabel('Algoritmo de Cache')
@@ -81,12 +104,18 @@ def analyze_and_plot(all_results: list):
     plt.savefig('docs/comparacao_tempo.png')
     print("Gráfico 'comparacao_tempo.png' gerado.")
 
-    df_misses = df[(df['is_hit'] == False) & (df['pattern'] == 'Ponderado')]
-    misses_per_text = df_misses['text_id'].value_counts().nlargest(15)
+    # O gráfico de misses foca no padrão Ponderado; sem ele (ex.: replay de trace), usa todos os acessos.
+    df_misses = summary.misses_by_text
+    pattern_title = 'Padrão Ponderado'
+    if (df_misses['pattern'] == 'Ponderado').any():
+        df_misses = df_misses[df_misses['pattern'] == 'Ponderado']
+    else:
+        pattern_title = 'Todos os Padrões'
+    misses_per_text = df_misses.groupby('text_id')['misses'].sum().nlargest(15)
     
     plt.figure(figsize=(12, 7))
     misses_per_text.plot(kind='bar')
-    plt.title('Top 15 Textos com Mais Cache Misses (Padrão Ponderado)')
+    plt.title(f'Top 15 Textos com Mais Cache Misses ({pattern_title})')
     plt.ylabel('Número de Misses')
     plt.xlabel('ID do Texto')
     plt.tight_layout()
@@ -94,19 +123,21 @@ def analyze_and_plot(all_results: list):
     print("Gráfico 'analise_misses_por_texto.png' gerado.")
 
 
-def analyze_and_save_best_algorithm(all_results: list):
+def analyze_and_save_best_algorithm(all_results):
     """
     Analisa os resultados para encontrar o melhor algoritmo e salva a escolha.
-    Critério: maior número total de cache hits.
+    Critério: maior número total de cache hits. A latência total dos misses
+    também é mostrada, pois com textos de custos diferentes menos misses
+    não significa necessariamente menos espera.
     """
-    if not all_results:
+    totals = summarize_results(all_results).totals
+    if totals.empty:
         print("Nenhum resultado para analisar e salvar.")
         return
 
-    df = pd.DataFrame(all_results)
-
-    # Agrupa por algoritmo e soma os hits (True = 1, False = 0)
-    hits_por_algoritmo = df.groupby('algorithm')['is_hit'].sum()
+    # Agrupa por algoritmo e soma os hits e a latência dos misses
+    por_algoritmo = totals.groupby('algorithm', observed=True)[['hits', 'miss_time']].sum()
+    hits_por_algoritmo = por_algoritmo['hits']
 
     # Encontra o algoritmo com o maior número de hits
     best_algorithm_name = hits_por_algoritmo.idxmax()
@@ -115,6 +146,7 @@ def analyze_and_save_best_algorithm(all_results: list):
     print("ANÁLISE DE PERFORMANCE FINAL")
     print("=" * 50)
     print(f"Total de Hits por Algoritmo:\n{hits_por_algoritmo}")
+    print(f"\nLatência Total dos Misses por Algoritmo (s):\n{por_algoritmo['miss_time'].round(3)}")
     print(f"\nO melhor algoritmo foi: {best_algorithm_name}")
 
     # Salva o nome do melhor algoritmo em um arquivo de configuração
@@ -126,62 +158,87 @@ def analyze_and_save_best_algorithm(all_results: list):
         print(f"Erro ao salvar o arquivo de configuração: {e}")
     print("=" * 50)
 
-def start_simulation_mode(reader_func):
-    """Função principal que orquestra o modo de simulação."""
-    algorithms_to_test = [FIFOCache, LRUCache, LFUCache, ARCCache]
-    all_simulation_results = []
+def start_simulation_mode(reader_func, parallel: bool = True, max_workers: int | None = None):
+    """
+    Função principal que orquestra o modo de simulação.
+
+    Com 'parallel=True', cada combinação (algoritmo, padrão, usuário) roda com um
+    cache novo, em paralelo com as outras, e os resultados são reunidos em um
+    DataFrame. Como o leitor espera o disco lento, os trabalhos rodam em threads
+    (ver 'run_sweep'), e as latências medidas continuam sendo as do disco. Com
+    'parallel=False', cada algoritmo usa um único cache para todos os padrões e
+    usuários, um após o outro.
+    """
+    algorithms_to_test = list(available_policies().values())
+
+    if parallel:
+        print("\n--- Iniciando simulações em paralelo ---")
+        all_simulation_results = run_sweep(
+            policies=algorithms_to_test,
+            seeds=(1, 2, 3),
+            length=200,
+            reader_func=reader_func,
+            max_workers=max_workers,
+        )
+        print("--- Simulações concluídas. ---")
+    else:
+        all_simulation_results = ResultBuffer()
+        for cache_class in algorithms_to_test:
+            cache_instance = cache_class(capacity=10, reader_func=reader_func)
+            run_single_simulation(cache_instance, all_simulation_results)
 
-    for cache_class in algorithms_to_test:
-        cache_instance = cache_class(capacity=10, reader_func=reader_func)
-        results = run_single_simulation(cache_instance)
-        all_simulation_results.extend(results)
+    # Os acessos são agregados uma única vez; gráficos, escolha do melhor algoritmo e relatório usam o mesmo resumo.
+    summary = summarize_results(all_simulation_results)
 
     # Gera os gráficos conforme solicitado no PDF
-    analyze_and_plot(all_simulation_results)
+    analyze_and_plot(summary)
+
+    # Curva de miss ratio do LRU para todas as capacidades, com traces do mesmo tamanho da simulação
+    plot_miss_ratio_curves({
+        PATTERN_LABELS[pattern]: miss_ratio_curve(generate_trace(pattern, 3 * 200, seed=1), max_capacity=100)
+        for pattern in DEFAULT_PATTERNS
+    })
 
     # Analisa e salva o melhor algoritmo para a próxima execução
-    analyze_and_save_best_algorithm(all_simulation_results)
+    analyze_and_save_best_algorithm(summary)
 
-    print_text_report(all_simulation_results) 
+    print_text_report(summary)
     
-def print_text_report(all_results: list):
+def print_text_report(all_results):
     """
     Analisa os resultados da simulação e imprime um relatório em texto no terminal.
     """
-    if not all_results:
+    summary = summarize_results(all_results)
+    if summary.totals.empty:
         print("Nenhum resultado para gerar relatório.")
         return
 
-    df = pd.DataFrame(all_results)
-
     print("\n\n" + "=" * 50)
     print("RELATÓRIO DE PERFORMANCE DA SIMULAÇÃO DE CACHE")
     print("=" * 50)
 
-    # Agrupa os dados por algoritmo e por padrão de acesso
-    grouped = df.groupby(['algorithm', 'pattern'])
-
-    for (algorithm, pattern), group in grouped:
-        total_hits = group['is_hit'].sum()
-        total_misses = len(group) - total_hits
-        total_accesses = len(group)
+    # Uma linha por algoritmo e padrão de acesso
+    for row in summary.totals.sort_values(['algorithm', 'pattern']).itertuples(index=False):
+        total_hits = int(row.hits)
+        total_accesses = int(row.accesses)
+        total_misses = total_accesses - total_hits
         hit_ratio = (total_hits / total_accesses) * 100 if total_accesses > 0 else 0
-        avg_time = group['time'].mean()
+        avg_time = row.total_time / total_accesses if total_accesses > 0 else 0
 
-        print(f"\n--- Algoritmo: {algorithm} | Padrão: {pattern} ---")
+        print(f"\n--- Algoritmo: {row.algorithm} | Padrão: {row.pattern} ---")
         print(f"  - Total de Acessos: {total_accesses}")
         print(f"  - Cache Hits:       {total_hits}")
         print(f"  - Cache Misses:     {total_misses}")
         print(f"  - Taxa de Acerto:   {hit_ratio:.2f}%")
         print(f"  - Tempo Médio de Acesso: {avg_time:.6f} segundos")
+        print(f"  - Latência Total dos Misses: {row.miss_time:.3f} segundos")
 
     print("\n" + "=" * 50)
     print("ANÁLISE DE TEXTOS COM MAIS CACHE MISSES")
     print("=" * 50)
 
-    # Filtra apenas os misses e conta a ocorrência de cada text_id
-    df_misses = df[df['is_hit'] == False]
-    misses_per_text = df_misses['text_id'].value_counts().nlargest(10)
+    # Soma os misses de cada text_id em todos os algoritmos e padrões
+    misses_per_text = summary.misses_by_text.groupby('text_id')['misses'].sum().nlargest(10)
 
     if misses_per_text.empty:
         print("Nenhum cache miss foi registrado.")
@@ -189,4 +246,177 @@ def print_text_report(all_results: list):
         print("Top 10 textos que mais causaram cache miss no geral:")
         print(misses_per_text)
 
-    print("=" * 50)
\ No newline at end of file
+    print("=" * 50)
+
+def run_prefetch_comparison(reader_func, cache_class=LRUCache, num_requests: int = 200):
+    """
+    Compara a taxa de acerto de uma política com e sem prefetch, usando a mesma
+    sequência de leitura (com trechos sequenciais) em todas as configurações.
+    """
+    trace = _sequential_session_trace(num_requests)
+    configurations = {
+        "Sem prefetch": None,
+        "Sequencial": lambda: SequentialPrefetch(max_id=100),
+        "Markov": lambda: MarkovPrefetch(),
+    }
+
+    print("\n\n" + "=" * 50)
+    print(f"COMPARAÇÃO DE PREFETCH ({cache_class.__name__}, {num_requests} acessos)")
+    print("=" * 50)
+
+    for name, strategy_factory in configurations.items():
+        cache = cache_class(capacity=10, reader_func=reader_func)
+        if strategy_factory is not None:
+            cache = PrefetchingCache(cache, strategy_factory())
+
+        total_hits = 0
+        total_time = 0.0
+        for text_id in trace:
+            is_hit, _, access_time = cache.access(text_id)
+            total_hits += is_hit
+            total_time += access_time
+
+        print(f"\n--- {name} ---")
+        print(f"  - Cache Hits:       {total_hits}")
+        print(f"  - Taxa de Acerto:   {total_hits / len(trace) * 100:.2f}%")
+        print(f"  - Tempo Médio de Acesso: {total_time / len(trace):.6f} segundos")
+        if strategy_factory is not None:
+            cache.close()
+            prefetch_stats = cache.get_prefetch_stats()
+            print(f"  - Textos Antecipados: {prefetch_stats['issued']} "
+                  f"(usados: {prefetch_stats['useful']}, precisão: {prefetch_stats['accuracy'] * 100:.2f}%)")
+
+    print("=" * 50)
+
+def run_tiered_comparison(reader_func, cache_class=LRUCache, l2_capacity: int = 50, num_requests: int = 200,
+                          seed: int = 42):
+    """
+    Compara o cache só em memória com o cache de dois níveis (L1 em memória e
+    L2 em SQLite, inclusivo e exclusivo), usando a mesma sequência de acessos
+    (Zipf) e o mesmo L1 de 10 textos. O L2 fica em um arquivo temporário.
+    """
+    trace = generate_trace("zipf", num_requests, seed=seed).tolist()
+    configurations = {
+        "Só memória": None,
+        "L1 + L2 inclusivo": False,
+        "L1 + L2 exclusivo": True,
+    }
+
+    print("\n\n" + "=" * 50)
+    print(f"COMPARAÇÃO DO SEGUNDO NÍVEL ({cache_class.__name__}, L2 de {l2_capacity} textos, {num_requests} acessos)")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, exclusive in configurations.items():
+            if exclusive is None:
+                cache = cache_class(capacity=10, reader_func=reader_func)
+            else:
+                cache = TieredCache(cache_class, capacity=10, reader_func=reader_func, l2_capacity=l2_capacity,
+                                    l2_path=os.path.join(tmp_dir, f"l2_{exclusive}.sqlite"), exclusive=exclusive)
+
+            total_time = 0.0
+            for text_id in trace:
+                total_time += cache.access(text_id)[2]
+
+            if exclusive is None:
+                l1 = cache.get_metrics()
+                disk_reads = l1.misses
+            else:
+                tiers = cache.get_tier_metrics()
+                l1, l2 = tiers['l1'], tiers['l2']
+                disk_reads = l2.misses
+                cache.close()
+
+            print(f"\n--- {name} ---")
+            print(f"  - Taxa de Acerto no L1: {l1.hit_ratio * 100:.2f}%")
+            if exclusive is not None:
+                print(f"  - Hits no L2:       {l2.hits} (latência média: {l2.hit_latency.mean * 1e6:,.1f} µs)")
+            print(f"  - Leituras do Disco: {disk_reads}")
+            print(f"  - Custo Médio de um Miss no L1: {l1.miss_latency.mean * 1e3:.3f} ms")
+            print(f"  - Tempo Médio de Acesso: {total_time / len(trace):.6f} segundos")
+
+    print("=" * 50)
+
+
+def run_compression_comparison(reader_func, cache_class=LRUCache, max_bytes: int = 64 * 1024,
+                               num_requests: int = 2000, zdict: bytes | None = None, seed: int = 42) -> pd.DataFrame:
+    """
+    Compara o cache com textos descomprimidos e com cada método de compressão,
+    com o mesmo limite de bytes e a mesma sequência de acessos (Zipf).
+
+    Para cada modo, mostra a capacidade efetiva (textos residentes ao final),
+    a taxa de acerto, a latência média de um hit e quanto ela aumentou em
+    relação ao modo sem compressão. Cada texto é lido do disco uma única vez
+    e reaproveitado pelos demais modos.
+
+    Args:
+        reader_func: Função usada para ler os textos do disco.
+        cache_class: Política usada em todos os modos.
+        max_bytes (int): Limite de memória do cache.
+        num_requests (int): Número de acessos.
+        zdict (bytes | None): Dicionário compartilhado para o modo zlib com dicionário.
+        seed (int): Semente da sequência de acessos.
+
+    Returns:
+        pd.DataFrame: Uma linha por modo.
+    """
+    trace = generate_trace("zipf", num_requests, seed=seed).tolist()
+    contents = {}
+
+    def read_once(text_id: int) -> str:
+        content = contents.get(text_id)
+        if content is None:
+            content = contents[text_id] = reader_func(text_id)
+        return content
+
+    configurations = {
+        "Sem compressão": None,
+        "zlib-1": TextCodec("zlib", 1),
+        "zlib-6": TextCodec("zlib", 6),
+        "lzma-6": TextCodec("lzma", 6),
+    }
+    if zdict:
+        configurations["zlib-6 + dicionário"] = TextCodec("zlib", 6, zdict)
+
+    print("\n\n" + "=" * 50)
+    print(f"COMPARAÇÃO DE COMPRESSÃO ({cache_class.__name__}, {max_bytes:,} bytes, {num_requests} acessos)")
+    print("=" * 50)
+
+    rows = []
+    for name, codec in configurations.items():
+        # A capacidade em textos não limita: só o limite de bytes decide quantos textos cabem.
+        if codec is None:
+            cache = cache_class(capacity=num_requests, reader_func=read_once, max_bytes=max_bytes)
+        else:
+            cache = CompressedCache(cache_class, capacity=num_requests, reader_func=read_once,
+                                    max_bytes=max_bytes, codec=codec)
+
+        hits = 0
+        hit_time = 0.0
+        for text_id in trace:
+            is_hit, _, access_time = cache.access(text_id)
+            if is_hit:
+                hits += 1
+                hit_time += access_time
+
+        rows.append({
+            'mode': name,
+            'resident_texts': cache.get_metrics().gauges['entries'],
+            'hit_ratio': hits / len(trace),
+            'hit_latency': hit_time / hits if hits else 0.0,
+            'compression_ratio': cache.compression_ratio if codec is not None else 1.0,
+        })
+
+    baseline = rows[0]
+    for row in rows:
+        print(f"\n--- {row['mode']} ---")
+        print(f"  - Textos Residentes: {row['resident_texts']} "
+              f"({row['resident_texts'] / max(1, baseline['resident_texts']):.1f}x)")
+        print(f"  - Taxa de Acerto:    {row['hit_ratio'] * 100:.2f}%")
+        print(f"  - Latência Média do Hit: {row['hit_latency'] * 1e6:,.1f} µs "
+              f"(+{(row['hit_latency'] - baseline['hit_latency']) * 1e6:,.1f} µs)")
+        if row['mode'] != baseline['mode']:
+            print(f"  - Taxa de Compressão: {row['compression_ratio']:.2f}x")
+
+    print("=" * 50)
+    return pd.DataFrame(rows)
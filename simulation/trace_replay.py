@@ -0,0 +1,184 @@
+"""
+Replay de logs de acesso reais no simulador.
+
+O log é lido linha a linha por um gerador (texto puro ou CSV, opcionalmente
+compactado com gzip), sem carregar o arquivo na memória. Cada acesso é
+repassado a todas as políticas na mesma passada, e apenas contadores agregados
+são mantidos: o uso de memória depende do número de textos distintos, não do
+tamanho do log.
+
+Uso (a partir da raiz do projeto):
+    python -m simulation.trace_replay acessos.csv.gz --column text_id
+"""
+import argparse
+import csv
+import gzip
+import os
+import time
+from collections import defaultdict
+from typing import Iterator
+
+import pandas as pd
+
+from simulation.results import ResultSummary
+from simulation.trace_engine import DEFAULT_POLICIES, fast_reader
+
+
+def _open_log(path: str):
+    """
+    Abre o log em modo texto, descompactando-o sob demanda se terminar em '.gz'.
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def iter_trace(path: str, column: int | str = 0, delimiter: str | None = None) -> Iterator[int]:
+    """
+    Percorre um log de acessos, devolvendo um text_id por vez.
+
+    Args:
+        path (str): Arquivo do log ('.gz' é descompactado durante a leitura).
+        column (int | str): Coluna com o text_id, por posição ou pelo nome no cabeçalho.
+        delimiter (str | None): Separador das colunas. Se None, é detectado na
+            primeira linha (',', ';' ou tab); sem nenhum deles, a linha inteira é o text_id.
+
+    Yields:
+        int: Identificador do texto acessado. Linhas vazias, comentários ('#') e
+        valores que não são inteiros (como o cabeçalho) são ignorados.
+    """
+    with _open_log(path) as f:
+        first_line = f.readline()
+        if not first_line:
+            return
+        if delimiter is None:
+            delimiter = next((d for d in (",", ";", "\t") if d in first_line), None)
+
+        index = column
+        if isinstance(column, str):
+            header = next(csv.reader([first_line], delimiter=delimiter or ","))
+            header = [name.strip() for name in header]
+            if column not in header:
+                raise ValueError(f"Coluna '{column}' não encontrada no cabeçalho de {path}: {header}")
+            index = header.index(column)
+            lines = f
+        else:
+            lines = _chain_first(first_line, f)
+
+        if delimiter is None:
+            rows = ([line] for line in lines)
+        else:
+            rows = csv.reader(lines, delimiter=delimiter)
+
+        for row in rows:
+            if len(row) <= index:
+                continue
+            value = row[index].strip()
+            if not value or value.startswith("#"):
+                continue
+            try:
+                yield int(value)
+            except ValueError:
+                continue
+
+
+def _chain_first(first_line: str, f) -> Iterator[str]:
+    yield first_line
+    yield from f
+
+
+def replay_trace(path: str, policies=None, capacity: int = 10, reader_func=fast_reader,
+                 column: int | str = 0, delimiter: str | None = None,
+                 limit: int | None = None) -> ResultSummary:
+    """
+    Executa todas as políticas sobre um log de acessos em uma única passada.
+
+    Args:
+        path (str): Arquivo do log.
+        policies: Classes de cache a testar (padrão: todas as políticas registradas).
+        capacity (int): Capacidade de cada cache.
+        reader_func: Função de leitura usada nos misses.
+        column (int | str): Coluna com o text_id (ver 'iter_trace').
+        delimiter (str | None): Separador das colunas (ver 'iter_trace').
+        limit (int | None): Número máximo de acessos a reproduzir.
+
+    Returns:
+        ResultSummary: Totais e misses por texto, com o padrão 'Trace: <arquivo>'.
+    """
+    caches = [cache_class(capacity=capacity, reader_func=reader_func) for cache_class in policies or DEFAULT_POLICIES]
+    names = [type(cache).__name__ for cache in caches]
+    accesses = 0
+    hits = [0] * len(caches)
+    total_time = [0.0] * len(caches)
+    miss_time = [0.0] * len(caches)
+    misses = [defaultdict(int) for _ in caches]
+
+    for text_id in iter_trace(path, column, delimiter):
+        if limit is not None and accesses >= limit:
+            break
+        accesses += 1
+        for i, cache in enumerate(caches):
+            is_hit, _, access_time = cache.access(text_id)
+            total_time[i] += access_time
+            if is_hit:
+                hits[i] += 1
+            else:
+                miss_time[i] += access_time
+                misses[i][text_id] += 1
+
+    pattern = f"Trace: {os.path.basename(path)}"
+    totals = pd.DataFrame({
+        'algorithm': names,
+        'pattern': pattern,
+        'accesses': accesses,
+        'hits': hits,
+        'total_time': total_time,
+        'miss_time': miss_time,
+    }) if accesses else pd.DataFrame(columns=['algorithm', 'pattern', 'accesses', 'hits', 'total_time', 'miss_time'])
+    misses_by_text = pd.DataFrame(
+        [(name, pattern, text_id, count)
+         for name, per_text in zip(names, misses)
+         for text_id, count in per_text.items()],
+        columns=['algorithm', 'pattern', 'text_id', 'misses'],
+    )
+    return ResultSummary(totals, misses_by_text)
+
+
+def main():
+    from simulation.simulator import analyze_and_plot, analyze_and_save_best_algorithm, print_text_report
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("log", help="arquivo de log (texto ou CSV, opcionalmente .gz)")
+    parser.add_argument("--column", default="0", help="coluna do text_id: posição (a partir de 0) ou nome")
+    parser.add_argument("--delimiter", default=None, help="separador das colunas (padrão: detectado)")
+    parser.add_argument("--capacity", type=int, default=10)
+    parser.add_argument("--limit", type=int, default=None, help="número máximo de acessos")
+    parser.add_argument("--mrc", action="store_true",
+                        help="também gera a curva de miss ratio do LRU (docs/curva_miss_ratio.png)")
+    parser.add_argument("--sample-rate", type=float, default=1.0,
+                        help="fração dos textos usada na curva de miss ratio (amostragem SHARDS)")
+    parser.add_argument("--no-save-config", action="store_true",
+                        help="não grava o melhor algoritmo em docs/cache_config.txt")
+    args = parser.parse_args()
+
+    column = int(args.column) if args.column.isdigit() else args.column
+    start = time.perf_counter()
+    summary = replay_trace(args.log, capacity=args.capacity, column=column,
+                           delimiter=args.delimiter, limit=args.limit)
+    elapsed = time.perf_counter() - start
+    accesses = int(summary.totals['accesses'].iloc[0]) if not summary.totals.empty else 0
+    print(f"{accesses:,} acessos reproduzidos em {elapsed:.2f} s.")
+
+    analyze_and_plot(summary)
+    if not args.no_save_config:
+        analyze_and_save_best_algorithm(summary)
+    print_text_report(summary)
+
+    if args.mrc:
+        from simulation.miss_ratio import miss_ratio_curve, plot_miss_ratio_curves
+        curve = miss_ratio_curve(iter_trace(args.log, column, args.delimiter), sample_rate=args.sample_rate)
+        plot_miss_ratio_curves({f"Trace: {os.path.basename(args.log)}": curve})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Compressão dos textos guardados em memória pelo cache.
+
+Os textos são comprimidos com zlib ou lzma. Com zlib, é possível usar um
+dicionário compartilhado, treinado com as palavras mais frequentes da pasta
+'texts/': como cada texto é pequeno, o dicionário fornece ao compressor o
+vocabulário comum a todos eles e melhora bastante a taxa de compressão.
+
+Para treinar e salvar o dicionário (a partir da raiz do projeto):
+    python -m storage.compression train [pasta_dos_textos] [arquivo_do_dicionario]
+"""
+import lzma
+import os
+import sys
+import zlib
+from collections import Counter
+
+DEFAULT_TEXTS_DIR = "texts"
+DEFAULT_DICT_PATH = "texts.zdict"
+# O zlib só usa os últimos 32 KiB do dicionário.
+ZDICT_MAX_SIZE = 32 * 1024
+METHODS = ("zlib", "lzma")
+
+
+class TextCodec:
+    """
+    Comprime e descomprime textos com um método e nível fixos.
+    """
+    __slots__ = ('method', 'level', 'zdict')
+
+    def __init__(self, method: str = "zlib", level: int = 6, zdict: bytes | None = None):
+        """
+        Args:
+            method (str): "zlib" ou "lzma".
+            level (int): Nível de compressão (0 a 9 nos dois métodos).
+            zdict (bytes | None): Dicionário compartilhado (apenas zlib).
+        """
+        if method not in METHODS:
+            raise ValueError(f"Método de compressão desconhecido: '{method}'. Disponíveis: {', '.join(METHODS)}.")
+        if not 0 <= level <= 9:
+            raise ValueError("O nível de compressão deve estar entre 0 e 9.")
+        if zdict and method != "zlib":
+            raise ValueError("O dicionário compartilhado só é suportado com zlib.")
+        self.method = method
+        self.level = level
+        self.zdict = zdict or None
+
+    @property
+    def name(self) -> str:
+        return f"{self.method}-{self.level}" + ("+dicionário" if self.zdict else "")
+
+    def compress(self, text: str) -> bytes:
+        data = text.encode('utf-8')
+        if self.method == "lzma":
+            return lzma.compress(data, preset=self.level)
+        if self.zdict is None:
+            return zlib.compress(data, self.level)
+        compressor = zlib.compressobj(self.level, zdict=self.zdict)
+        return compressor.compress(data) + compressor.flush()
+
+    def decompress(self, data: bytes) -> str:
+        if self.method == "lzma":
+            return lzma.decompress(data).decode('utf-8')
+        if self.zdict is None:
+            return zlib.decompress(data).decode('utf-8')
+        decompressor = zlib.decompressobj(zdict=self.zdict)
+        return (decompressor.decompress(data) + decompressor.flush()).decode('utf-8')
+
+
+def train_dictionary(texts_dir: str = DEFAULT_TEXTS_DIR, size: int = ZDICT_MAX_SIZE) -> bytes:
+    """
+    Monta um dicionário zlib com as palavras mais frequentes dos textos da pasta.
+    As mais frequentes ficam no final, onde as referências do zlib são mais curtas.
+
+    Returns:
+        bytes: O dicionário (no máximo 'size' bytes).
+    """
+    counts = Counter()
+    for name in os.listdir(texts_dir):
+        if name.endswith(".txt"):
+            with open(os.path.join(texts_dir, name), "rb") as f:
+                counts.update(word + b" " for word in f.read().split())
+
+    chosen = []
+    used = 0
+    for word, _ in counts.most_common():
+        if used + len(word) > size:
+            break
+        chosen.append(word)
+        used += len(word)
+    return b"".join(reversed(chosen))
+
+
+def load_dictionary(path: str = DEFAULT_DICT_PATH) -> bytes | None:
+    """
+    Lê um dicionário salvo por 'train', ou retorna None se ele não existir.
+    """
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def main(argv: list[str]):
+    if not argv or argv[0] != "train":
+        print(__doc__)
+        return 1
+    texts_dir = argv[1] if len(argv) > 1 else DEFAULT_TEXTS_DIR
+    dict_path = argv[2] if len(argv) > 2 else DEFAULT_DICT_PATH
+    zdict = train_dictionary(texts_dir)
+    with open(dict_path, "wb") as f:
+        f.write(zdict)
+    print(f"Dicionário '{dict_path}' gerado com {len(zdict):,} bytes.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,57 @@
+"""
+Armazenamento local dos textos em um banco SQLite, usado como segundo nível
+(L2) do cache hierárquico.
+
+Ler um texto do banco leva poucas dezenas de microssegundos, contra os 100 ms
+do disco lento. O banco é só um cache: a gravação não espera o disco
+(synchronous=OFF) e, se o arquivo se perder, os textos são lidos de novo.
+"""
+import sqlite3
+
+DEFAULT_STORE_PATH = "texts_l2.sqlite"
+
+
+class SQLiteTextStore:
+    """
+    Tabela 'text_id -> conteúdo' em um arquivo SQLite.
+    A escolha de quais textos ficam guardados é do cache que usa o banco.
+    """
+    __slots__ = ('path', 'conn')
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        """
+        Args:
+            path (str): Arquivo do banco (":memory:" para um banco só em memória).
+        """
+        self.path = path
+        # O cache pode ser usado por outras threads (revalidação, watcher); quem usa o banco o protege.
+        self.conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=OFF")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS texts (text_id INTEGER PRIMARY KEY, content TEXT NOT NULL)")
+
+    def get(self, text_id: int) -> str | None:
+        row = self.conn.execute("SELECT content FROM texts WHERE text_id = ?", (text_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def put(self, text_id: int, content: str):
+        self.conn.execute("INSERT OR REPLACE INTO texts (text_id, content) VALUES (?, ?)", (text_id, content))
+
+    def delete(self, text_id: int):
+        self.conn.execute("DELETE FROM texts WHERE text_id = ?", (text_id,))
+
+    def clear(self):
+        self.conn.execute("DELETE FROM texts")
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM texts").fetchone()[0]
+
+    @property
+    def bytes_in_use(self) -> int:
+        """
+        Soma do tamanho (UTF-8) dos textos guardados.
+        """
+        return self.conn.execute("SELECT COALESCE(SUM(LENGTH(CAST(content AS BLOB))), 0) FROM texts").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,151 @@
+"""
+Armazenamento compactado dos textos em um único arquivo mapeado em memória.
+
+Todos os arquivos de 'texts/' são concatenados em um arquivo de dados, e um
+índice separado guarda o deslocamento e o tamanho de cada texto. A leitura usa
+mmap: cada texto é uma fatia (memoryview) do arquivo, sem cópia e sem abrir um
+arquivo por texto, e a decodificação só acontece quando o texto é pedido.
+
+Para gerar o pacote (a partir da raiz do projeto):
+    python -m storage.text_pack build [pasta_dos_textos] [arquivo_do_pacote]
+"""
+import mmap
+import os
+import struct
+import sys
+
+# Cabeçalho do índice: identificador, versão e número de textos.
+_INDEX_MAGIC = b"RA2I"
+_INDEX_VERSION = 1
+_INDEX_HEADER = struct.Struct("<4sBI")
+# Cada registro do índice: text_id, deslocamento e tamanho em bytes.
+_INDEX_RECORD = struct.Struct("<IQI")
+
+DEFAULT_TEXTS_DIR = "texts"
+DEFAULT_PACK_PATH = "texts.pack"
+
+
+def index_path_for(pack_path: str) -> str:
+    """
+    Retorna o caminho do índice correspondente a um arquivo de dados.
+    """
+    return pack_path + ".idx"
+
+
+def build_pack(texts_dir: str = DEFAULT_TEXTS_DIR, pack_path: str = DEFAULT_PACK_PATH) -> int:
+    """
+    Gera o arquivo de dados e o índice a partir dos arquivos '<id>.txt' de uma pasta.
+    Os dois arquivos são escritos em temporários e renomeados ao final.
+
+    Returns:
+        int: Número de textos incluídos no pacote.
+    """
+    text_ids = sorted(
+        int(name[:-4]) for name in os.listdir(texts_dir)
+        if name.endswith(".txt") and name[:-4].isdigit()
+    )
+
+    records = []
+    offset = 0
+    tmp_pack = pack_path + ".tmp"
+    with open(tmp_pack, "wb") as pack:
+        for text_id in text_ids:
+            with open(os.path.join(texts_dir, f"{text_id}.txt"), "rb") as f:
+                data = f.read()
+            pack.write(data)
+            records.append((text_id, offset, len(data)))
+            offset += len(data)
+
+    index_path = index_path_for(pack_path)
+    tmp_index = index_path + ".tmp"
+    with open(tmp_index, "wb") as index:
+        index.write(_INDEX_HEADER.pack(_INDEX_MAGIC, _INDEX_VERSION, len(records)))
+        for record in records:
+            index.write(_INDEX_RECORD.pack(*record))
+
+    os.replace(tmp_pack, pack_path)
+    os.replace(tmp_index, index_path)
+    return len(records)
+
+
+class PackedTextStore:
+    """
+    Leitor de textos a partir do pacote gerado por 'build_pack'.
+
+    O método 'read' tem a mesma assinatura de 'read_from_slow_disk' e pode ser
+    passado como 'reader_func' para qualquer política de cache.
+    """
+
+    def __init__(self, pack_path: str = DEFAULT_PACK_PATH):
+        with open(index_path_for(pack_path), "rb") as f:
+            index_data = f.read()
+        magic, version, count = _INDEX_HEADER.unpack_from(index_data, 0)
+        if magic != _INDEX_MAGIC or version != _INDEX_VERSION:
+            raise ValueError(f"Índice de textos inválido: {index_path_for(pack_path)}")
+
+        self.index = {
+            text_id: (offset, length)
+            for text_id, offset, length in _INDEX_RECORD.iter_unpack(
+                index_data[_INDEX_HEADER.size:_INDEX_HEADER.size + count * _INDEX_RECORD.size]
+            )
+        }
+
+        with open(pack_path, "rb") as f:
+            # mmap não aceita arquivos vazios.
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else None
+        self._view = memoryview(self._mmap) if self._mmap is not None else memoryview(b"")
+
+    def read_bytes(self, text_id: int) -> memoryview | None:
+        """
+        Retorna os bytes do texto como uma fatia do arquivo mapeado, sem cópia,
+        ou None se o texto não existir no pacote.
+        """
+        location = self.index.get(text_id)
+        if location is None:
+            return None
+        offset, length = location
+        return self._view[offset:offset + length]
+
+    def read(self, text_id: int) -> str:
+        """
+        Lê e decodifica um texto do pacote.
+        """
+        data = self.read_bytes(text_id)
+        if data is None:
+            return f"Erro: Texto {text_id} não encontrado."
+        return str(data, 'utf-8-sig')
+
+    def __contains__(self, text_id: int) -> bool:
+        return text_id in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def close(self):
+        """
+        Libera o mapeamento do arquivo. Fatias obtidas com 'read_bytes' devem ter sido liberadas antes.
+        """
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def main(argv: list[str]):
+    if not argv or argv[0] != "build":
+        print(__doc__)
+        return 1
+    texts_dir = argv[1] if len(argv) > 1 else DEFAULT_TEXTS_DIR
+    pack_path = argv[2] if len(argv) > 2 else DEFAULT_PACK_PATH
+    count = build_pack(texts_dir, pack_path)
+    print(f"Pacote '{pack_path}' gerado com {count} textos (índice: '{index_path_for(pack_path)}').")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,36 @@
+"""
+O ARCCache e o CARCache seguem os artigos passo a passo: com um trace fixo, a
+sequência de hits e misses e as listas ao final são as mesmas das referências
+de benchmarks/arc_differential.py, e os invariantes valem a cada acesso.
+
+Uso (a partir da raiz do projeto):
+    python -m pytest -q tests
+"""
+import random
+
+import pytest
+
+from algorithms.arc_cache import ARCCache, arc_invariant_violations
+from algorithms.car import CARCache
+from benchmarks.arc_differential import WORKLOADS, ReferenceARC, ReferenceCAR, _key_reader, _same_state
+
+REQUESTS = 3000
+SEED = 42
+
+
+@pytest.mark.parametrize("workload", sorted(WORKLOADS))
+@pytest.mark.parametrize("capacity", [1, 10, 64])
+@pytest.mark.parametrize("policy_class, reference_class", [(ARCCache, ReferenceARC), (CARCache, ReferenceCAR)])
+def test_matches_reference(policy_class, reference_class, capacity, workload):
+    trace = WORKLOADS[workload](REQUESTS, 4 * capacity, random.Random(SEED))
+    policy = policy_class(capacity=capacity, reader_func=_key_reader, debug_invariants=True)
+    reference = reference_class(capacity)
+
+    hits, expected = [], []
+    for text_id in trace:
+        hits.append(policy.access(text_id)[0])
+        expected.append(reference.request(text_id))
+        assert arc_invariant_violations(capacity, policy.p, policy.t1, policy.t2, policy.b1, policy.b2) == []
+
+    assert hits == expected
+    assert _same_state(policy, reference) is None
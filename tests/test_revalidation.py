@@ -0,0 +1,73 @@
+"""
+A revalidação do ExpiringCache (stale-while-revalidate) troca só o conteúdo do
+texto: a posição dele na política não pode mudar.
+
+Uso (a partir da raiz do projeto):
+    python -m pytest -q tests
+"""
+from algorithms.arc_cache import ARCCache
+from algorithms.lfu import LFUCache
+from core.expiry import ExpiringCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _versioned_reader():
+    versions = {}
+
+    def reader(text_id: int) -> str:
+        versions[text_id] = versions.get(text_id, 0) + 1
+        return f"texto {text_id} v{versions[text_id]}"
+    return reader
+
+
+def _expiring(policy_class):
+    clock = FakeClock()
+    policy = policy_class(capacity=4, reader_func=_versioned_reader())
+    cache = ExpiringCache(policy, default_ttl=1.0, stale_ttl=100.0, background=False, clock=clock)
+    return cache, policy, clock
+
+
+def test_revalidation_keeps_lfu_frequency():
+    cache, policy, clock = _expiring(LFUCache)
+    for _ in range(5):
+        cache.access(1)
+    cache.access(2)
+    clock.now = 2.0
+
+    # Hit vencido: entrega a versão antiga e revalida em seguida.
+    assert cache.access(1)[1] == "texto 1 v1"
+    assert policy.frequency[1] == 6
+    assert cache.access(1)[1] == "texto 1 v2"
+    assert policy.frequency[1] == 7
+    assert cache.revalidations == 1
+
+
+def test_revalidation_keeps_arc_entry_in_t2():
+    cache, policy, clock = _expiring(ARCCache)
+    cache.access(1)
+    cache.access(1)
+    cache.access(2)
+    assert 1 in policy.t2 and 2 in policy.t1
+    p, ghosts = policy.p, (list(policy.b1), list(policy.b2))
+    clock.now = 2.0
+
+    cache.access(1)
+    assert 1 in policy.t2 and 1 not in policy.t1
+    assert policy.t2[1] == "texto 1 v2"
+    assert (policy.p, (list(policy.b1), list(policy.b2))) == (p, ghosts)
+
+
+def test_revalidation_does_not_count_evictions_or_misses():
+    cache, policy, clock = _expiring(LFUCache)
+    cache.access(1)
+    clock.now = 2.0
+    cache.access(1)
+    metrics = policy.get_metrics()
+    assert (metrics.hits, metrics.misses, metrics.evictions) == (1, 1, 0)